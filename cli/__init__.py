@@ -1,11 +1,67 @@
-"""Command-line interface for pysmashgg."""
+"""Command-line interface for pysmashgg.
 
+Commands are registered on first use: main() only imports the module of the
+command named on the command line (every command module for --help or an
+unknown command), and the rich console is only created the first time
+something imports it. A short lookup then doesn't pay for importing every other
+command and its formatters.
+"""
+
+import importlib
+import sys
+import threading
 import typer
-from rich.console import Console
+from pathlib import Path
 
 __version__ = "0.2.0"  # Updated version for new player command
 
 app = typer.Typer(help="Command-line interface for pysmashgg")
-console = Console()
 
-from .commands import search, results, player  # noqa
+# Command name -> module in cli.commands that registers it on app
+COMMANDS = {
+    'search': 'search',
+    'results': 'results',
+    'player': 'player',
+    'cache': 'cache',
+    'export': 'export',
+    'daemon': 'daemon',
+}
+
+# Keeps app a group of commands even when only one of them is registered
+@app.callback()
+def callback():
+    pass
+
+def __getattr__(name):
+    if name == 'console':
+        from rich.console import Console
+        value = globals()['console'] = Console()
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+# Directory the command on each thread was run from, when that isn't this process's
+# working directory (see cli/daemon.py)
+_working_directory = threading.local()
+
+def set_working_directory(path):
+    """Resolve the paths of commands run on this thread against path (None for the working directory)."""
+    _working_directory.path = path
+
+def resolve_path(path):
+    """A path given to a command, made absolute if the command wasn't run from this process's working directory."""
+    directory = getattr(_working_directory, 'path', None)
+    if path is None or directory is None:
+        return path
+    return Path(directory, path)
+
+def register_commands(names=None):
+    """Import the modules that register the given commands on app, all of them if names is None."""
+    for name in (COMMANDS if names is None else names):
+        importlib.import_module('.commands.' + COMMANDS[name], __name__)
+
+def main(args=None):
+    """Run the CLI, registering only the command it was asked to run."""
+    args = sys.argv[1:] if args is None else list(args)
+    name = next((arg for arg in args if not arg.startswith('-')), None)
+    register_commands([name] if name in COMMANDS else None)
+    return app(args=args)
@@ -0,0 +1,65 @@
+"""Response cache command implementation.
+
+The CLI keeps API responses in a SQLite cache on disk (see pysmashgg.disk_cache),
+so repeated lookups don't need a network round trip. These commands inspect,
+prune and clear that cache.
+"""
+
+import typer
+from rich.table import Table
+
+from .. import app, console
+from pysmashgg.disk_cache import DiskCache
+
+cache_app = typer.Typer(help="Inspect and manage the on-disk response cache")
+app.add_typer(cache_app, name="cache")
+
+def format_bytes(size: int) -> str:
+    """Format a byte count for display (e.g. 1.5 MB)."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} {unit}"
+        size /= 1024
+
+@cache_app.command(name="info")
+def cache_info():
+    """Show where the cache lives and how much it holds."""
+    try:
+        info = DiskCache().info()
+        table = Table(title="Response Cache")
+        table.add_column("Setting", style="cyan")
+        table.add_column("Value", justify="right")
+        table.add_row("Path", info['path'])
+        table.add_row("Entries", str(info['entries']))
+        table.add_row("Expired entries", str(info['expired']))
+        table.add_row("Stored (compressed)", format_bytes(info['payload_bytes']))
+        table.add_row("File size", format_bytes(info['file_bytes']))
+        table.add_row("Size limit", format_bytes(info['max_bytes']))
+        console.print(table)
+    except Exception as e:
+        console.print(f"[red]Error:[/] {str(e)}")
+        raise typer.Exit(code=1)
+
+@cache_app.command(name="prune")
+def cache_prune():
+    """Delete expired entries, and the oldest ones if the cache is over its size limit."""
+    try:
+        deleted = DiskCache().prune()
+        console.print(f"[green]Pruned {deleted} cache entr{'y' if deleted == 1 else 'ies'}.[/]")
+    except Exception as e:
+        console.print(f"[red]Error:[/] {str(e)}")
+        raise typer.Exit(code=1)
+
+@cache_app.command(name="clear")
+def cache_clear(
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask for confirmation")
+):
+    """Delete every cached response."""
+    try:
+        if not yes and not typer.confirm("Delete every cached response?"):
+            return
+        DiskCache().clear()
+        console.print("[green]Cache cleared.[/]")
+    except Exception as e:
+        console.print(f"[red]Error:[/] {str(e)}")
+        raise typer.Exit(code=1)
@@ -0,0 +1,110 @@
+"""Daemon command implementation.
+
+Starts, stops and checks on the background daemon (see cli/daemon.py), which
+keeps the SmashGG client, its connections and caches warm between commands.
+"""
+
+import os
+import subprocess
+import sys
+import time
+import typer
+from rich.table import Table
+
+from .. import app, console
+
+# Import the global SmashGG instance
+import startgg
+
+# How long `daemon start` waits for the daemon to start listening
+START_TIMEOUT = 10
+
+daemon_app = typer.Typer(help="Run a background daemon that keeps the client warm between commands")
+app.add_typer(daemon_app, name="daemon")
+
+@daemon_app.command(name="start")
+def daemon_start(
+    foreground: bool = typer.Option(False, "--foreground", "-f", help="Run the daemon in this process instead of in the background")
+):
+    """Start the daemon.
+
+    While it runs, the results, player and export commands are run by the
+    daemon, sharing its connections, caches and rate limit budget.
+    """
+    path = startgg.daemon_socket()
+    try:
+        startgg.connect_daemon(path).close()
+        console.print(f"[yellow]A daemon is already running on {path}[/]")
+        return
+    except OSError:
+        pass
+
+    if foreground:
+        from ..daemon import serve
+        console.print(f"[green]Daemon listening on {path}[/]")
+        try:
+            serve(path)
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            console.print(f"[red]Error:[/] {str(e)}")
+            raise typer.Exit(code=1)
+        return
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    log_path = os.path.splitext(path)[0] + '.log'
+    with open(log_path, 'ab') as log:
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(startgg.__file__), 'daemon', 'start', '--foreground'],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+
+    deadline = time.time() + START_TIMEOUT
+    while True:
+        if process.poll() is not None:
+            console.print(f"[red]Error:[/] The daemon exited, see {log_path}")
+            raise typer.Exit(code=1)
+        try:
+            startgg.connect_daemon(path).close()
+            break
+        except OSError:
+            if time.time() > deadline:
+                console.print(f"[red]Error:[/] The daemon didn't start listening, see {log_path}")
+                raise typer.Exit(code=1)
+            time.sleep(0.05)
+    console.print(f"[green]Daemon started (pid {process.pid}), listening on {path}[/]")
+
+@daemon_app.command(name="stop")
+def daemon_stop():
+    """Stop the daemon."""
+    try:
+        with startgg.connect_daemon() as connection:
+            # The daemon closes the connection once it has stopped listening
+            list(startgg.daemon_messages(connection, {'control': 'stop'}))
+    except OSError:
+        console.print("[yellow]No daemon is running[/]")
+        return
+    console.print("[green]Daemon stopped[/]")
+
+@daemon_app.command(name="status")
+def daemon_status():
+    """Show whether the daemon is running, and what it has done so far."""
+    try:
+        with startgg.connect_daemon() as connection:
+            status = next(startgg.daemon_messages(connection, {'control': 'status'}))['status']
+    except OSError:
+        console.print("[yellow]No daemon is running[/]")
+        raise typer.Exit(code=1)
+
+    table = Table(title="Daemon")
+    table.add_column("Setting", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("PID", str(status['pid']))
+    table.add_row("Socket", status['socket'])
+    table.add_row("Uptime", f"{status['uptime']:.0f} s")
+    table.add_row("Commands run", str(status['commands']))
+    table.add_row("Commands running", str(status['running']))
+    table.add_row("Requests sent", str(status['requests']))
+    if 'cacheHits' in status:
+        table.add_row("Cache hits", str(status['cacheHits']))
+        table.add_row("Cache misses", str(status['cacheMisses']))
+    console.print(table)
@@ -0,0 +1,81 @@
+"""Tournament export command implementation.
+
+Pulls everything about a tournament (metadata, events, brackets, standings and
+sets) into a directory, see pysmashgg.export for the file layout.
+"""
+
+from pathlib import Path
+from typing import Optional
+import typer
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+from rich.table import Table
+
+from .. import app, console, resolve_path
+from pysmashgg.pagination import DEFAULT_WORKERS
+
+# Import the global SmashGG instance
+import startgg
+
+@app.command()
+def export(
+    slug: str = typer.Argument(..., help="The tournament slug (e.g., 'genesis-9-1')"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Directory to export into (defaults to the slug)"),
+    workers: int = typer.Option(DEFAULT_WORKERS, "--workers", "-w", help="Events and brackets fetched at once"),
+    format: str = typer.Option("ndjson", "--format", "-f", help="File format for standings and sets: ndjson or parquet"),
+    compress: Optional[str] = typer.Option(None, "--compress", "-z", help="Compress NDJSON files with gzip or zstd"),
+):
+    """Export a whole tournament: metadata, events, brackets, standings and sets.
+
+    Examples:
+    1. Export a tournament into ./genesis-9-1:
+        python startgg.py export genesis-9-1
+
+    2. Export into a specific directory, 8 brackets at a time:
+        python startgg.py export genesis-9-1 --output exports/genesis --workers 8
+
+    3. Export standings and sets as Parquet (needs pyarrow):
+        python startgg.py export genesis-9-1 --format parquet
+
+    4. Export gzip-compressed NDJSON:
+        python startgg.py export genesis-9-1 --compress gzip
+    """
+    try:
+        if format not in ("ndjson", "parquet"):
+            console.print(f"[red]Error:[/] Unknown format: {format} (use ndjson or parquet)")
+            raise typer.Exit(code=1)
+        if compress not in (None, "gzip", "zstd"):
+            console.print(f"[red]Error:[/] Unknown compression: {compress} (use gzip or zstd)")
+            raise typer.Exit(code=1)
+        directory = resolve_path(output or Path(slug))
+        columns = (TextColumn("[bold green]Exporting {task.description}"), BarColumn(), MofNCompleteColumn(),
+                   TextColumn("{task.fields[requests]} requests"), TimeElapsedColumn())
+        # Redrawn by report, on this thread, rather than by a refresh thread, so that in the
+        # daemon it draws on this command's console
+        with Progress(*columns, console=console, auto_refresh=False) as progress:
+            task = progress.add_task(slug, total=None, requests=0)
+
+            def report(stats):
+                progress.update(task, total=stats.tasks, completed=stats.tasks_done, requests=stats.requests,
+                                refresh=True)
+
+            stats = startgg.smash.export_tournament(slug, str(directory), workers=workers, progress=report,
+                                                   format=format, compression=compress)
+
+        if stats is None:
+            console.print(f"[red]Error:[/] Tournament not found: {slug}")
+            raise typer.Exit(code=1)
+
+        summary = stats.as_dict()
+        table = Table(title=f"Exported {slug} to {directory}")
+        table.add_column("", style="cyan")
+        table.add_column("Count", justify="right")
+        for label, key in [("Events", 'events'), ("Brackets", 'brackets'), ("Standings", 'standings'),
+                           ("Sets", 'sets'), ("Requests", 'requests')]:
+            table.add_row(label, str(summary[key]))
+        table.add_row("Seconds", f"{summary['seconds']:.1f}")
+        console.print(table)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error:[/] {str(e)}")
+        raise typer.Exit(code=1)
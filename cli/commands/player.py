@@ -7,14 +7,9 @@ from .. import app, console
 from ..formatters.player import display_player_info, display_player_placements
 from ..formatters.player_info import create_player_info_panel
 from ..formatters.sets import create_sets_table
-from ..utils.player import format_player_slug, lookup_player_id
+from ..utils.player import fetch_player_profile, recent_event_sets
 from pysmashgg.api import run_query
-from pysmashgg.queries import (
-    PLAYER_INFO_QUERY,
-    PLAYER_RECENT_PLACEMENTS_QUERY,
-    PLAYER_RECENT_GAME_PLACEMENTS_QUERY,
-    PLAYER_SETS_QUERY
-)
+from pysmashgg.queries import PLAYER_SETS_QUERY
 
 # Import the global SmashGG instance
 import startgg
@@ -28,31 +23,17 @@ def player_info(
 ):
     """Show detailed information about a player."""
     try:
-        # Check if this is a player ID (numeric) or a player slug
-        is_player_id = player_identifier.isdigit()
+        if player_identifier.isdigit():
+            console.print(f"[green]Using player ID: {player_identifier}[/]")
 
-        if is_player_id:
-            # Use player ID directly
-            player_id = player_identifier
-            console.print(f"[green]Using player ID: {player_id}[/]")
-        else:
-            # First lookup the player's ID using their discriminator slug
-            with console.status(f"[bold green]Looking up player ID for {player_identifier}..."):
-                # Format the slug properly (add user/ prefix if needed)
-                formatted_slug = format_player_slug(player_identifier)
-
-                player_id = lookup_player_id(formatted_slug, startgg.smash.header, startgg.smash.auto_retry)
-                if not player_id:
-                    console.print("[red]Could not find player ID. Make sure the profile slug/ID is correct.[/]")
-                    return
-
-                console.print(f"[green]Found player ID: {player_id}[/]")
-
-        # Fetch player info
+        # Player IDs and profile slugs are both looked up in one request
         with console.status(f"[bold green]Fetching player information..."):
-            variables = {"playerId": player_id}
-            response = run_query(PLAYER_INFO_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-            create_player_info_panel(response)
+            profile = fetch_player_profile(player_identifier, startgg.smash.header, startgg.smash.auto_retry,
+                                           session=startgg.smash.session, with_standings=False)
+        if not profile:
+            console.print("[red]Could not find player. Make sure the profile slug/ID is correct.[/]")
+            return
+        create_player_info_panel(profile)
     except Exception as e:
         console.print(f"[red]Error:[/] {str(e)}")
         raise typer.Exit(code=1)
@@ -64,65 +45,23 @@ def player_results(
 ):
     """Show a player's recent tournament results."""
     try:
-        # Check if this is a player ID (numeric) or a player slug
-        is_player_id = player_identifier.isdigit()
-
-        # Get initial response
-        response = None
-        with console.status(f"[bold green]Fetching placements...") as status:
-            if is_player_id:
-                # Use player ID directly
-                player_id = player_identifier
-                console.print(f"[green]Using player ID: {player_id}[/]")
-
-                # For player ID, we need to get the player slug for recent placements
-                variables = {"playerId": player_id}
-                player_info_response = run_query(PLAYER_INFO_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-
-                if (player_info_response and 'data' in player_info_response and
-                    player_info_response['data'].get('player') and
-                    player_info_response['data']['player'].get('user') and
-                    player_info_response['data']['player']['user'].get('slug')):
+        # Validate game_id as numeric
+        if game_id and not game_id.isdigit():
+            console.print("[red]Error: Game ID must be a numeric value[/]")
+            return
 
-                    player_slug = player_info_response['data']['player']['user']['slug']
+        if player_identifier.isdigit():
+            console.print(f"[green]Using player ID: {player_identifier}[/]")
 
-                    if game_id:
-                        # Validate game_id as numeric
-                        try:
-                            game_id_int = int(game_id)
-                        except ValueError:
-                            console.print("[red]Error: Game ID must be a numeric value[/]")
-                            return
-
-                        variables = {"slug": player_slug, "gameID": str(game_id_int)}
-                        response = run_query(PLAYER_RECENT_GAME_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-                    else:
-                        variables = {"slug": player_slug}
-                        response = run_query(PLAYER_RECENT_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-                else:
-                    console.print("[red]Could not find player slug for the given player ID[/]")
-                    return
-            else:
-                # Format the slug properly (add user/ prefix if needed)
-                formatted_slug = format_player_slug(player_identifier)
-
-                if game_id:
-                    # Validate game_id as numeric
-                    try:
-                        game_id_int = int(game_id)
-                    except ValueError:
-                        console.print("[red]Error: Game ID must be a numeric value[/]")
-                        return
-
-                    variables = {"slug": formatted_slug, "gameID": str(game_id_int)}
-                    response = run_query(PLAYER_RECENT_GAME_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-                else:
-                    variables = {"slug": formatted_slug}
-                    response = run_query(PLAYER_RECENT_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
+        with console.status(f"[bold green]Fetching placements..."):
+            profile = fetch_player_profile(player_identifier, startgg.smash.header, startgg.smash.auto_retry,
+                                           session=startgg.smash.session, game_id=game_id)
+        if not profile:
+            console.print("[red]Could not find player. Make sure the profile slug/ID is correct.[/]")
+            return
 
         # Display results and handle game selection after status context is closed
-        if response:
-            display_player_placements(response, startgg.smash.header, startgg.smash.auto_retry)
+        display_player_placements(profile, startgg.smash.header, startgg.smash.auto_retry)
     except Exception as e:
         console.print(f"[red]Error:[/] {str(e)}")
         raise typer.Exit(code=1)
@@ -132,87 +71,42 @@ def player_sets(
     player_identifier: str = typer.Argument(..., help="The player's profile slug (e.g., 'user/b1008ff3' or just 'b1008ff3') or player ID (e.g., '123456')"),
     game_id: str = typer.Argument(..., help="Game ID to get sets for")
 ):
-    """Show a player's recent tournament sets."""
+    """Show a player's sets at their most recent event."""
     try:
-        with console.status("[bold green]Fetching player data...") as status:
-            # Check if this is a player ID (numeric) or a player slug
-            is_player_id = player_identifier.isdigit()
-
-            if is_player_id:
-                # Use player ID directly
-                player_id = player_identifier
-                console.print(f"[green]Using player ID: {player_id}[/]")
-
-                # For player ID, we need to get the player slug for recent placements
-                variables = {"playerId": player_id}
-                player_info_response = run_query(PLAYER_INFO_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
+        # Validate game_id as numeric
+        if not game_id.isdigit():
+            console.print("[red]Error: Game ID must be a numeric value[/]")
+            return
 
-                if (player_info_response and 'data' in player_info_response and
-                    player_info_response['data'].get('player') and
-                    player_info_response['data']['player'].get('user') and
-                    player_info_response['data']['player']['user'].get('slug')):
-
-                    player_slug = player_info_response['data']['player']['user']['slug']
-                else:
-                    console.print("[red]Could not find player slug for the given player ID[/]")
-                    return
-            else:
-                # Format the slug properly (add user/ prefix if needed)
-                formatted_slug = format_player_slug(player_identifier)
-
-                # Lookup the player's ID using their discriminator slug
-                player_id = lookup_player_id(formatted_slug, startgg.smash.header, startgg.smash.auto_retry)
-                if not player_id:
-                    console.print("[red]Could not find player ID. Make sure the profile slug/ID is correct.[/]")
-                    return
-
-                console.print(f"[green]Found player ID: {player_id}[/]")
-
-                # Use the formatted slug for recent placements
-                player_slug = formatted_slug
-
-            # Validate game_id as numeric
-            try:
-                game_id_int = int(game_id)
-            except ValueError:
-                console.print("[red]Error: Game ID must be a numeric value[/]")
+        with console.status("[bold green]Fetching player data...") as status:
+            # Info, recent standings and latest sets come back in one request
+            profile = fetch_player_profile(player_identifier, startgg.smash.header, startgg.smash.auto_retry,
+                                           session=startgg.smash.session, game_id=game_id, with_sets=True)
+            if not profile:
+                console.print("[red]Could not find player. Make sure the profile slug/ID is correct.[/]")
                 return
 
-            # Update status message
-            status.update(status="[bold green]Finding most recent event...")
-
-            # Get placements to find the most recent event and display player info
-            variables = {"slug": player_slug}
-            response = run_query(PLAYER_RECENT_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-
             # Display player info before showing sets
-            create_player_info_panel(response)
-
-            if (response and 'data' in response and
-                response['data'].get('user') and
-                response['data']['user'].get('player') and
-                response['data']['user']['player'].get('recentStandings')):
+            create_player_info_panel(profile)
 
-                standings = response['data']['user']['player']['recentStandings']
-                if standings:
-                    recent_event = standings[0]['entrant']['event']
-                    event_id = recent_event['id']
-                    is_online = recent_event['isOnline']
-
-                    # Update status message
-                    status.update(status="[bold green]Fetching sets for most recent event...")
+            player = profile['data']['user']['player']
+            standings = player.get('recentStandings') or []
+            if not standings:
+                console.print("[yellow]No recent events found[/]")
+                return
 
-                    variables = {
-                        "playerId": player_id,
-                        "isOnline": is_online,
-                        "eventId": [event_id]
-                    }
-                    sets_response = run_query(PLAYER_SETS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-                    create_sets_table(sets_response)
-                else:
-                    console.print("[yellow]No recent events found[/]")
-            else:
-                console.print("[red]Could not find player's recent events[/]")
+            sets_response = recent_event_sets(profile)
+            if sets_response is None:
+                # The event's sets may not all be among the player's latest ones, fetch them by event
+                status.update(status="[bold green]Fetching sets for most recent event...")
+                recent_event = standings[0]['entrant']['event']
+                variables = {
+                    "playerId": player['id'],
+                    "isOnline": recent_event['isOnline'],
+                    "eventId": [recent_event['id']]
+                }
+                sets_response = run_query(PLAYER_SETS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry, session=startgg.smash.session)
+            create_sets_table(sets_response)
     except Exception as e:
         console.print(f"[red]Error:[/] {str(e)}")
         raise typer.Exit(code=1)
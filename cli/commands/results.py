@@ -5,23 +5,21 @@ from pathlib import Path
 from typing import Optional
 import typer
 from rich.panel import Panel
-import time
+from concurrent.futures import ThreadPoolExecutor
 
-from .. import app, console
+from .. import app, console, resolve_path
 from ..exporters.results_exporter import export_results
 from ..formatters.results import create_results_table
-from pysmashgg.tournaments import show_events
 from pysmashgg.api import run_query
-from pysmashgg.queries import (
-    SHOW_LIGHTWEIGHT_RESULTS_QUERY,
-    SHOW_EVENTS_QUERY,
-    PLAYER_RECENT_PLACEMENTS_QUERY
-)
+from pysmashgg.queries import SHOW_LIGHTWEIGHT_RESULTS_QUERY
 from pysmashgg import filters
 
 # Import the global SmashGG instance
 import startgg
 
+# Events whose results are fetched at once
+EVENT_WORKERS = 8
+
 def version_callback(value: bool):
     if value:
         from .. import __version__
@@ -35,6 +33,8 @@ def results(
     json_file: Optional[Path] = typer.Option(None, "--json", "-j", help="Export results to JSON file"),
     csv_file: Optional[Path] = typer.Option(None, "--csv", "-c", help="Export results to CSV file"),
     txt_file: Optional[Path] = typer.Option(None, "--txt", "-t", help="Export results to TXT file"),
+    parquet_file: Optional[Path] = typer.Option(None, "--parquet", "-p", help="Export results to Parquet file (needs pyarrow)"),
+    ndjson_file: Optional[Path] = typer.Option(None, "--ndjson", "-n", help="Export results to NDJSON file, compressed if it ends in .gz or .zst"),
     version: Optional[bool] = typer.Option(None, "--version", "-v", callback=version_callback,
                                          help="Show the application version and exit"),
 ):
@@ -58,9 +58,8 @@ def results(
     """
     try:
         # Check if this is a player ID, slug, or tournament slug
-        from ..utils.player import format_player_slug, lookup_player_id
+        from ..utils.player import fetch_player_profile
         from ..formatters.player import display_player_placements
-        from pysmashgg.queries import PLAYER_RECENT_GAME_PLACEMENTS_QUERY, PLAYER_INFO_QUERY
 
         # Try to determine if this is a player ID (numeric) or a player slug
         is_player_id = slug.isdigit()
@@ -68,76 +67,16 @@ def results(
 
         if is_player_id or is_player_slug:
             # Handle player results
+            # Validate game_id as numeric
+            if game_id and not game_id.isdigit():
+                console.print("[red]Error: Game ID must be a numeric value[/]")
+                return
+
+            # Player IDs and slugs both get info and placements in one request
             with console.status(f"[bold green]Fetching player results..."):
-                if is_player_id:
-                    # Use player ID directly
-                    player_id = slug
-
-                    # For player ID, we need to use a different query that accepts player ID
-                    if game_id:
-                        # For game-specific results with player ID, we need to get the player slug first
-                        variables = {"playerId": player_id}
-                        player_info_response = run_query(PLAYER_INFO_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-
-                        if (player_info_response and 'data' in player_info_response and
-                            player_info_response['data'].get('player') and
-                            player_info_response['data']['player'].get('user') and
-                            player_info_response['data']['player']['user'].get('slug')):
-
-                            player_slug = player_info_response['data']['player']['user']['slug']
-
-                            # Validate game_id as numeric
-                            try:
-                                game_id_int = int(game_id)
-                            except ValueError:
-                                console.print("[red]Error: Game ID must be a numeric value[/]")
-                                return
-
-                            # Use game-specific query with the slug
-                            variables = {"slug": player_slug, "gameID": game_id}
-                            response = run_query(PLAYER_RECENT_GAME_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-                        else:
-                            console.print("[red]Could not find player slug for the given player ID[/]")
-                            return
-                    else:
-                        # For general results with player ID, we need to get the player slug first
-                        variables = {"playerId": player_id}
-                        player_info_response = run_query(PLAYER_INFO_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-
-                        if (player_info_response and 'data' in player_info_response and
-                            player_info_response['data'].get('player') and
-                            player_info_response['data']['player'].get('user') and
-                            player_info_response['data']['player']['user'].get('slug')):
-
-                            player_slug = player_info_response['data']['player']['user']['slug']
-
-                            # Use general query with the slug
-                            variables = {"slug": player_slug}
-                            response = run_query(PLAYER_RECENT_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-                        else:
-                            console.print("[red]Could not find player slug for the given player ID[/]")
-                            return
-                else:
-                    # Format the slug properly (add user/ prefix if needed)
-                    formatted_slug = format_player_slug(slug)
-
-                    if game_id:
-                        # Validate game_id as numeric
-                        try:
-                            game_id_int = int(game_id)
-                        except ValueError:
-                            console.print("[red]Error: Game ID must be a numeric value[/]")
-                            return
-
-                        # Use game-specific query
-                        variables = {"slug": formatted_slug, "gameID": game_id}
-                        response = run_query(PLAYER_RECENT_GAME_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-                    else:
-                        # Use general query
-                        variables = {"slug": formatted_slug}
-                        response = run_query(PLAYER_RECENT_PLACEMENTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
-
-                if not response or 'data' not in response or not response['data'].get('user'):
+                response = fetch_player_profile(slug, startgg.smash.header, startgg.smash.auto_retry,
+                                                session=startgg.smash.session, game_id=game_id)
+                if not response:
                     console.print("[red]Could not find player information[/]")
                     return
 
@@ -146,8 +85,9 @@ def results(
 
         else:
             # Handle tournament results
+            # Metadata, owner, events and every event's top 8 come back in one request
             with console.status("[bold green]Fetching tournament info..."):
-                tournament_info = startgg.smash.tournament_show(slug)
+                tournament_info = startgg.smash.tournament_overview(slug, top_n=8)
                 if not tournament_info:
                     console.print("[red]Could not find tournament information[/]")
                     return
@@ -175,48 +115,56 @@ def results(
 
                 console.print(Panel("\n".join(info_text), title="Tournament Info", border_style="cyan"))
 
-            # Get tournament events
-            with console.status("[bold green]Fetching events..."):
-                events = show_events(slug, startgg.smash.header, startgg.smash.auto_retry)
-                if not events:
-                    console.print("[red]Could not find any events for this tournament[/]")
-                    return
+            events = tournament_info['events']
+            if not events:
+                console.print("[red]Could not find any events for this tournament[/]")
+                return
 
-                console.print(f"\nFound [cyan]{len(events)}[/] events for tournament: [bold]{tournament_info['name']}[/]")
+            console.print(f"\nFound [cyan]{len(events)}[/] events for tournament: [bold]{tournament_info['name']}[/]")
 
             # Store all results for potential export
             all_results = {}
 
-            # Fetch and display Top 8 for each event
-            for event in events:
-                event_name = event['name']
-                event_id = event['id']
+            # Tournaments with too many events to fit in one request come back without standings,
+            # those events' results are requested at once, under the client's rate limiter, and
+            # shown in event order, each as soon as it and the events before it have arrived
+            def fetch_event_results(event_id):
+                variables = {"eventId": event_id, "page": 1, "perPage": 8}
+                return run_query(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry, session=startgg.smash.session)
+
+            with ThreadPoolExecutor(max_workers=EVENT_WORKERS) as executor:
+                futures = [executor.submit(fetch_event_results, event['id']) if event['standings'] is None else None
+                           for event in events]
 
-                try:
-                    with console.status(f"[bold green]Fetching results for {event_name}..."):
-                        # Add a small delay between API calls to avoid rate limiting
-                        time.sleep(0.5)
+                # Fetch and display Top 8 for each event
+                for event, future in zip(events, futures):
+                    event_name = event['name']
+
+                    try:
+                        if future is None:
+                            standings, total_players = event['standings'], event['standingsTotal']
+                        else:
+                            with console.status(f"[bold green]Fetching results for {event_name}..."):
+                                response = future.result()
 
-                        variables = {"eventId": event_id, "page": 1}
-                        response = run_query(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
+                            # Check for API errors
+                            if not response:
+                                console.print(f"[yellow]Could not fetch results for {event_name} - API returned no data[/]")
+                                continue
 
-                        # Check for API errors
-                        if not response:
-                            console.print(f"[yellow]Could not fetch results for {event_name} - API returned no data[/]")
-                            continue
+                            if 'errors' in response:
+                                error_messages = [error.get('message', 'Unknown error') for error in response['errors']]
+                                console.print(f"[yellow]API Errors for {event_name}:[/]")
+                                for msg in error_messages:
+                                    console.print(f"[yellow]- {msg}[/]")
+                                continue
 
-                        if 'errors' in response:
-                            error_messages = [error.get('message', 'Unknown error') for error in response['errors']]
-                            console.print(f"[yellow]API Errors for {event_name}:[/]")
-                            for msg in error_messages:
-                                console.print(f"[yellow]- {msg}[/]")
-                            continue
+                            standings = filters.show_lightweight_results_filter(response)
+                            total_players = response['data']['event']['standings']['pageInfo']['total']
 
-                        standings = filters.show_lightweight_results_filter(response)
                         if standings:
                             top_8 = standings[:8]
                             all_results[event_name] = top_8
-                            total_players = len(standings)
 
                             # Display results in a table
                             table = create_results_table(event_name, top_8, total_players)
@@ -224,14 +172,15 @@ def results(
                         else:
                             console.print(f"[yellow]No results found for {event_name}[/]")
 
-                except Exception as e:
-                    console.print(f"[yellow]Error processing {event_name}: {str(e)}[/]")
-                    # Continue with next event instead of stopping
-                    continue
+                    except Exception as e:
+                        console.print(f"[yellow]Error processing {event_name}: {str(e)}[/]")
+                        # Continue with next event instead of stopping
+                        continue
 
             # Export results if requested
-            if any([json_file, csv_file, txt_file]) and all_results:
-                export_results(all_results, json_file, csv_file, txt_file)
+            if any([json_file, csv_file, txt_file, parquet_file, ndjson_file]) and all_results:
+                export_results(all_results, *(resolve_path(path) for path in
+                                              (json_file, csv_file, txt_file, parquet_file, ndjson_file)))
 
     except Exception as e:
         console.print(f"[red]Error:[/] {str(e)}")
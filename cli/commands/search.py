@@ -35,7 +35,7 @@ def get_tournament_owner(tournament_slug: str):
     """
     try:
         variables = {"tourneySlug": tournament_slug}
-        response = run_query(TOURNAMENT_OWNER_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
+        response = run_query(TOURNAMENT_OWNER_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry, session=startgg.smash.session)
         if response and 'data' in response and 'tournament' in response['data']:
             tournament = response['data']['tournament']
             if 'owner' in tournament and tournament['owner']:
@@ -98,7 +98,7 @@ def search(
             formatted_slug = format_player_slug(player_slug)
             with console.status(f"[bold green]Searching for player {formatted_slug}..."):
                 variables = {"discriminatorSlug": formatted_slug}
-                response = run_query(PLAYER_BY_SLUG_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry)
+                response = run_query(PLAYER_BY_SLUG_QUERY, variables, startgg.smash.header, startgg.smash.auto_retry, session=startgg.smash.session)
                 create_player_info_panel(response)
             return
 
@@ -0,0 +1,235 @@
+"""Background daemon for the CLI.
+
+`startgg.py daemon start` runs a CommandServer on a Unix socket (see
+startgg.daemon_socket). The daemon builds startgg.smash once and keeps it, so
+its connection pool, rate limiter, key pool and caches stay warm between
+commands, and every script using the CLI shares one rate limit budget.
+startgg.py sends it the commands in startgg.DAEMON_COMMANDS while it's up and
+runs them itself otherwise.
+
+The client sends one JSON line: either a command to run,
+
+    {"args": [...], "cwd": "...", "terminal": true, "width": 120, "environment": {...}}
+
+which the daemon answers with {"started": true}, {"out": text} and
+{"err": text} lines as the command prints and a final {"exit": code}, or with
+a single {"refused": reason} line; or {"control": "status"} or
+{"control": "stop"}, answered with one line.
+
+Up to MAX_COMMANDS commands run at once, each on its own thread. sys.stdout,
+sys.stderr and cli.console are ThreadProxy objects, so whatever a command
+prints goes to its own client, and the paths a command is given are resolved
+against the client's working directory (see cli.resolve_path) rather than
+changing the daemon's. A command is refused, and the client runs it itself,
+when the daemon is already running MAX_COMMANDS commands or when the client's
+environment (see startgg.DAEMON_ENVIRONMENT) differs from the daemon's, since
+the command would otherwise run with another API key or cache.
+"""
+
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from rich.console import Console
+
+import cli
+import startgg
+
+# How many commands the daemon runs at once
+MAX_COMMANDS = 8
+
+class ClientStream(object):
+    # A text stream writing to a client as {key: text} lines
+    # Once the client has gone away, whatever the command still prints is dropped
+    def __init__(self, wfile, key, terminal, lock):
+        self.key = key
+        self.encoding = 'utf-8'
+        self.closed = False
+        self._wfile = wfile
+        self._terminal = terminal
+        self._lock = lock
+
+    def write(self, text):
+        # click writes bytes when it can't tell the stream's encoding
+        if isinstance(text, (bytes, bytearray)):
+            text = bytes(text).decode('utf-8', 'replace')
+        if text and not self.closed:
+            with self._lock:
+                try:
+                    self._wfile.write(json.dumps({self.key: text}).encode('utf-8') + b'\n')
+                    self._wfile.flush()
+                except OSError:
+                    self.closed = True
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return self._terminal
+
+class ThreadProxy(object):
+    # Stands in for cli.console, sys.stdout or sys.stderr in the daemon: a thread running a
+    # command uses that command's, every other thread the daemon's own (default)
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    @property
+    def current(self):
+        target = getattr(self._local, 'target', None)
+        return self.default if target is None else target
+
+    # Sets what the calling thread uses, None for the default
+    def bind(self, target):
+        self._local.target = target
+
+    def __getattr__(self, name):
+        return getattr(self.current, name)
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    # Sends one message to the client, returning whether it could
+    def reply(self, message):
+        try:
+            self.wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+            self.wfile.flush()
+        except OSError:
+            # The client has gone away
+            return False
+        return True
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        control = request.get('control')
+        if control == 'status':
+            self.reply({'status': self.server.status()})
+        elif control == 'stop':
+            self.reply({'stopped': True})
+            # shutdown() waits for serve_forever to return, which it can do since this is another thread
+            self.server.shutdown()
+        elif 'args' in request:
+            self.server.run_command(request, self)
+        else:
+            self.reply({'error': "Unknown request"})
+
+class CommandServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    # environment is the daemon's startgg.daemon_environment(), outputs the ThreadProxy objects
+    # installed as cli.console, sys.stdout and sys.stderr
+    def __init__(self, path, environment, outputs):
+        self.path = path
+        self.started = time.time()
+        self.commands_run = 0
+        self.commands_running = 0
+        self.environment = environment
+        self.outputs = outputs
+        self._slots = threading.BoundedSemaphore(MAX_COMMANDS)
+        self._count_lock = threading.Lock()
+        # The daemon sends requests with our API key, so only this user may connect to it
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, CommandHandler)
+        finally:
+            os.umask(umask)
+
+    # Runs one CLI command for a client, unless it has to be refused
+    def run_command(self, request, handler):
+        if request.get('environment') != self.environment:
+            handler.reply({'refused': "The daemon was started with a different environment"})
+            return
+        if not self._slots.acquire(blocking=False):
+            handler.reply({'refused': "The daemon is busy"})
+            return
+        try:
+            # A client that stopped waiting runs the command itself
+            if handler.reply({'started': True}):
+                handler.reply({'exit': self._run(request, handler.wfile)})
+        finally:
+            self._slots.release()
+
+    # Runs one CLI command on this thread, printing to the client, returning its exit code
+    def _run(self, request, wfile):
+        terminal = bool(request.get('terminal'))
+        write_lock = threading.Lock()
+        out = ClientStream(wfile, 'out', terminal, write_lock)
+        err = ClientStream(wfile, 'err', terminal, write_lock)
+        console = Console(file=out, width=request.get('width') or 80, force_terminal=terminal,
+                          color_system='auto' if terminal else None)
+        with self._count_lock:
+            self.commands_running += 1
+        for proxy, target in zip(self.outputs, (console, out, err)):
+            proxy.bind(target)
+        cli.set_working_directory(request.get('cwd'))
+        try:
+            cli.app(args=request['args'], prog_name='startgg.py')
+            code = 0
+        except SystemExit as exit:
+            code = exit.code if isinstance(exit.code, int) else (0 if exit.code is None else 1)
+        except Exception:
+            traceback.print_exc(file=err)
+            code = 1
+        finally:
+            for proxy in self.outputs:
+                proxy.bind(None)
+            cli.set_working_directory(None)
+            with self._count_lock:
+                self.commands_running -= 1
+                self.commands_run += 1
+        return code
+
+    def status(self):
+        session = startgg.smash.session
+        status = {
+            'pid': os.getpid(),
+            'socket': self.path,
+            'uptime': round(time.time() - self.started, 1),
+            'commands': self.commands_run,
+            'running': self.commands_running,
+            'requests': session.requests_sent,
+        }
+        if session.cache is not None:
+            status['cacheHits'] = session.cache.stats.hits
+            status['cacheMisses'] = session.cache.stats.misses
+        return status
+
+def serve(path=None):
+    """Run the daemon on the socket at path (startgg.daemon_socket() by default) until it's stopped."""
+    path = path or startgg.daemon_socket()
+    # Read before startgg.smash loads .env, since that's what clients compare theirs to
+    environment = startgg.daemon_environment()
+    # Commands print through cli.console, so it has to be swapped before any of them is imported
+    outputs = (ThreadProxy(Console()), ThreadProxy(sys.stdout), ThreadProxy(sys.stderr))
+    cli.console = outputs[0]
+    sys.stdout, sys.stderr = outputs[1:]
+    # Built now, so a missing API key stops the daemon before it starts listening
+    startgg.smash
+    cli.register_commands(startgg.DAEMON_COMMANDS)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if os.path.exists(path):
+        try:
+            startgg.connect_daemon(path).close()
+        except OSError:
+            # Left behind by a daemon that didn't shut down cleanly
+            os.unlink(path)
+        else:
+            raise RuntimeError("A daemon is already listening on %s" % path)
+    server = CommandServer(path, environment, outputs)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        startgg.smash.close()
+        sys.stdout, sys.stderr = outputs[1].default, outputs[2].default
@@ -11,7 +11,9 @@ def export_results(
     results: Dict,
     json_file: Optional[Path] = None,
     csv_file: Optional[Path] = None,
-    txt_file: Optional[Path] = None
+    txt_file: Optional[Path] = None,
+    parquet_file: Optional[Path] = None,
+    ndjson_file: Optional[Path] = None
 ):
     """Export tournament results to various file formats."""
     if json_file:
@@ -36,3 +38,15 @@ def export_results(
                     f.write(f"{player['placement']}: {player['name']}\n")
                 f.write("\n")
         console.print(f"[green]Results exported to {txt_file} in TXT format.[/]")
+
+    if parquet_file:
+        from pysmashgg.parquet import write_parquet
+        records = (dict(player, eventName=event) for event in results for player in results[event])
+        write_parquet(records, str(parquet_file), 'lightweight_results')
+        console.print(f"[green]Results exported to {parquet_file} in Parquet format.[/]")
+
+    if ndjson_file:
+        from pysmashgg.ndjson import write_ndjson
+        records = (dict(player, eventName=event) for event in results for player in results[event])
+        write_ndjson(records, str(ndjson_file))
+        console.print(f"[green]Results exported to {ndjson_file} in NDJSON format.[/]")
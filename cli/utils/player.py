@@ -4,7 +4,11 @@ from typing import Optional
 
 from .. import console
 from pysmashgg.api import run_query
-from pysmashgg.queries import PLAYER_LOOKUP_ID_QUERY
+from pysmashgg.queries import PLAYER_PROFILE_QUERY, PLAYER_PROFILE_BY_SLUG_QUERY
+from pysmashgg.p_queries import PLAYER_PROFILE_SETS_PER_PAGE
+
+# The aliased sets connections of the profile queries, see PLAYER_PROFILE_QUERY
+PROFILE_SETS_FIELDS = ('offlineSets', 'onlineSets')
 
 def format_player_slug(slug: str) -> str:
     """Format the player slug to ensure it has the correct prefix.
@@ -25,34 +29,109 @@ def format_player_slug(slug: str) -> str:
     # Otherwise, prepend 'user/'
     return f"user/{slug}"
 
-def lookup_player_id(discriminator_slug: str, header: dict, auto_retry: bool) -> Optional[str]:
-    """Look up a player's ID using their discriminator slug.
+def fetch_player_profile(player_identifier: str, header: dict, auto_retry: bool, session=None,
+                         game_id: Optional[str] = None, with_standings: bool = True,
+                         with_sets: bool = False) -> Optional[dict]:
+    """Fetch a player's info, recent standings and latest sets in a single request.
+
+    Numeric identifiers are looked up as player IDs, anything else as a profile
+    slug, so neither needs a separate ID or slug lookup first.
 
     Args:
-        discriminator_slug: The player's discriminator slug
+        player_identifier: The player's ID or profile slug (with or without 'user/')
         header: The API request header
         auto_retry: Whether to automatically retry failed requests
+        session: Optional pooled Session to send the request through
+        game_id: Only return standings for this game
+        with_standings: Whether to fetch the player's recent standings
+        with_sets: Whether to fetch the player's latest sets, see recent_event_sets
 
     Returns:
-        The player's ID if found, None otherwise
+        A response shaped like PLAYER_RECENT_PLACEMENTS_QUERY's ({'data': {'user': {..., 'player': {...}}}}),
+        with the latest sets under player['recentSets'], or None if the player wasn't found
     """
-    try:
-        formatted_slug = format_player_slug(discriminator_slug)
-        variables = {"discriminatorSlug": formatted_slug}
-        response = run_query(PLAYER_LOOKUP_ID_QUERY, variables, header, auto_retry)
+    if player_identifier.isdigit():
+        query, variables = PLAYER_PROFILE_QUERY, {"playerId": player_identifier}
+    else:
+        query, variables = PLAYER_PROFILE_BY_SLUG_QUERY, {"slug": format_player_slug(player_identifier)}
+    if game_id:
+        variables["gameID"] = str(game_id)
+    variables["withStandings"] = with_standings
+    variables["withSets"] = with_sets
 
-        if (response and 'data' in response and
-            response['data'].get('user') and
-            response['data']['user'].get('player') and
-            response['data']['user']['player'].get('id')):
-            return response['data']['user']['player']['id']
+    try:
+        response = run_query(query, variables, header, auto_retry, session)
+    except Exception as e:
+        console.print(f"[red]Error fetching player profile:[/] {str(e)}")
+        return None
 
-        if 'errors' in response:
+    data = (response or {}).get('data') or {}
+    player = data['player'] if 'player' in data else (data.get('user') or {}).get('player')
+    if not player:
+        if response and 'errors' in response:
             console.print("[red]API Errors:[/]")
             for error in response['errors']:
                 console.print(f"[red]- {error.get('message', 'Unknown error')}[/]")
+        return None
+
+    # Responses may be cached, so build new dicts rather than editing this one
+    recent_sets = []
+    for field in PROFILE_SETS_FIELDS:
+        recent_sets.extend((player.get(field) or {}).get('nodes') or [])
+    player = {key: value for key, value in player.items() if key not in PROFILE_SETS_FIELDS}
+    player['recentSets'] = recent_sets
+    return {'data': {'user': dict(player.get('user') or {}, player=player)}}
+
+def lookup_player_id(discriminator_slug: str, header: dict, auto_retry: bool, session=None) -> Optional[str]:
+    """Look up a player's ID using their discriminator slug.
 
+    Args:
+        discriminator_slug: The player's discriminator slug
+        header: The API request header
+        auto_retry: Whether to automatically retry failed requests
+        session: Optional pooled Session to send the request through
+
+    Returns:
+        The player's ID if found, None otherwise
+    """
+    # Always a slug, since a discriminator can be all digits like a player ID
+    profile = fetch_player_profile(format_player_slug(discriminator_slug), header, auto_retry, session,
+                                   with_standings=False)
+    if profile is None:
         return None
-    except Exception as e:
-        console.print(f"[red]Error looking up player ID:[/] {str(e)}")
+    return profile['data']['user']['player'].get('id')
+
+def recent_event_sets(profile: dict) -> Optional[dict]:
+    """Pick the sets of a player's most recent event out of a profile fetched with sets.
+
+    The profile only has the player's latest PLAYER_PROFILE_SETS_PER_PAGE sets offline and
+    online, so the event's sets are only used when they're known to all be there: either
+    the page wasn't full, or an older set from another event comes after them.
+
+    Args:
+        profile: A response from fetch_player_profile with with_sets=True
+
+    Returns:
+        A response shaped like PLAYER_SETS_QUERY's, or None if the player has no recent
+        standings or that event's sets may not all be among their latest ones
+    """
+    player = profile['data']['user']['player']
+    standings = player.get('recentStandings') or []
+    if not standings:
+        return None
+    event = standings[0]['entrant']['event']
+    # The page of sets (offline or online) the event's sets are in, newest first
+    page = [cur_set for cur_set in player.get('recentSets', [])
+            if bool((cur_set.get('event') or {}).get('isOnline')) == bool(event.get('isOnline'))]
+    positions = [i for i, cur_set in enumerate(page) if (cur_set.get('event') or {}).get('id') == event['id']]
+    if not positions:
+        return None
+    if len(page) >= PLAYER_PROFILE_SETS_PER_PAGE and positions[-1] == len(page) - 1:
+        # The page is full and ends with the event's sets, so more of them may be on the next one
         return None
+    return {'data': {'player': {
+        'id': player.get('id'),
+        'gamerTag': player.get('gamerTag'),
+        'user': {'slug': (player.get('user') or {}).get('slug')},
+        'sets': {'nodes': [page[i] for i in positions]},
+    }}}
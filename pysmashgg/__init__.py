@@ -1,10 +1,50 @@
-from pysmashgg.smashgg import SmashGG
-from pysmashgg import filters
-from pysmashgg import videogame_filters
-from pysmashgg import tournaments
-from pysmashgg import brackets
-from pysmashgg import players
-from pysmashgg import events
-from pysmashgg import leagues
-from pysmashgg import api
-from pysmashgg import exceptions
+"""Python wrapper for start.gg's GraphQL API.
+
+Nothing is imported until it is first used: pysmashgg.SmashGG imports the
+client, pysmashgg.tournaments the tournaments module and so on, through the
+module __getattr__ below. `import pysmashgg` is then nearly free, and a script
+that only ever builds a SmashGG never loads aiohttp, Arrow or the async client.
+"""
+
+import importlib
+import importlib.util
+
+# Public names, and the module each one lives in
+_ATTRIBUTES = {
+    'SmashGG': 'pysmashgg.smashgg',
+    'AsyncSmashGG': 'pysmashgg.async_smashgg',
+    'RateLimiter': 'pysmashgg.ratelimit',
+    'KeyPool': 'pysmashgg.keypool',
+    'RetryPolicy': 'pysmashgg.retry',
+    'Batch': 'pysmashgg.batch',
+    'MemoryCache': 'pysmashgg.cache',
+}
+
+_SUBMODULES = (
+    'filters',
+    'videogame_filters',
+    'tournaments',
+    'brackets',
+    'players',
+    'events',
+    'leagues',
+    'head_to_head',
+    'api',
+    'exceptions',
+)
+
+__all__ = list(_ATTRIBUTES) + list(_SUBMODULES)
+
+def __getattr__(name):
+    if name in _ATTRIBUTES:
+        value = getattr(importlib.import_module(_ATTRIBUTES[name]), name)
+    elif name in _SUBMODULES or (not name.startswith('_') and importlib.util.find_spec(__name__ + '.' + name)):
+        # Any other submodule (pysmashgg.session, pysmashgg.export, ...) loads the same way
+        value = importlib.import_module(__name__ + '.' + name)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,47 +1,84 @@
+import logging
 import time
-import requests
+from pysmashgg.singleflight import flight_key
 from pysmashgg.exceptions import *
+from pysmashgg.session import get_default_session
+
+logger = logging.getLogger(__name__)
+
+# Turns an HTTP status code into one of our exceptions
+def check_status(status_code):
+    if status_code == 400:
+        raise RequestError
+    elif status_code == 429:
+        raise TooManyRequestsError
+    elif 400 <= status_code < 500:
+        raise ResponseError
+    elif 500 <= status_code < 600:
+        raise ServerError
+    elif 300 <= status_code < 400:
+        raise NoIdeaError
+
+# Message logged when a request fails for good
+def error_message(error, status_code):
+    if isinstance(error, RequestError):
+        return "Error 400: Bad request (probably means your key is wrong)"
+    elif isinstance(error, TooManyRequestsError):
+        return "Error 429: Sending too many requests right now"
+    elif isinstance(error, ResponseError):
+        return "Error {}: Unknown request error".format(status_code)
+    elif isinstance(error, ServerError):
+        return "Error {}: Unknown server error".format(status_code)
+    elif isinstance(error, NetworkError):
+        return "Network error: {}".format(error)
+    return "Error {}: I literally have no idea how you got this status code, please send this to me".format(status_code)
 
 # Runs queries
-def run_query(query, variables, header, auto_retry):
-    # This helper function is necessary for TooManyRequestsErrors
-    def _run_query(query, variables, header, auto_retry, seconds): 
-        json_request = {'query': query, 'variables': variables}
-        try:
-            request = requests.post(url='https://api.smash.gg/gql/alpha', json=json_request, headers=header)
-            if request.status_code == 400:
-                raise RequestError
-            elif request.status_code == 429:
-                raise TooManyRequestsError
-            elif 400 <= request.status_code < 500:
-                raise ResponseError
-            elif 500 <= request.status_code < 600:
-                raise ServerError
-            elif 300 <= request.status_code < 400:
-                raise NoIdeaError
+# If no session is given, the shared process-wide session (and its connection pool) is used
+# If auto_retry is set, 429s, transient 5xx and network errors are retried following the session's RetryPolicy
+# If the session has a cache, cached responses are returned without sending anything
+# Event and entrant IDs in every response are recorded in the session's IdentityCache
+# Concurrent calls with the same query, variables and header share one request
+def run_query(query, variables, header, auto_retry, session=None):
+    if session is None:
+        session = get_default_session()
+    if session.cache is not None:
+        response = session.cache.get(query, variables)
+        if response is not None:
+            session.identity.observe(variables, response)
+            return response
+    return session.inflight.do(flight_key(query, variables, header),
+                               lambda: _send_query(query, variables, header, auto_retry, session))
+
+# Sends a query, retrying it as the session's RetryPolicy says
+def _send_query(query, variables, header, auto_retry, session):
+    retry_policy = session.retry_policy if auto_retry else None
+    json_request = {'query': query, 'variables': variables}
 
+    attempt = 0
+    while True:
+        attempt += 1
+        status_code = headers = None
+        try:
+            request = session.post(json_request, header)
+            status_code, headers = request.status_code, request.headers
+            check_status(status_code)
             response = request.json()
+            session.identity.observe(variables, response)
+            if session.cache is not None:
+                session.cache.set(query, variables, response)
             return response
 
-        except RequestError:
-            print("Error 400: Bad request (probably means your key is wrong)")
-            return
-        except TooManyRequestsError:
-            if auto_retry:
-                print("Error 429: Sending too many requests right now, trying again in {} seconds".format(seconds))
-                time.sleep(seconds)
-                return _run_query(query, variables, header, auto_retry, seconds*2)
-            else:
-                print("Error 429: Sending too many requests right now")
+        except (TooManyRequestsError, ServerError, NetworkError) as error:
+            delay = None
+            if retry_policy is not None and (status_code is None or retry_policy.should_retry(status_code)):
+                delay = retry_policy.delay(attempt, headers)
+            if delay is None:
+                logger.error(error_message(error, status_code))
                 return
-        except ResponseError:
-            print("Error {}: Unknown request error".format(request.status_code))
-            return
-        except ServerError:
-            print("Error {}: Unknown server error".format(request.status_code))
-            return
-        except NoIdeaError:
-            print("Error {}: I literally have no idea how you got this status code, please send this to me".format(request.status_code))
-            return
+            logger.warning("%s, trying again in %.1f seconds", error_message(error, status_code), delay)
+            time.sleep(delay)
 
-    return _run_query(query, variables, header, auto_retry, 10)
\ No newline at end of file
+        except (RequestError, ResponseError, NoIdeaError) as error:
+            logger.error(error_message(error, status_code))
+            return
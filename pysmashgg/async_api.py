@@ -0,0 +1,127 @@
+"""Asyncio counterpart of pysmashgg.api.
+
+run_query here sends the same GraphQL documents as the synchronous version, but
+awaits the response over an aiohttp connection pool so many queries can be in
+flight at once under one event loop. aiohttp is an optional dependency
+(``pip install pysmashgg[async]``) and is only imported when the first request
+is sent.
+"""
+
+import asyncio
+import logging
+from pysmashgg.api import check_status, error_message
+from pysmashgg.singleflight import flight_key
+from pysmashgg.exceptions import *
+from pysmashgg.identity import IdentityCache
+from pysmashgg.retry import RetryPolicy
+from pysmashgg.session import API_URL, DEFAULT_POOL_SIZE
+from pysmashgg.singleflight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+class AsyncSession(object):
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=None, rate_limiter=None, key_pool=None, retry_policy=None,
+                 cache=None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.key_pool = key_pool
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        self.inflight = AsyncSingleFlight()
+        self.identity = IdentityCache()
+        # Every request sent over the network, retries included (cache hits aren't requests)
+        self.requests_sent = 0
+        self._http = None
+        self._network_errors = ()
+
+    # The aiohttp session has to be created inside a running event loop,
+    # so it's built on first use rather than in __init__
+    def _get_http(self):
+        if self._http is None or self._http.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("AsyncSmashGG needs aiohttp, install it with 'pip install pysmashgg[async]'")
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._http = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._network_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        return self._http
+
+    # Sends one GraphQL request, returning (status code, headers, parsed json or None)
+    # Raises NetworkError if the server can't be reached
+    async def post(self, json_request, header):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        key = None
+        if self.key_pool is not None:
+            # The pool's key replaces whatever key the header was built with
+            key = await self.key_pool.acquire_async()
+            header = dict(header, Authorization="Bearer " + key)
+
+        http = self._get_http()
+        self.requests_sent += 1
+        try:
+            async with http.post(API_URL, json=json_request, headers=header) as request:
+                if key is not None:
+                    self.key_pool.report(key, request.status)
+                if request.status < 300:
+                    return request.status, request.headers, await request.json(content_type=None)
+                return request.status, request.headers, None
+        except self._network_errors as error:
+            raise NetworkError(error)
+
+    # Closes every pooled connection
+    async def close(self):
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+# Runs queries
+# Same retry behaviour as pysmashgg.api.run_query, following the session's RetryPolicy
+# Concurrent calls with the same query, variables and header share one request
+async def run_query(query, variables, header, auto_retry, session):
+    if session.cache is not None:
+        response = session.cache.get(query, variables)
+        if response is not None:
+            session.identity.observe(variables, response)
+            return response
+    return await session.inflight.do(flight_key(query, variables, header),
+                                     lambda: _send_query(query, variables, header, auto_retry, session))
+
+async def _send_query(query, variables, header, auto_retry, session):
+    retry_policy = session.retry_policy if auto_retry else None
+    json_request = {'query': query, 'variables': variables}
+
+    attempt = 0
+    while True:
+        attempt += 1
+        status_code = headers = None
+        try:
+            status_code, headers, response = await session.post(json_request, header)
+            check_status(status_code)
+            session.identity.observe(variables, response)
+            if session.cache is not None:
+                session.cache.set(query, variables, response)
+            return response
+
+        except (TooManyRequestsError, ServerError, NetworkError) as error:
+            delay = None
+            if retry_policy is not None and (status_code is None or retry_policy.should_retry(status_code)):
+                delay = retry_policy.delay(attempt, headers)
+            if delay is None:
+                logger.error(error_message(error, status_code))
+                return
+            logger.warning("%s, trying again in %.1f seconds", error_message(error, status_code), delay)
+            await asyncio.sleep(delay)
+
+        except (RequestError, ResponseError, NoIdeaError) as error:
+            logger.error(error_message(error, status_code))
+            return
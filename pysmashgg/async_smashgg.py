@@ -0,0 +1,521 @@
+from pysmashgg import filters, videogame_filters
+from pysmashgg.async_api import AsyncSession, run_query
+from pysmashgg.batch import Batch
+from pysmashgg.export import ExportStats, TournamentExport, atagged, awrite_records
+from pysmashgg.identity import EntrantIndex
+from pysmashgg.keypool import KeyPool
+from pysmashgg.pagination import DEFAULT_WORKERS, aiter_pages, is_complexity_error
+from pysmashgg.ratelimit import RateLimiter
+from pysmashgg.session import DEFAULT_POOL_SIZE
+from pysmashgg.snapshot import EventSnapshot
+from pysmashgg.queries import (
+    EVENT_ENTRANTS_QUERY,
+    EVENT_ID_QUERY,
+    SHOW_QUERY,
+    SHOW_WITH_BRACKETS_QUERY,
+    SHOW_EVENTS_QUERY,
+    SHOW_SETS_QUERY,
+    SHOW_ENTRANTS_QUERY,
+    SHOW_EVENT_BRACKETS_QUERY,
+    SHOW_ENTRANT_SETS_QUERY,
+    HEAD_TO_HEAD_SETS_QUERY,
+    SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY,
+    SHOW_LIGHTWEIGHT_RESULTS_QUERY,
+    SHOW_BY_COUNTRY_QUERY,
+    SHOW_BY_STATE_QUERY,
+    SHOW_BY_RADIUS_QUERY,
+    SHOW_PLAYERS_BY_SPONSOR,
+    SHOW_BY_OWNER_QUERY,
+    GET_VIDEOGAME_ID_QUERY,
+    SHOW_BY_VIDEOGAME_QUERY,
+    TOURNAMENT_OVERVIEW_QUERY,
+    BRACKET_SHOW_ENTRANTS_QUERY,
+    BRACKET_SHOW_SETS_QUERY,
+    PLAYER_SHOW_INFO_QUERY,
+    PLAYER_SHOW_TOURNAMENTS_QUERY,
+    PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY,
+    PLAYER_HEAD_TO_HEAD_SETS_QUERY,
+    LEAGUE_SHOW_QUERY,
+    LEAGUE_SHOW_SCHEDULE_QUERY,
+    LEAGUE_SHOW_STANDINGS_QUERY
+)
+from datetime import datetime, timedelta
+import asyncio
+import time
+
+# Async version of SmashGG, every method is a coroutine with the same arguments and results
+# Needs aiohttp (pip install pysmashgg[async])
+class AsyncSmashGG(object):
+    # key can be a single key, a list of keys or a KeyPool
+    # With one key, rate_limiter defaults to start.gg's published limit, pass the same
+    # RateLimiter to several clients to have them share one budget
+    # With several keys, each key is rate limited by the KeyPool instead
+    # retry_policy (a RetryPolicy) controls how failed requests are retried when auto_retry is on
+    # cache (e.g. a MemoryCache) is checked before any query is sent, no caching by default
+    def __init__(self, key, auto_retry=True, pool_size=DEFAULT_POOL_SIZE, rate_limiter=None, retry_policy=None,
+                 cache=None):
+        if isinstance(key, (list, tuple)):
+            key = KeyPool(key)
+        if isinstance(key, KeyPool):
+            self.key_pool = key
+            key = key.keys[0]
+        else:
+            self.key_pool = None
+            if rate_limiter is None:
+                rate_limiter = RateLimiter()
+        self.key = key
+        self.header = {"Authorization": "Bearer " + key}
+        self.auto_retry = auto_retry
+        # Pooled keep-alive connections, shared by every query this client sends
+        self.session = AsyncSession(pool_size, rate_limiter=rate_limiter, key_pool=self.key_pool,
+                                    retry_policy=retry_policy, cache=cache)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Closes the client's pooled connections
+    async def close(self):
+        await self.session.close()
+
+    def set_key_and_header(self, new_key):
+        self.key = new_key
+        self.header = {"Authorization": "Bearer " + new_key}
+
+    # Sets automatic retry, a variable that says if run_query retries rate limited, server and network errors
+    def set_auto_retry(self, boo):
+        self.auto_retry = boo
+
+    def print_key(self):
+        print(self.key)
+
+    def print_header(self):
+        print(self.header)
+
+    def print_auto_retry(self):
+        print(self.auto_retry)
+
+    async def _run_query(self, query, variables):
+        return await run_query(query, variables, self.header, self.auto_retry, self.session)
+
+    # Every page of a paged query, as an async iterator of filtered records
+    def _iter_pages(self, query, variables, filter, *filter_args):
+        return aiter_pages(query, variables, filter, self.header, self.auto_retry, self.session, filter_args)
+
+    # Entrant_id for an entrant at an event, matched against the event's entrant index, built on
+    # the first lookup at the event; None if the name doesn't match one entrant (see events.get_entrant_id)
+    async def _get_entrant_id(self, event_id, player_name):
+        entrant_id = self.session.identity.entrant_id(event_id, player_name)
+        if entrant_id is None:
+            entrant_id = (await self.event_entrant_index(event_id)).entrant_id(player_name)
+            if entrant_id is not None:
+                self.session.identity.add_entrant(event_id, player_name, entrant_id)
+        return entrant_id
+
+    # Name index of every entrant at an event, built once per client
+    async def event_entrant_index(self, event_id):
+        index = self.session.identity.entrant_index(event_id)
+        if index is None:
+            entrants = [entrant async for entrant in self._iter_pages(EVENT_ENTRANTS_QUERY, {"eventId": event_id},
+                                                                     filters.event_entrants_filter)]
+            index = EntrantIndex(entrants)
+            if len(index):
+                self.session.identity.add_entrant_index(event_id, index)
+        return index
+
+    # Event_id for a tournament
+    async def tournament_show_event_id(self, tournament_name, event_name):
+        event_id = self.session.identity.event_id(tournament_name, event_name)
+        if event_id is not None:
+            return event_id
+        variables = {"tourneySlug": tournament_name}
+        response = await self._run_query(EVENT_ID_QUERY, variables)
+        return filters.event_id_filter(response, event_name)
+
+    # Metadata for a tournament
+    async def tournament_show(self, tournament_name):
+        variables = {"tourneySlug": tournament_name}
+        response = await self._run_query(SHOW_QUERY, variables)
+        return filters.show_filter(response)
+
+    # Metadata, owner, events and each event's top_n standings for a tournament, in one request
+    async def tournament_overview(self, tournament_name, top_n=8):
+        variables = {"tourneySlug": tournament_name, "topN": top_n}
+        response = await self._run_query(TOURNAMENT_OVERVIEW_QUERY, variables)
+        if is_complexity_error(response):
+            variables["withStandings"] = False
+            response = await self._run_query(TOURNAMENT_OVERVIEW_QUERY, variables)
+        return filters.tournament_overview_filter(response)
+
+    # Metadata for a tournament with a bracket
+    async def tournament_show_with_brackets(self, tournament_name, event_name):
+        variables = {"tourneySlug": tournament_name}
+        response = await self._run_query(SHOW_WITH_BRACKETS_QUERY, variables)
+        return filters.show_with_brackets_filter(response, event_name)
+
+    # Same as tournament_show_with_brackets but for all brackets
+    async def tournament_show_with_brackets_all(self, tournament_name):
+        variables = {"tourneySlug": tournament_name}
+        response = await self._run_query(SHOW_WITH_BRACKETS_QUERY, variables)
+        return filters.show_with_brackets_all_filter(response)
+
+    # List of events for a tournament
+    async def tournament_show_events(self, tournament_name):
+        variables = {"tourneySlug": tournament_name}
+        response = await self._run_query(SHOW_EVENTS_QUERY, variables)
+        return filters.show_events_filter(response)
+
+    # List of sets for an event
+    async def tournament_show_sets(self, tournament_name, event_name, page_num):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        return await self.event_show_sets(event_id, page_num)
+
+    # Same as tournament_show_sets, but walks every page, yielding one record at a time
+    async def iter_tournament_sets(self, tournament_name, event_name):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        if event_id is not None:
+            async for record in self.iter_event_sets(event_id):
+                yield record
+
+    # List of entrants for an event
+    async def tournament_show_entrants(self, tournament_name, event_name, page_num):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        return await self.event_show_entrants(event_id, page_num)
+
+    # Same as tournament_show_entrants, but walks every page, yielding one record at a time
+    async def iter_tournament_entrants(self, tournament_name, event_name):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        if event_id is not None:
+            async for record in self.iter_event_entrants(event_id):
+                yield record
+
+    # Bracket info for an event at a tournament
+    async def tournament_show_event_brackets(self, tournament_name, event_name):
+        variables = {"tourneySlug": tournament_name}
+        response = await self._run_query(SHOW_EVENT_BRACKETS_QUERY, variables)
+        return filters.show_events_brackets_filter(response, event_name)
+
+    # Bracket info for all events at a tournament
+    async def tournament_show_all_event_brackets(self, tournament_name):
+        variables = {"tourneySlug": tournament_name}
+        response = await self._run_query(SHOW_EVENT_BRACKETS_QUERY, variables)
+        return filters.show_all_event_brackets_filter(response)
+
+    # All sets from an entrant at an event
+    async def tournament_show_entrant_sets(self, tournament_name, event_name, entrant_name):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        return await self.event_show_entrant_sets(event_id, entrant_name)
+
+    # All sets between two entrants at an event
+    async def tournament_show_head_to_head(self, tournament_name, event_name, entrant1_name, entrant2_name):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        return await self.event_show_head_to_head(event_id, entrant1_name, entrant2_name)
+
+    # All tournaments with events (of a certain game) of a minimum size in between two unix timestamps
+    async def tournament_show_event_by_game_size_dated(self, num_entrants, videogame_id, after, before, page_num):
+        variables = {"videogameId": videogame_id, "after": after, "before": before, "page": page_num}
+        response = await self._run_query(SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY, variables)
+        return filters.show_event_by_game_size_dated_filter(response, num_entrants, videogame_id)
+
+    # Same as tournament_show_event_by_game_size_dated, but walks every page, yielding one record at a time
+    def iter_tournament_event_by_game_size_dated(self, num_entrants, videogame_id, after, before):
+        variables = {"videogameId": videogame_id, "after": after, "before": before}
+        return self._iter_pages(SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY, variables,
+                                filters.show_event_by_game_size_dated_filter, num_entrants, videogame_id)
+
+    # Results of an event with only entrant name, id, and placement
+    async def tournament_show_lightweight_results(self, tournament_name, event_name, page_num):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        return await self.event_show_lightweight_results(event_id, page_num)
+
+    # Same as tournament_show_lightweight_results, but walks every page, yielding one record at a time
+    async def iter_tournament_lightweight_results(self, tournament_name, event_name):
+        event_id = await self.tournament_show_event_id(tournament_name, event_name)
+        if event_id is not None:
+            async for record in self.iter_event_lightweight_results(event_id):
+                yield record
+
+    # All tournaments by country (at least, as many at the API can display)
+    async def tournament_show_by_country(self, country_code, page_num):
+        variables = {"countryCode": country_code, "page": page_num}
+        response = await self._run_query(SHOW_BY_COUNTRY_QUERY, variables)
+        return filters.show_by_country_filter(response)
+
+    # Same as tournament_show_by_country, but walks every page, yielding one record at a time
+    def iter_tournament_by_country(self, country_code):
+        return self._iter_pages(SHOW_BY_COUNTRY_QUERY, {"countryCode": country_code}, filters.show_by_country_filter)
+
+    # All tournaments by US State
+    async def tournament_show_by_state(self, state_code, page_num):
+        variables = {"state": state_code, "page": page_num}
+        response = await self._run_query(SHOW_BY_STATE_QUERY, variables)
+        return filters.show_by_state_filter(response)
+
+    # Same as tournament_show_by_state, but walks every page, yielding one record at a time
+    def iter_tournament_by_state(self, state_code):
+        return self._iter_pages(SHOW_BY_STATE_QUERY, {"state": state_code}, filters.show_by_state_filter)
+
+    # All tournaments in a radius of a certain coordinate point
+    async def tournament_show_by_radius(self, coordinates, radius, page_num):
+        variables = {"coordinates": coordinates, "radius": radius, "page": page_num}
+        response = await self._run_query(SHOW_BY_RADIUS_QUERY, variables)
+        return filters.show_by_radius_filter(response)
+
+    # Same as tournament_show_by_radius, but walks every page, yielding one record at a time
+    def iter_tournament_by_radius(self, coordinates, radius):
+        return self._iter_pages(SHOW_BY_RADIUS_QUERY, {"coordinates": coordinates, "radius": radius}, filters.show_by_radius_filter)
+
+    # Players from a tournament with a certain sponsor
+    async def tournament_show_players_by_sponsor(self, tournament_name, sponsor):
+        variables = {"slug": tournament_name, "sponsor": sponsor}
+        response = await self._run_query(SHOW_PLAYERS_BY_SPONSOR, variables)
+        return filters.show_players_by_sponsor_filter(response)
+
+    # Tournaments by owner id
+    async def tournament_show_by_owner(self, owner, page_num):
+        variables = {"ownerId": owner, "page": page_num}
+        response = await self._run_query(SHOW_BY_OWNER_QUERY, variables)
+        return filters.show_by_owner_filter(response)
+
+    # Same as tournament_show_by_owner, but walks every page, yielding one record at a time
+    def iter_tournament_by_owner(self, owner):
+        return self._iter_pages(SHOW_BY_OWNER_QUERY, {"ownerId": owner}, filters.show_by_owner_filter)
+
+    # All entrants in a bracket (phaseGroup) at a tournament
+    async def bracket_show_entrants(self, bracket_id, page_num):
+        variables = {"phaseGroupId": bracket_id, "page": page_num}
+        response = await self._run_query(BRACKET_SHOW_ENTRANTS_QUERY, variables)
+        return filters.bracket_show_entrants_filter(response)
+
+    # Same as bracket_show_entrants, but walks every page, yielding one record at a time
+    def iter_bracket_entrants(self, bracket_id):
+        return self._iter_pages(BRACKET_SHOW_ENTRANTS_QUERY, {"phaseGroupId": bracket_id}, filters.bracket_show_entrants_filter)
+
+    # All sets in a bracket (phaseGroup) at a tournament
+    async def bracket_show_sets(self, bracket_id, page_num):
+        variables = {"phaseGroupId": bracket_id, "page": page_num}
+        response = await self._run_query(BRACKET_SHOW_SETS_QUERY, variables)
+        return filters.bracket_show_sets_filter(response)
+
+    # Same as bracket_show_sets, but walks every page, yielding one record at a time
+    def iter_bracket_sets(self, bracket_id):
+        return self._iter_pages(BRACKET_SHOW_SETS_QUERY, {"phaseGroupId": bracket_id}, filters.bracket_show_sets_filter)
+
+    # Player metadata
+    async def player_show_info(self, player_id):
+        variables = {"playerId": player_id}
+        response = await self._run_query(PLAYER_SHOW_INFO_QUERY, variables)
+        return filters.player_show_info_filter(response)
+
+    # Player metadata for many players, in as few requests as possible
+    async def player_show_info_batch(self, player_ids):
+        batch = Batch()
+        for player_id in player_ids:
+            batch.add(PLAYER_SHOW_INFO_QUERY, {"playerId": player_id}, filters.player_show_info_filter)
+        return await self.run_batch(batch)
+
+    # All tournaments by a player (where they registered with their smash.gg account)
+    async def player_show_tournaments(self, player_id, page_num):
+        variables = {"playerId": player_id, "page": page_num}
+        response = await self._run_query(PLAYER_SHOW_TOURNAMENTS_QUERY, variables)
+        return filters.player_show_tournaments_filter(response)
+
+    # Same as player_show_tournaments, but walks every page, yielding one record at a time
+    def iter_player_tournaments(self, player_id):
+        return self._iter_pages(PLAYER_SHOW_TOURNAMENTS_QUERY, {"playerId": player_id}, filters.player_show_tournaments_filter)
+
+    # All tournaments by a player for a certain game
+    async def player_show_tournaments_for_game(self, player_id, player_name, videogame_id, page_num):
+        variables = {"playerId": player_id, "playerName": player_name, "videogameId": videogame_id, "page": page_num}
+        response = await self._run_query(PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY, variables)
+        return filters.player_show_tournaments_for_game_filter(response, videogame_id)
+
+    # List of sets for an event
+    async def event_show_sets(self, event_id, page_num):
+        variables = {"eventId": event_id, "page": page_num}
+        response = await self._run_query(SHOW_SETS_QUERY, variables)
+        return filters.show_sets_filter(response)
+
+    # Same as event_show_sets, but walks every page, yielding one record at a time
+    def iter_event_sets(self, event_id):
+        return self._iter_pages(SHOW_SETS_QUERY, {"eventId": event_id}, filters.show_sets_filter)
+
+    # Every set of an event in one EventSnapshot, answering entrant sets, head to head and bracket path
+    # questions without further requests
+    async def event_snapshot(self, event_id):
+        return EventSnapshot(event_id, [cur_set async for cur_set in self.iter_event_sets(event_id)])
+
+    # List of entrants for an event
+    async def event_show_entrants(self, event_id, page_num):
+        variables = {"eventId": event_id, "page": page_num}
+        response = await self._run_query(SHOW_ENTRANTS_QUERY, variables)
+        return filters.show_entrants_filter(response)
+
+    # Same as event_show_entrants, but walks every page, yielding one record at a time
+    def iter_event_entrants(self, event_id):
+        return self._iter_pages(SHOW_ENTRANTS_QUERY, {"eventId": event_id}, filters.show_entrants_filter)
+
+    # All sets from an entrant at an event, None if the name doesn't match one entrant
+    async def event_show_entrant_sets(self, event_id, entrant_name):
+        entrant_id = await self._get_entrant_id(event_id, entrant_name)
+        if entrant_id is None:
+            return None
+        variables = {"eventId": event_id, "entrantId": entrant_id, "page": 1}
+        response = await self._run_query(SHOW_ENTRANT_SETS_QUERY, variables)
+        return filters.show_entrant_sets_filter(response)
+
+    # All sets between two entrants at an event
+    async def event_show_head_to_head(self, event_id, entrant1_name, entrant2_name):
+        entrant1_id = await self._get_entrant_id(event_id, entrant1_name)
+        if entrant1_id is None:
+            return []
+        variables = {"eventId": event_id, "entrantId": entrant1_id}
+        return [cur_set async for cur_set in self._iter_pages(SHOW_ENTRANT_SETS_QUERY, variables,
+                                                              filters.show_head_to_head_filter, entrant2_name)]
+
+    async def _event_head_to_head_by_id(self, event_id, entrant1_id, entrant2_id):
+        variables = {"eventId": event_id, "entrantIds": [entrant1_id, entrant2_id]}
+        sets = [cur_set async for cur_set in self._iter_pages(HEAD_TO_HEAD_SETS_QUERY, variables,
+                                                              filters.event_head_to_head_filter,
+                                                              entrant1_id, entrant2_id)]
+        for cur_set in sets:
+            cur_set['eventId'] = event_id
+        return sets
+
+    # Every set between two entrants at an event, filtered on both entrants by the server
+    async def event_head_to_head(self, event_id, entrant1_name, entrant2_name):
+        entrant1_id = await self._get_entrant_id(event_id, entrant1_name)
+        entrant2_id = await self._get_entrant_id(event_id, entrant2_name)
+        if entrant1_id is None or entrant2_id is None:
+            return []
+        return await self._event_head_to_head_by_id(event_id, entrant1_id, entrant2_id)
+
+    # Every set between two entrants across many events, all events fetched at once
+    # Events where either name doesn't match an entrant are skipped
+    async def events_head_to_head(self, event_ids, entrant1_name, entrant2_name):
+        async def fetch(event_id):
+            entrant1_id = await self._get_entrant_id(event_id, entrant1_name)
+            entrant2_id = await self._get_entrant_id(event_id, entrant2_name)
+            if entrant1_id is None or entrant2_id is None:
+                return []
+            return await self._event_head_to_head_by_id(event_id, entrant1_id, entrant2_id)
+
+        results = await asyncio.gather(*(fetch(event_id) for event_id in event_ids))
+        return [cur_set for sets in results for cur_set in sets]
+
+    # Every set two players have played against each other, at any event
+    async def player_head_to_head(self, player1_id, player2_id):
+        return [cur_set async for cur_set in self._iter_pages(PLAYER_HEAD_TO_HEAD_SETS_QUERY, {"playerId": player1_id},
+                                                              filters.player_head_to_head_filter,
+                                                              player1_id, player2_id)]
+
+    # Results of an event with only entrant name, id, and placement
+    async def event_show_lightweight_results(self, event_id, page_num):
+        variables = {"eventId": event_id, "page": page_num}
+        response = await self._run_query(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables)
+        return filters.show_lightweight_results_filter(response)
+
+    # Same as event_show_lightweight_results, but walks every page, yielding one record at a time
+    def iter_event_lightweight_results(self, event_id):
+        return self._iter_pages(SHOW_LIGHTWEIGHT_RESULTS_QUERY, {"eventId": event_id}, filters.show_lightweight_results_filter)
+
+    # Lightweight results for many events, in as few requests as possible
+    # Smaller pages (per_page) let more events share a request
+    async def event_show_lightweight_results_batch(self, event_ids, page_num, per_page=None):
+        batch = Batch()
+        for event_id in event_ids:
+            variables = {"eventId": event_id, "page": page_num}
+            if per_page is not None:
+                variables["perPage"] = per_page
+            batch.add(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, filters.show_lightweight_results_filter)
+        return await self.run_batch(batch)
+
+    # Exports a tournament (metadata, events, brackets, standings and sets) into directory
+    # Event standings and bracket sets are fetched up to `workers` at once, see pysmashgg.export
+    async def export_tournament(self, tournament_name, directory, workers=DEFAULT_WORKERS, progress=None,
+                                format='ndjson', compression=None):
+        stats = ExportStats(self.session)
+        metadata = await self.tournament_show(tournament_name)
+        if metadata is None:
+            return None
+        event_list, all_brackets = await asyncio.gather(self.tournament_show_events(tournament_name),
+                                                        self.tournament_show_all_event_brackets(tournament_name))
+        export = TournamentExport(directory, metadata, event_list, all_brackets, stats, format, compression)
+        slots = asyncio.Semaphore(max(1, workers))
+
+        async def run(event, bracket_id):
+            async with slots:
+                if bracket_id is None:
+                    records = atagged(self.iter_event_entrants(event['id']), eventId=event['id'])
+                    export.standings_done(await awrite_records(records, export.standings_file))
+                else:
+                    records = atagged(self.iter_bracket_sets(bracket_id), eventId=event['id'], bracketId=bracket_id)
+                    export.sets_done(await awrite_records(records, export.sets_file))
+            if progress is not None:
+                progress(stats)
+
+        tasks = export.tasks()
+        if progress is not None:
+            progress(stats)
+        try:
+            await asyncio.gather(*(run(*task) for task in tasks))
+        finally:
+            export.close()
+        return stats
+
+    # Sends every query queued in a Batch, returning their filtered results in order
+    async def run_batch(self, batch):
+        return await batch.run_async(self.header, self.auto_retry, self.session)
+
+    # Metadata for a league
+    async def league_show(self, league_name):
+        variables = {"slug": league_name}
+        response = await self._run_query(LEAGUE_SHOW_QUERY, variables)
+        return filters.league_show_filter(response)
+
+    # League schedule (with events mainly, events at each tournament)
+    async def league_show_schedule(self, league_name, page_num):
+        variables = {"slug": league_name, "page": page_num}
+        response = await self._run_query(LEAGUE_SHOW_SCHEDULE_QUERY, variables)
+        return filters.league_show_schedule_filter(response)
+
+    # Same as league_show_schedule, but walks every page, yielding one record at a time
+    def iter_league_schedule(self, league_name):
+        return self._iter_pages(LEAGUE_SHOW_SCHEDULE_QUERY, {"slug": league_name}, filters.league_show_schedule_filter)
+
+    # League standings
+    async def league_show_standings(self, league_name, page_num):
+        variables = {"slug": league_name, "page": page_num}
+        response = await self._run_query(LEAGUE_SHOW_STANDINGS_QUERY, variables)
+        return filters.league_show_standings_filter(response)
+
+    # Same as league_show_standings, but walks every page, yielding one record at a time
+    def iter_league_standings(self, league_name):
+        return self._iter_pages(LEAGUE_SHOW_STANDINGS_QUERY, {"slug": league_name}, filters.league_show_standings_filter)
+
+    # Get video game ID by name
+    async def get_videogame_id(self, game_name):
+        variables = {"name": game_name}
+        response = await self._run_query(GET_VIDEOGAME_ID_QUERY, variables)
+        return videogame_filters.get_videogame_id_filter(response)
+
+    # Show tournaments by video game ID, defaulting to the next week
+    async def tournament_show_by_videogame(self, videogame_id, page_num, after=None, before=None):
+        if after is None:
+            after = int(time.time())
+        if before is None:
+            before = int((datetime.now() + timedelta(days=7)).timestamp())
+        variables = {"videogameId": videogame_id, "page": page_num, "after": after, "before": before}
+        response = await self._run_query(SHOW_BY_VIDEOGAME_QUERY, variables)
+        return videogame_filters.show_by_videogame_filter(response)
+
+    # Same as tournament_show_by_videogame, but walks every page, yielding one record at a time
+    def iter_tournament_by_videogame(self, videogame_id, after=None, before=None):
+        if after is None:
+            after = int(time.time())
+        if before is None:
+            before = int((datetime.now() + timedelta(days=7)).timestamp())
+        variables = {"videogameId": videogame_id, "after": after, "before": before}
+        return self._iter_pages(SHOW_BY_VIDEOGAME_QUERY, variables, videogame_filters.show_by_videogame_filter)
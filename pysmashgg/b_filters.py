@@ -40,6 +40,8 @@ def bracket_show_sets_filter(response):
     sets = []
 
     for node in response['data']['phaseGroup']['sets']['nodes']:
+        if len(node['slots']) < 2 or node['slots'][0]['entrant'] is None or node['slots'][1]['entrant'] is None:
+            continue # Byes and sets still waiting on an entrant
         cur_set = {}
         cur_set['id'] = node['id']
         cur_set['entrant1Id'] = node['slots'][0]['entrant']['id']
@@ -108,6 +110,9 @@ def show_head_to_head_filter(response, player2_name):
 
     sets = []
     for node in response['data']['event']['sets']['nodes']:
+        # Sets still waiting on an entrant can't be between these two
+        if len(node['slots']) < 2 or any(slot['entrant'] is None for slot in node['slots']):
+            continue
         # Check if player2 is in this set
         if ((node['slots'][0]['entrant']['name'].split('|')[-1]).lower() == player2_name.lower()
             or node['slots'][0]['entrant']['name'].lower() == player2_name.lower()
@@ -161,3 +166,76 @@ def show_head_to_head_filter(response, player2_name):
             sets.append(cur_set)
 
     return sets
+
+def _slot_score(slot):
+    if slot['standing'] is None or slot['standing']['stats']['score']['value'] is None:
+        return -1
+    return slot['standing']['stats']['score']['value']
+
+def _head_to_head_set(node, slot1, slot2):
+    """One set between two entrants, with entrant1 always being the first one asked about"""
+    cur_set = {}
+    cur_set['id'] = node['id']
+    cur_set['entrant1Id'] = slot1['entrant']['id']
+    cur_set['entrant2Id'] = slot2['entrant']['id']
+    cur_set['entrant1Name'] = slot1['entrant']['name']
+    cur_set['entrant2Name'] = slot2['entrant']['name']
+    cur_set['entrant1Score'] = _slot_score(slot1)
+    cur_set['entrant2Score'] = _slot_score(slot2)
+    cur_set['completed'] = node['winnerId'] is not None
+    cur_set['winnerId'] = node['winnerId']
+    if node['winnerId'] is None:
+        cur_set['winner'] = None
+    else:
+        cur_set['winner'] = 1 if str(node['winnerId']) == str(cur_set['entrant1Id']) else 2
+    cur_set['completedAt'] = node['completedAt']
+    cur_set['setRound'] = node['fullRoundText']
+    cur_set['bracketId'] = node['phaseGroup']['id'] if node['phaseGroup'] is not None else None
+    return cur_set
+
+def event_head_to_head_filter(response, entrant1_id, entrant2_id):
+    """Filter for the event_head_to_head function, keeps sets between exactly these two entrants"""
+    if response['data']['event'] is None:
+        return
+    if response['data']['event']['sets']['nodes'] is None:
+        return
+
+    sets = []
+    for node in response['data']['event']['sets']['nodes']:
+        slots = {}
+        for slot in node['slots']:
+            if slot['entrant'] is not None:
+                slots[str(slot['entrant']['id'])] = slot
+        if str(entrant1_id) in slots and str(entrant2_id) in slots:
+            sets.append(_head_to_head_set(node, slots[str(entrant1_id)], slots[str(entrant2_id)]))
+
+    return sets
+
+def player_head_to_head_filter(response, player1_id, player2_id):
+    """Filter for the player_head_to_head function, keeps sets between these two players"""
+    if response['data']['player'] is None:
+        return
+    if response['data']['player']['sets']['nodes'] is None:
+        return
+
+    sets = []
+    for node in response['data']['player']['sets']['nodes']:
+        slot1 = slot2 = None
+        for slot in node['slots']:
+            if slot['entrant'] is None:
+                continue
+            player_ids = [str(participant['player']['id']) for participant in slot['entrant']['participants'] or []
+                          if participant['player'] is not None]
+            if str(player1_id) in player_ids:
+                slot1 = slot
+            elif str(player2_id) in player_ids:
+                slot2 = slot
+        if slot1 is not None and slot2 is not None:
+            cur_set = _head_to_head_set(node, slot1, slot2)
+            if node['event'] is not None:
+                cur_set['eventId'] = node['event']['id']
+                cur_set['eventName'] = node['event']['name']
+                cur_set['eventSlug'] = node['event']['slug']
+            sets.append(cur_set)
+
+    return sets
@@ -1,9 +1,13 @@
 # Queries for brackets.py
 
-BRACKET_SHOW_ENTRANTS_QUERY = """query ($phaseGroupId: ID!, $page: Int!) {
+BRACKET_SHOW_ENTRANTS_QUERY = """query ($phaseGroupId: ID!, $page: Int!, $perPage: Int = 32) {
   phaseGroup(id: $phaseGroupId) {
     id
-    seeds (query: {page: $page, perPage: 32}) {
+    seeds (query: {page: $page, perPage: $perPage}) {
+      pageInfo {
+        total
+        totalPages
+      }
       nodes {
         seedNum
         placement
@@ -22,15 +26,19 @@ BRACKET_SHOW_ENTRANTS_QUERY = """query ($phaseGroupId: ID!, $page: Int!) {
   }
 }"""
 
-BRACKET_SHOW_SETS_QUERY = """query PhaseGroupSets($phaseGroupId: ID!, $page:Int!){
+BRACKET_SHOW_SETS_QUERY = """query PhaseGroupSets($phaseGroupId: ID!, $page:Int!, $perPage: Int = 32){
   phaseGroup(id:$phaseGroupId){
     phase {
       name
     }
     sets(
       page: $page
-      perPage: 32
+      perPage: $perPage
     ){
+      pageInfo {
+        total
+        totalPages
+      }
       nodes{
         id
         slots{
@@ -0,0 +1,186 @@
+"""GraphQL alias batching for the pysmashgg library.
+
+A Batch collects many logical queries (any of the query strings in
+pysmashgg.queries, each with its own variables and filter) and sends them in
+as few HTTP requests as possible. Queries are merged into one document by
+renaming their variables and aliasing their root fields, e.g. two
+SHOW_LIGHTWEIGHT_RESULTS_QUERY calls become
+
+    query ($eventId_b0: ID!, $page_b0: Int!, $eventId_b1: ID!, $page_b1: Int!) {
+      b0_event: event(id: $eventId_b0) { ... }
+      b1_event: event(id: $eventId_b1) { ... }
+    }
+
+Queries are packed into a request until its estimated complexity would go over
+the API's limit. Each response is then split back into one response per query,
+shaped exactly like the unbatched response, and run through the query's filter.
+"""
+
+from pysmashgg.api import run_query
+from pysmashgg.complexity import MAX_COMPLEXITY, estimate_cost, tokenize
+
+class _Part(object):
+    def __init__(self, query, variables, filter, filter_args):
+        self.query = query
+        self.variables = variables
+        self.filter = filter
+        self.filter_args = filter_args
+        self.cost = max(1, estimate_cost(query, variables))
+
+class Batch(object):
+    def __init__(self, max_complexity=MAX_COMPLEXITY):
+        self.max_complexity = max_complexity
+        self._parts = []
+
+    def __len__(self):
+        return len(self._parts)
+
+    # Queues up a query, filter (with any extra filter_args) is applied to its response
+    # Returns the position of its result in the list run() returns
+    def add(self, query, variables, filter=None, *filter_args):
+        self._parts.append(_Part(query, variables, filter, filter_args))
+        return len(self._parts) - 1
+
+    # Groups queued queries into requests that stay under max_complexity
+    def groups(self):
+        groups = []
+        cost = 0
+        for part in self._parts:
+            if groups and cost + part.cost <= self.max_complexity:
+                groups[-1].append(part)
+                cost += part.cost
+            else:
+                groups.append([part])
+                cost = part.cost
+        return groups
+
+    # Sends every queued query, returning their filtered results in the order they were added
+    # A query whose request failed gets None
+    def run(self, header, auto_retry, session=None):
+        results = []
+        for group in self.groups():
+            query, variables, aliases = merge_queries([(part.query, part.variables) for part in group])
+            response = run_query(query, variables, header, auto_retry, session)
+            results.extend(_apply_filters(group, split_response(response, aliases)))
+        return results
+
+    # Same as run, but through an AsyncSession, with every request in flight at once
+    async def run_async(self, header, auto_retry, session):
+        import asyncio
+        from pysmashgg import async_api
+
+        async def run_group(group):
+            query, variables, aliases = merge_queries([(part.query, part.variables) for part in group])
+            response = await async_api.run_query(query, variables, header, auto_retry, session)
+            return _apply_filters(group, split_response(response, aliases))
+
+        results = []
+        for group_results in await asyncio.gather(*[run_group(group) for group in self.groups()]):
+            results.extend(group_results)
+        return results
+
+def _apply_filters(parts, responses):
+    results = []
+    for part, response in zip(parts, responses):
+        if response is None or part.filter is None:
+            results.append(response)
+        else:
+            results.append(part.filter(response, *part.filter_args))
+    return results
+
+def merge_queries(queries):
+    """Merge (query, variables) pairs into one aliased document
+
+    Returns (query, variables, aliases), where aliases has one dict per input query
+    mapping each alias in the merged response to the root field name it stands for
+    """
+    definitions = []
+    selections = []
+    merged_variables = {}
+    aliases = []
+    for i, (query, variables) in enumerate(queries):
+        suffix = '_b{}'.format(i)
+        prefix = 'b{}_'.format(i)
+        tokens = tokenize(query)
+
+        # The operation's variable definitions sit in the parentheses before its first brace
+        start = next(n for n, (token, _) in enumerate(tokens) if token == '{')
+        header = tokens[:start]
+        if '(' in [token for token, _ in header]:
+            open_paren = [token for token, _ in header].index('(')
+            close_paren = len(header) - 1 - [token for token, _ in header][::-1].index(')')
+            definition = query[header[open_paren][1] + 1:header[close_paren][1]]
+            definitions.append(_rename_variables(definition.strip().strip(','), suffix))
+
+        # Alias every root field of the operation's selection set
+        end = len(tokens) - 1 - [token for token, _ in tokens][::-1].index('}')
+        body_start, body_end = tokens[start][1] + 1, tokens[end][1]
+        part_aliases = {}
+        edits = []
+        depth = 0
+        parens = 0
+        n = start + 1
+        while n < end:
+            token, position = tokens[n]
+            if token == '(':
+                parens += 1
+            elif token == ')':
+                parens -= 1
+            elif token == '{' and not parens:
+                depth += 1
+            elif token == '}' and not parens:
+                depth -= 1
+            elif token == '...' and depth == 0 and not parens:
+                raise ValueError("Queries with root-level fragments can't be batched")
+            elif depth == 0 and not parens and (token[0].isalpha() or token[0] == '_'):
+                if n + 2 < end and tokens[n + 1][0] == ':':
+                    # Already aliased, prefix the alias
+                    part_aliases[prefix + token] = token
+                    edits.append((position, position + len(token), prefix + token))
+                    n += 2
+                else:
+                    part_aliases[prefix + token] = token
+                    edits.append((position, position, prefix + token + ': '))
+            n += 1
+
+        body = query[body_start:body_end]
+        for edit_start, edit_end, text in reversed(edits):
+            body = body[:edit_start - body_start] + text + body[edit_end - body_start:]
+        selections.append(_rename_variables(body, suffix))
+        aliases.append(part_aliases)
+        for name, value in (variables or {}).items():
+            merged_variables[name + suffix] = value
+
+    merged = "query {}{{{}\n}}".format(
+        "({}) ".format(", ".join(definitions)) if definitions else "",
+        "\n".join(selections)
+    )
+    return merged, merged_variables, aliases
+
+def split_response(response, aliases):
+    """Split a merged response into one response per query, shaped like an unbatched one"""
+    if not response or response.get('data') is None:
+        return [None] * len(aliases)
+
+    responses = []
+    for part_aliases in aliases:
+        part = {'data': {field: response['data'].get(alias) for alias, field in part_aliases.items()}}
+        errors = []
+        for error in response.get('errors', []):
+            path = error.get('path') or []
+            if path and path[0] in part_aliases:
+                errors.append(dict(error, path=[part_aliases[path[0]]] + list(path[1:])))
+        if errors:
+            part['errors'] = errors
+        responses.append(part)
+    return responses
+
+def _rename_variables(text, suffix):
+    renamed = []
+    last = 0
+    for token, position in tokenize(text):
+        if token.startswith('$'):
+            renamed.append(text[last:position + len(token)] + suffix)
+            last = position + len(token)
+    renamed.append(text[last:])
+    return "".join(renamed)
@@ -4,19 +4,32 @@ from pysmashgg.queries import (
     BRACKET_SHOW_SETS_QUERY
 )
 from pysmashgg.api import run_query
+from pysmashgg.pagination import iter_pages
 
 # Shows all the players in a bracket (aka phaseGroup)
-def show_entrants(bracket_id, page_num, header, auto_retry):
+def show_entrants(bracket_id, page_num, header, auto_retry, session=None):
     variables = {"phaseGroupId": bracket_id, "page": page_num}
-    response = run_query(BRACKET_SHOW_ENTRANTS_QUERY, variables, header, auto_retry)
+    response = run_query(BRACKET_SHOW_ENTRANTS_QUERY, variables, header, auto_retry, session)
     data = filters.bracket_show_entrants_filter(response)
     return data
 
+# Yields every player in a bracket, one page at a time
+def iter_entrants(bracket_id, header, auto_retry, session=None):
+    variables = {"phaseGroupId": bracket_id}
+    return iter_pages(BRACKET_SHOW_ENTRANTS_QUERY, variables, filters.bracket_show_entrants_filter, header,
+                      auto_retry, session)
+
 # Shows all the players in a bracket
-def show_sets(bracket_id, page_num, header, auto_retry):
+def show_sets(bracket_id, page_num, header, auto_retry, session=None):
     variables = {"phaseGroupId": bracket_id, "page": page_num}
-    response = run_query(BRACKET_SHOW_SETS_QUERY, variables, header, auto_retry)
+    response = run_query(BRACKET_SHOW_SETS_QUERY, variables, header, auto_retry, session)
     data = filters.bracket_show_sets_filter(response)
     return data
 
+# Yields every set in a bracket, one page at a time
+def iter_sets(bracket_id, header, auto_retry, session=None):
+    variables = {"phaseGroupId": bracket_id}
+    return iter_pages(BRACKET_SHOW_SETS_QUERY, variables, filters.bracket_show_sets_filter, header, auto_retry,
+                      session)
+
 # THIS WAS MADE A SEPERATE FILE TO MAKE ROOM FOR FUTURE EXPANSION
@@ -0,0 +1,150 @@
+"""Response caching for the pysmashgg library.
+
+run_query can look responses up in a cache before sending anything. Entries are
+keyed on a hash of the query text (with whitespace and comments normalized
+away) and its variables, so the same query sent from two different modules hits
+the same entry. Only successful responses without GraphQL errors are stored.
+
+MemoryCache keeps entries in process, evicting the least recently used ones once
+it holds more than max_entries entries or max_bytes of responses. DiskCache
+(pysmashgg.disk_cache) has the same interface but keeps entries in SQLite, so
+they outlive the process and are shared between processes.
+
+Unless a query has its own TTL, both caches pick one from the lifecycle of the
+tournaments and events in the response (see pysmashgg.lifecycle): completed ones
+are kept for a year, upcoming ones for minutes and live ones for seconds.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pysmashgg.complexity import tokenize
+from pysmashgg.lifecycle import ACTIVE, COMPLETED, UPCOMING, LifecycleTracker, most_live
+from pysmashgg.queries import EVENT_ID_QUERY, GET_VIDEOGAME_ID_QUERY
+
+DEFAULT_TTL = 300
+
+# Queries whose answers almost never change
+DEFAULT_TTLS = {
+    EVENT_ID_QUERY: 24 * 60 * 60,
+    GET_VIDEOGAME_ID_QUERY: 24 * 60 * 60,
+}
+
+DEFAULT_STATE_TTLS = {
+    COMPLETED: 365 * 24 * 60 * 60,
+    UPCOMING: 5 * 60,
+    ACTIVE: 15,
+}
+
+# Only a handful of distinct query strings exist, so their normal forms are memoized
+@functools.lru_cache(maxsize=256)
+def normalize_query(query):
+    """Query text with comments and formatting removed"""
+    return " ".join(token for token, _ in tokenize(query))
+
+def cache_key(query, variables):
+    """Hash identifying a (query, variables) pair"""
+    text = normalize_query(query) + "\n" + json.dumps(variables, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def is_cacheable(response):
+    """Only whole, successful responses are worth keeping"""
+    return bool(response) and response.get('data') is not None and not response.get('errors')
+
+class CacheStats(object):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+class BaseCache(object):
+    # ttls maps query strings to how many seconds their responses stay fresh
+    # Other queries get a TTL from state_ttls if state_aware is on and the lifecycle
+    # of what they're about is known, default_ttl otherwise
+    def __init__(self, default_ttl=DEFAULT_TTL, ttls=None, state_aware=True, state_ttls=None):
+        self.default_ttl = default_ttl
+        self.ttls = {normalize_query(query): ttl for query, ttl in dict(DEFAULT_TTLS, **(ttls or {})).items()}
+        self.state_ttls = dict(DEFAULT_STATE_TTLS, **(state_ttls or {}))
+        self.lifecycle = LifecycleTracker() if state_aware else None
+        self.stats = CacheStats()
+
+    # How long a query's responses stay fresh
+    def ttl_for(self, query, variables=None, response=None):
+        # Every response is observed, even ones with their own TTL, so states are learned from all of them
+        phase = most_live(self.lifecycle.observe(response, variables)) if self.lifecycle is not None else None
+        normalized = normalize_query(query)
+        if normalized in self.ttls:
+            return self.ttls[normalized]
+        if phase is not None:
+            return self.state_ttls[phase]
+        return self.default_ttl
+
+    # (largest perPage that worked, smallest that was too complex) learned for a paged query, None if unknown
+    # Only DiskCache keeps these, so a run starts from what earlier runs learned (see pysmashgg.pagination)
+    def page_size(self, query):
+        return None
+
+    def set_page_size(self, query, good, bad):
+        pass
+
+class MemoryCache(BaseCache):
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024, default_ttl=DEFAULT_TTL, ttls=None,
+                 state_aware=True, state_ttls=None):
+        super().__init__(default_ttl, ttls, state_aware, state_ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Cached response for a query, or None
+    def get(self, query, variables):
+        key = cache_key(query, variables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            payload = entry[1]
+        # Every hit gets its own copy, so callers can't change what's cached
+        return json.loads(payload)
+
+    # Stores a response, ttl overrides the query's usual TTL
+    def set(self, query, variables, response, ttl=None):
+        if not is_cacheable(response):
+            return
+        if ttl is None:
+            ttl = self.ttl_for(query, variables, response)
+        if ttl <= 0:
+            return
+        key = cache_key(query, variables)
+        payload = json.dumps(response)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + ttl, payload)
+            self.size += len(payload)
+            while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        self.size -= len(self._entries.pop(key)[1])
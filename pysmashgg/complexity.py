@@ -0,0 +1,89 @@
+"""Query complexity estimates for the pysmashgg library.
+
+start.gg rejects any request that could return more than 1000 objects. These
+helpers estimate how many objects a query can return by walking its selection
+set: every field with a selection set counts as one object, times the perPage
+of every paginated connection whose nodes (or edges) it sits in. A connection
+itself and its pageInfo are one object however large the page is. It is only
+an estimate (lists without an explicit perPage count as one object), but it is
+good enough to decide how many queries fit in one request or how large a page
+can be.
+"""
+
+import re
+
+MAX_COMPLEXITY = 1000
+
+# The fields of a connection that hold one object per item of the page
+_PAGE_ITEMS = ('nodes', 'edges')
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\$?[_A-Za-z][_0-9A-Za-z]*|-?\d+(?:\.\d+)?|\.\.\.|[{}()\[\]:!=@,]')
+
+def tokenize(query):
+    """Split a GraphQL document into (token, position) pairs, skipping comments"""
+    query = re.sub(r'#[^\n]*', lambda match: ' ' * len(match.group()), query)
+    return [(match.group(), match.start()) for match in _TOKEN.finditer(query)]
+
+def variable_defaults(query):
+    """Default values from a query's variable definitions, e.g. {'perPage': 18} for $perPage: Int = 18"""
+    tokens = [token for token, _ in tokenize(query)]
+    header = tokens[:tokens.index('{')] if '{' in tokens else tokens
+    defaults = {}
+    name = None
+    for i, token in enumerate(header):
+        if token.startswith('$') and i + 1 < len(header) and header[i + 1] == ':':
+            name = token[1:]
+        elif token == '=' and name is not None and i + 1 < len(header):
+            value = header[i + 1]
+            try:
+                defaults[name] = int(value)
+            except ValueError:
+                defaults[name] = value.strip('"')
+    return defaults
+
+def estimate_cost(query, variables=None):
+    """Estimate the number of objects a query can return"""
+    variables = dict(variable_defaults(query), **(variables or {}))
+    tokens = [token for token, _ in tokenize(query)]
+    # For each open selection set: (objects per field in it, perPage its nodes are multiplied by)
+    selections = []
+    pending = 1
+    field = None
+    parens = 0
+    cost = 0
+    for i, token in enumerate(tokens):
+        if i and tokens[i - 1] == '@':
+            # A directive's name (@include(if: ...)) isn't a new field
+            continue
+        if token == '(':
+            parens += 1
+        elif token == ')':
+            parens -= 1
+        elif parens:
+            # perPage: 32 or perPage: $perPage inside a field's arguments
+            if token == 'perPage' and i + 2 < len(tokens) and tokens[i + 1] == ':':
+                value = tokens[i + 2]
+                if value.startswith('$'):
+                    value = variables.get(value[1:], 1)
+                try:
+                    pending = max(1, int(value))
+                except (TypeError, ValueError):
+                    pass
+        elif token == '{':
+            if not selections:
+                # The operation's own selection set
+                selections.append((1, 1))
+            else:
+                multiplier, per_page = selections[-1]
+                if field in _PAGE_ITEMS:
+                    multiplier *= per_page
+                cost += multiplier
+                selections.append((multiplier, pending))
+            pending = 1
+        elif token == '}':
+            selections.pop()
+        elif selections and (token[0].isalpha() or token[0] == '_'):
+            # A new field starts, so earlier arguments no longer apply
+            pending = 1
+            field = token
+    return cost
@@ -0,0 +1,164 @@
+"""Persistent response cache for the pysmashgg library.
+
+DiskCache stores responses in a SQLite database, so they survive between runs
+and can be shared by several processes (CLI invocations, cron jobs, workers) at
+once. The database runs in WAL mode, so readers never block on a writer.
+Payloads are zlib-compressed, and once the database holds more than max_bytes of
+payloads the least recently used entries are evicted.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pysmashgg.cache import BaseCache, DEFAULT_TTL, cache_key, is_cacheable
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Summing the size of every entry isn't free, so the size limit is only checked every few writes
+EVICT_EVERY = 64
+
+def default_cache_path():
+    """Where the cache lives unless told otherwise: $XDG_CACHE_HOME/pysmashgg/cache.sqlite3"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'pysmashgg', 'cache.sqlite3')
+
+class DiskCache(BaseCache):
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, default_ttl=DEFAULT_TTL, ttls=None, compress=True,
+                 state_aware=True, state_ttls=None):
+        super().__init__(default_ttl, ttls, state_aware, state_ttls)
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL,
+                size INTEGER NOT NULL,
+                compressed INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )""")
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            connection.execute("""CREATE TABLE IF NOT EXISTS page_sizes (
+                key TEXT PRIMARY KEY,
+                good INTEGER NOT NULL,
+                bad INTEGER NOT NULL
+            )""")
+
+    # SQLite connections can't be shared between threads, so each thread gets its own
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    # Cached response for a query, or None
+    def get(self, query, variables):
+        key = cache_key(query, variables)
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT payload, compressed FROM responses WHERE key = ? AND expires >= ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.stats.hits += 1
+        payload, compressed = row
+        if compressed:
+            payload = zlib.decompress(payload)
+        return json.loads(payload)
+
+    # Stores a response, ttl overrides the query's usual TTL
+    def set(self, query, variables, response, ttl=None):
+        if not is_cacheable(response):
+            return
+        if ttl is None:
+            ttl = self.ttl_for(query, variables, response)
+        if ttl <= 0:
+            return
+        payload = json.dumps(response).encode('utf-8')
+        if self.compress:
+            payload = zlib.compress(payload)
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses (key, expires, accessed, size, compressed, payload) VALUES (?, ?, ?, ?, ?, ?)",
+            (cache_key(query, variables), now + ttl, now, len(payload), int(self.compress), sqlite3.Binary(payload))
+        )
+        self._writes += 1
+        if self._writes % EVICT_EVERY == 0:
+            self._evict(connection)
+
+    def page_size(self, query):
+        row = self._connection().execute(
+            "SELECT good, bad FROM page_sizes WHERE key = ?", (cache_key(query, None),)
+        ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def set_page_size(self, query, good, bad):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO page_sizes (key, good, bad) VALUES (?, ?, ?)", (cache_key(query, None), good, bad)
+        )
+
+    # Deletes expired entries, then least recently used ones until the cache fits in max_bytes
+    # Returns how many entries were deleted
+    def prune(self):
+        connection = self._connection()
+        deleted = connection.execute("DELETE FROM responses WHERE expires < ?", (time.time(),)).rowcount
+        return deleted + self._evict(connection)
+
+    def _evict(self, connection):
+        size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        evicted = 0
+        while size > self.max_bytes:
+            rows = connection.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, entry_size in rows:
+                if size <= self.max_bytes:
+                    break
+                connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                size -= entry_size
+                evicted += 1
+        self.stats.evictions += evicted
+        return evicted
+
+    # Summary of what's stored: entries, expired entries and bytes on disk
+    def info(self):
+        connection = self._connection()
+        entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        expired = connection.execute("SELECT COUNT(*) FROM responses WHERE expires < ?", (time.time(),)).fetchone()[0]
+        return {
+            'path': self.path,
+            'entries': entries,
+            'expired': expired,
+            'payload_bytes': size,
+            'file_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            'max_bytes': self.max_bytes,
+        }
+
+    def clear(self):
+        connection = self._connection()
+        connection.execute("DELETE FROM responses")
+        connection.execute("VACUUM")
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
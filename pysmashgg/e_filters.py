@@ -11,6 +11,30 @@ def event_id_filter(response, event_name):
 
     return
 
+def event_entrants_filter(response):
+    """Filter for the entrant_index function"""
+    if response['data']['event'] is None:
+        return
+    if response['data']['event']['entrants']['nodes'] is None:
+        return
+
+    entrants = []
+    for node in response['data']['event']['entrants']['nodes']:
+        cur_entrant = {}
+        cur_entrant['entrantId'] = node['id']
+        cur_entrant['name'] = node['name']
+
+        players = []
+        for participant in node['participants'] or []:
+            cur_player = {}
+            cur_player['playerId'] = participant['player']['id'] if participant['player'] is not None else None
+            cur_player['playerTag'] = participant['gamerTag']
+            players.append(cur_player)
+        cur_entrant['entrantPlayers'] = players
+        entrants.append(cur_entrant)
+
+    return entrants
+
 def show_events_filter(response):
     """Filter for the show_events function"""
     if response['data']['tournament'] is None:
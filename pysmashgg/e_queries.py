@@ -38,12 +38,35 @@ ENTRANT_ID_QUERY = """query EventEntrants($eventId: ID!, $name: String!) {
     }
     }"""
 
+# Query to get every entrant at an event, for its entrant name index
+EVENT_ENTRANTS_QUERY = """query EventEntrantIndex($eventId: ID!, $page: Int!, $perPage: Int = 64) {
+  event(id: $eventId) {
+    entrants(query: {page: $page, perPage: $perPage}) {
+      pageInfo {
+        total
+        totalPages
+      }
+      nodes {
+        id
+        name
+        participants {
+          gamerTag
+          player {
+            id
+          }
+        }
+      }
+    }
+  }
+}"""
+
 # Query to get an event's ID from a tournament
 EVENT_ID_QUERY = """query ($tourneySlug: String!) {
   tournament(slug: $tourneySlug) {
     events {
       id
       slug
+      state
     }
   }
 }"""
@@ -56,19 +79,25 @@ SHOW_EVENTS_QUERY = """query ($tourneySlug: String!) {
       name
       slug
       numEntrants
+      state
     }
   }
 }"""
 
 # Query to get all sets from an event
-SHOW_SETS_QUERY = """query EventSets($eventId: ID!, $page: Int!) {
+SHOW_SETS_QUERY = """query EventSets($eventId: ID!, $page: Int!, $perPage: Int = 18) {
   event(id: $eventId) {
     tournament {
       id
       name
     }
     name
-    sets(page: $page, perPage: 18, sortType: STANDARD) {
+    state
+    sets(page: $page, perPage: $perPage, sortType: STANDARD) {
+      pageInfo {
+        total
+        totalPages
+      }
       nodes {
         fullRoundText
         games {
@@ -117,13 +146,18 @@ SHOW_SETS_QUERY = """query EventSets($eventId: ID!, $page: Int!) {
 }"""
 
 # Query to get all entrants from an event
-SHOW_ENTRANTS_QUERY = """query EventStandings($eventId: ID!, $page: Int!) {
+SHOW_ENTRANTS_QUERY = """query EventStandings($eventId: ID!, $page: Int!, $perPage: Int = 25) {
   event(id: $eventId) {
     id
     name
+    state
     standings(query: {
-      perPage: 25,
+      perPage: $perPage,
       page: $page}){
+      pageInfo {
+        total
+        totalPages
+      }
       nodes {
         placement
         entrant {
@@ -158,15 +192,20 @@ SHOW_EVENT_BRACKETS_QUERY = """query ($tourneySlug: String!) {
 }"""
 
 # Query to get sets for a specific entrant
-SHOW_ENTRANT_SETS_QUERY = """query EventSets($eventId: ID!, $entrantId: ID!, $page: Int!) {
+SHOW_ENTRANT_SETS_QUERY = """query EventSets($eventId: ID!, $entrantId: ID!, $page: Int!, $perPage: Int = 16) {
   event(id: $eventId) {
+    state
     sets(
       page: $page
-      perPage: 16
+      perPage: $perPage
       filters: {
         entrantIds: [$entrantId]
       }
     ) {
+      pageInfo {
+        total
+        totalPages
+      }
       nodes {
         id
         fullRoundText
@@ -192,10 +231,50 @@ SHOW_ENTRANT_SETS_QUERY = """query EventSets($eventId: ID!, $entrantId: ID!, $pa
   }
 }"""
 
+# Query to get every set between two entrants at an event
+HEAD_TO_HEAD_SETS_QUERY = """query HeadToHeadSets($eventId: ID!, $entrantIds: [ID], $page: Int!, $perPage: Int = 32) {
+  event(id: $eventId) {
+    state
+    sets(page: $page, perPage: $perPage, sortType: STANDARD, filters: {entrantIds: $entrantIds}) {
+      pageInfo {
+        total
+        totalPages
+      }
+      nodes {
+        id
+        fullRoundText
+        completedAt
+        winnerId
+        slots {
+          standing {
+            stats {
+              score {
+                value
+              }
+            }
+          }
+          entrant {
+            id
+            name
+          }
+        }
+        phaseGroup {
+          id
+        }
+      }
+    }
+  }
+}"""
+
 # Query to get lightweight event results
-SHOW_LIGHTWEIGHT_RESULTS_QUERY = """query EventStandings($eventId: ID!, $page: Int!,) {
+SHOW_LIGHTWEIGHT_RESULTS_QUERY = """query EventStandings($eventId: ID!, $page: Int!, $perPage: Int = 64,) {
   event(id: $eventId) {
-    standings(query: {perPage: 64, page: $page}) {
+    state
+    standings(query: {perPage: $perPage, page: $page}) {
+      pageInfo {
+        total
+        totalPages
+      }
       nodes {
         placement
         entrant {
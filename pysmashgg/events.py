@@ -1,53 +1,112 @@
 from pysmashgg import filters
 from pysmashgg.queries import (
-    ENTRANT_ID_QUERY,
+    EVENT_ENTRANTS_QUERY,
     SHOW_SETS_QUERY,
     SHOW_ENTRANTS_QUERY,
     SHOW_ENTRANT_SETS_QUERY,
     SHOW_LIGHTWEIGHT_RESULTS_QUERY
 )
 from pysmashgg.api import run_query
+from pysmashgg.batch import Batch
+from pysmashgg.identity import EntrantIndex
+from pysmashgg.pagination import iter_pages
+from pysmashgg.session import get_default_session
+from pysmashgg.snapshot import EventSnapshot
+
+# Name index of every entrant at an event, built once per session
+def entrant_index(event_id, header, auto_retry, session=None):
+    if session is None:
+        session = get_default_session()
+    index = session.identity.entrant_index(event_id)
+    if index is None:
+        variables = {"eventId": event_id}
+        index = EntrantIndex(iter_pages(EVENT_ENTRANTS_QUERY, variables, filters.event_entrants_filter, header,
+                                        auto_retry, session))
+        if len(index):
+            session.identity.add_entrant_index(event_id, index)
+    return index
 
 # Helper function to get entrantId at an event
-def get_entrant_id(event_id, player_name, header, auto_retry):
-    variables = {"eventId": event_id, "name": player_name}
-    response = run_query(ENTRANT_ID_QUERY, variables, header, auto_retry)
-    data = response['data']['event']['entrants']['nodes'][0]['id']
-    return data
+# Names are matched against the event's entrant index, built on the first lookup at the event
+# None if no entrant has the name or several do, rather than guessing from a fuzzy search
+def get_entrant_id(event_id, player_name, header, auto_retry, session=None):
+    if session is None:
+        session = get_default_session()
+    entrant_id = session.identity.entrant_id(event_id, player_name)
+    if entrant_id is None:
+        entrant_id = entrant_index(event_id, header, auto_retry, session).entrant_id(player_name)
+        if entrant_id is not None:
+            session.identity.add_entrant(event_id, player_name, entrant_id)
+    return entrant_id
 
 # Shows all the sets from an event
-def show_sets(event_id, page_num, header, auto_retry):
+def show_sets(event_id, page_num, header, auto_retry, session=None):
     variables = {"eventId": event_id, "page": page_num}
-    response = run_query(SHOW_SETS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_SETS_QUERY, variables, header, auto_retry, session)
     data = filters.show_sets_filter(response)
     return data
 
+# Yields every set from an event, one page at a time
+def iter_sets(event_id, header, auto_retry, session=None):
+    variables = {"eventId": event_id}
+    return iter_pages(SHOW_SETS_QUERY, variables, filters.show_sets_filter, header, auto_retry, session)
+
+# Every set of an event, downloaded once and indexed by entrant and by pair of entrants
+def snapshot(event_id, header, auto_retry, session=None):
+    return EventSnapshot(event_id, iter_sets(event_id, header, auto_retry, session))
+
 # Shows all entrants from a specific event
-def show_entrants(event_id, page_num, header, auto_retry):
+def show_entrants(event_id, page_num, header, auto_retry, session=None):
     variables = {"eventId": event_id, "page": page_num}
-    response = run_query(SHOW_ENTRANTS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_ENTRANTS_QUERY, variables, header, auto_retry, session)
     data = filters.show_entrants_filter(response)
     return data
 
-# Shows all entrant sets from a given event
-def show_entrant_sets(event_id, entrant_name, header, auto_retry):
-    entrant_id = get_entrant_id(event_id, entrant_name, header, auto_retry)
+# Yields every entrant from an event, one page at a time
+def iter_entrants(event_id, header, auto_retry, session=None):
+    variables = {"eventId": event_id}
+    return iter_pages(SHOW_ENTRANTS_QUERY, variables, filters.show_entrants_filter, header, auto_retry, session)
+
+# Shows all entrant sets from a given event, None if the name doesn't match one entrant
+def show_entrant_sets(event_id, entrant_name, header, auto_retry, session=None):
+    entrant_id = get_entrant_id(event_id, entrant_name, header, auto_retry, session)
+    if entrant_id is None:
+        return None
     variables = {"eventId": event_id, "entrantId": entrant_id, "page": 1}
-    response = run_query(SHOW_ENTRANT_SETS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_ENTRANT_SETS_QUERY, variables, header, auto_retry, session)
     data = filters.show_entrant_sets_filter(response)
     return data
 
-# Shows head to head at an event for two given entrants
-def show_head_to_head(event_id, entrant1_name, entrant2_name, header, auto_retry):
-    entrant1_id = get_entrant_id(event_id, entrant1_name, header, auto_retry)
-    variables = {"eventId": event_id, "entrantId": entrant1_id, "page": 1}
-    response = run_query(SHOW_ENTRANT_SETS_QUERY, variables, header, auto_retry)
-    data = filters.show_head_to_head_filter(response, entrant2_name)
-    return data
+# Shows head to head at an event for two given entrants, from every page of entrant1's sets
+# No sets if entrant1's name doesn't match one entrant
+def show_head_to_head(event_id, entrant1_name, entrant2_name, header, auto_retry, session=None):
+    entrant1_id = get_entrant_id(event_id, entrant1_name, header, auto_retry, session)
+    if entrant1_id is None:
+        return []
+    variables = {"eventId": event_id, "entrantId": entrant1_id}
+    return list(iter_pages(SHOW_ENTRANT_SETS_QUERY, variables, filters.show_head_to_head_filter, header, auto_retry,
+                           session, filter_args=(entrant2_name,)))
 
 # Shows the results of an event with only entrant name, id, and placement
-def show_lightweight_results(event_id, page_num, header, auto_retry):
+def show_lightweight_results(event_id, page_num, header, auto_retry, session=None):
     variables = {"eventId": event_id, "page": page_num}
-    response = run_query(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, header, auto_retry, session)
     data = filters.show_lightweight_results_filter(response)
     return data
+
+# Yields the lightweight results of an event, one page at a time
+def iter_lightweight_results(event_id, header, auto_retry, session=None):
+    variables = {"eventId": event_id}
+    return iter_pages(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, filters.show_lightweight_results_filter, header,
+                      auto_retry, session)
+
+# Shows the lightweight results of many events, batched into as few requests as possible
+# Smaller pages (per_page, 64 by default) let more events share a request, e.g. 8 for top 8s
+def show_lightweight_results_batch(event_ids, page_num, header, auto_retry, session=None, per_page=None):
+    batch = Batch()
+    for event_id in event_ids:
+        variables = {"eventId": event_id, "page": page_num}
+        if per_page is not None:
+            variables["perPage"] = per_page
+        batch.add(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, filters.show_lightweight_results_filter)
+    return batch.run(header, auto_retry, session)
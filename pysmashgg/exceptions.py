@@ -16,4 +16,12 @@ class ServerError(Exception):
 
 class NoIdeaError(Exception):
     # If you get this, please send this to me so I can figure it out lol
-    pass
\ No newline at end of file
+    pass
+
+class NetworkError(Exception):
+    # Couldn't reach the server at all (connection refused/reset, timed out)
+    pass
+
+class PageError(ResponseError):
+    # A page of an auto-paginated walk couldn't be fetched, so its records would be missing
+    pass
@@ -0,0 +1,194 @@
+"""Tournament-wide bulk export for the pysmashgg library.
+
+export_tournament pulls everything about a tournament into a directory:
+
+    tournament.json    metadata (SHOW_QUERY) and its events, each with its bracket IDs
+    standings.ndjson   every standing of every event, one JSON record per line
+    sets.ndjson        every set of every bracket (phase group), one JSON record per line
+
+The NDJSON files can be compressed with compression='gzip' or 'zstd' (see
+pysmashgg.ndjson), becoming standings.ndjson.gz and so on. With
+format='parquet', standings.parquet and sets.parquet are written instead (see
+pysmashgg.parquet, needs pyarrow).
+
+Once the tournament's events and brackets are known, each event's standings and
+each bracket's sets are walked concurrently by a pool of workers, and records
+are appended to the files as their pages arrive rather than collected first, so
+memory stays flat however big the tournament is. Records are tagged with the
+eventId (and, for sets, bracketId) they belong to; records from different
+events and brackets are interleaved in the files.
+
+progress, if given, is called with an ExportStats after every finished event
+or bracket, and the same ExportStats is returned at the end (None if the
+tournament doesn't exist).
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pysmashgg import brackets, events, tournaments
+from pysmashgg.ndjson import NdjsonWriter
+from pysmashgg.pagination import DEFAULT_WORKERS
+from pysmashgg.parquet import ParquetWriter
+from pysmashgg.session import get_default_session
+
+class ExportStats(object):
+    def __init__(self, session):
+        self.tasks = 0
+        self.tasks_done = 0
+        self.events = 0
+        self.brackets = 0
+        self.standings = 0
+        self.sets = 0
+        self.started = time.time()
+        self._session = session
+        self._requests_at_start = session.requests_sent
+
+    # Requests sent since the export started, by anything using the same session
+    @property
+    def requests(self):
+        return self._session.requests_sent - self._requests_at_start
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started
+
+    def as_dict(self):
+        return {
+            'events': self.events,
+            'brackets': self.brackets,
+            'standings': self.standings,
+            'sets': self.sets,
+            'requests': self.requests,
+            'seconds': round(self.elapsed, 3),
+        }
+
+def write_records(records, record_file, batch_size=64):
+    """Writes every record of an iterator, a batch at a time, returning how many there were"""
+    batch = []
+    count = 0
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            record_file.write(batch)
+            count += len(batch)
+            batch = []
+    record_file.write(batch)
+    return count + len(batch)
+
+async def awrite_records(records, record_file, batch_size=64):
+    """Async version of write_records, for async generators"""
+    batch = []
+    count = 0
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            record_file.write(batch)
+            count += len(batch)
+            batch = []
+    record_file.write(batch)
+    return count + len(batch)
+
+def tagged(records, **tags):
+    """Records with tags (e.g. eventId) added to each"""
+    for record in records:
+        record.update(tags)
+        yield record
+
+async def atagged(records, **tags):
+    """Async version of tagged"""
+    async for record in records:
+        record.update(tags)
+        yield record
+
+class TournamentExport(object):
+    # The files of one export, and which events and brackets are left to fetch
+    # events are records from filters.show_events_filter, all_brackets from filters.show_all_event_brackets_filter
+    # format is 'ndjson' (compressed with compression, if given) or 'parquet'
+    def __init__(self, directory, metadata, events, all_brackets, stats, format='ndjson', compression=None):
+        self.directory = directory
+        self.events = events or []
+        self.stats = stats
+        bracket_ids = {}
+        for event_brackets in all_brackets or []:
+            bracket_ids[event_brackets['slug'].split('/')[-1]] = event_brackets['bracketIds']
+        for event in self.events:
+            event['bracketIds'] = bracket_ids.get(event['slug'], [])
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'tournament.json'), 'w', encoding='utf-8') as f:
+            json.dump(dict(metadata, events=self.events), f, indent=2)
+        if format == 'parquet':
+            self.standings_file = ParquetWriter(os.path.join(directory, 'standings.parquet'), 'entrants')
+            self.sets_file = ParquetWriter(os.path.join(directory, 'sets.parquet'), 'sets')
+        elif format == 'ndjson':
+            extension = {'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst'}.get(compression, '.ndjson')
+            self.standings_file = NdjsonWriter(os.path.join(directory, 'standings' + extension), compression)
+            self.sets_file = NdjsonWriter(os.path.join(directory, 'sets' + extension), compression)
+        else:
+            raise ValueError("Unknown export format: %s" % format)
+        self._lock = threading.Lock()
+
+    # (event, None) for each event's standings, then (event, bracket ID) for each of its brackets' sets
+    def tasks(self):
+        tasks = []
+        for event in self.events:
+            tasks.append((event, None))
+            tasks.extend((event, bracket_id) for bracket_id in event['bracketIds'])
+        self.stats.tasks = len(tasks)
+        return tasks
+
+    def standings_done(self, count):
+        with self._lock:
+            self.stats.events += 1
+            self.stats.standings += count
+            self.stats.tasks_done += 1
+
+    def sets_done(self, count):
+        with self._lock:
+            self.stats.brackets += 1
+            self.stats.sets += count
+            self.stats.tasks_done += 1
+
+    def close(self):
+        self.standings_file.close()
+        self.sets_file.close()
+
+# Exports a tournament (metadata, events, brackets, standings and sets) into directory
+# Event standings and bracket sets are fetched by up to `workers` threads at once
+def export_tournament(tournament_name, directory, header, auto_retry, session=None, workers=DEFAULT_WORKERS,
+                      progress=None, format='ndjson', compression=None):
+    if session is None:
+        session = get_default_session()
+    stats = ExportStats(session)
+
+    metadata = tournaments.show(tournament_name, header, auto_retry, session)
+    if metadata is None:
+        return None
+    export = TournamentExport(directory, metadata,
+                              tournaments.show_events(tournament_name, header, auto_retry, session),
+                              tournaments.show_all_event_brackets(tournament_name, header, auto_retry, session),
+                              stats, format, compression)
+
+    def run(event, bracket_id):
+        if bracket_id is None:
+            records = events.iter_entrants(event['id'], header, auto_retry, session)
+            export.standings_done(write_records(tagged(records, eventId=event['id']), export.standings_file))
+        else:
+            records = brackets.iter_sets(bracket_id, header, auto_retry, session)
+            export.sets_done(write_records(tagged(records, eventId=event['id'], bracketId=bracket_id), export.sets_file))
+
+    tasks = export.tasks()
+    if progress is not None:
+        progress(stats)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for future in as_completed([executor.submit(run, *task) for task in tasks]):
+                future.result()
+                if progress is not None:
+                    progress(stats)
+    finally:
+        export.close()
+    return stats
@@ -1,41 +1,52 @@
-# Import all filters from their respective modules
-from pysmashgg.t_filters import (
-    show_filter,
-    show_with_brackets_filter,
-    show_with_brackets_all_filter,
-    show_by_country_filter,
-    show_by_state_filter,
-    show_by_radius_filter,
-    show_by_owner_filter
-)
+import importlib
 
-from pysmashgg.p_filters import (
-    player_id_filter,
-    player_show_info_filter,
-    player_show_tournaments_filter,
-    show_players_by_sponsor_filter
-)
+# All filters, by the module they live in; a module is only imported the first
+# time one of its filters is used (see __getattr__ below)
+_MODULES = {
+    'pysmashgg.t_filters': (
+        'show_filter',
+        'show_with_brackets_filter',
+        'show_with_brackets_all_filter',
+        'show_by_country_filter',
+        'show_by_state_filter',
+        'show_by_radius_filter',
+        'show_by_owner_filter',
+        'tournament_overview_filter',
+    ),
+    'pysmashgg.p_filters': (
+        'player_id_filter',
+        'player_show_info_filter',
+        'player_show_tournaments_filter',
+        'player_show_tournaments_for_game_filter',
+        'show_players_by_sponsor_filter',
+    ),
+    'pysmashgg.e_filters': (
+        'event_id_filter',
+        'event_entrants_filter',
+        'show_events_filter',
+        'show_events_brackets_filter',
+        'show_all_event_brackets_filter',
+        'show_event_by_game_size_dated_filter',
+        'show_sets_filter',
+        'show_entrants_filter',
+        'show_lightweight_results_filter',
+    ),
+    'pysmashgg.b_filters': (
+        'bracket_show_entrants_filter',
+        'bracket_show_sets_filter',
+        'show_head_to_head_filter',
+        'event_head_to_head_filter',
+        'player_head_to_head_filter',
+    ),
+    'pysmashgg.l_filters': (
+        'league_show_filter',
+        'league_show_schedule_filter',
+        'league_show_standings_filter',
+    ),
+}
 
-from pysmashgg.e_filters import (
-    event_id_filter,
-    show_events_filter,
-    show_events_brackets_filter,
-    show_all_event_brackets_filter,
-    show_event_by_game_size_dated_filter,
-    show_sets_filter,
-    show_entrants_filter,
-    show_lightweight_results_filter
-)
-
-from pysmashgg.b_filters import (
-    bracket_show_entrants_filter,
-    bracket_show_sets_filter,
-    show_head_to_head_filter
-)
-
-from pysmashgg.l_filters import (
-    league_show_filter
-)
+# Filter name -> module it lives in
+_FILTERS = {name: module for module, names in _MODULES.items() for name in names}
 
 # Export all filters
 __all__ = [
@@ -47,15 +58,18 @@ __all__ = [
     'show_by_state_filter',
     'show_by_radius_filter',
     'show_by_owner_filter',
+    'tournament_overview_filter',
 
     # Player filters
     'player_id_filter',
     'player_show_info_filter',
     'player_show_tournaments_filter',
+    'player_show_tournaments_for_game_filter',
     'show_players_by_sponsor_filter',
 
     # Event filters
     'event_id_filter',
+    'event_entrants_filter',
     'show_events_filter',
     'show_events_brackets_filter',
     'show_all_event_brackets_filter',
@@ -68,7 +82,21 @@ __all__ = [
     'bracket_show_entrants_filter',
     'bracket_show_sets_filter',
     'show_head_to_head_filter',
+    'event_head_to_head_filter',
+    'player_head_to_head_filter',
 
     # League filters
-    'league_show_filter'
+    'league_show_filter',
+    'league_show_schedule_filter',
+    'league_show_standings_filter'
 ]
+
+def __getattr__(name):
+    if name not in _FILTERS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(_FILTERS[name]), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_FILTERS))
@@ -15,10 +15,10 @@ GET_VIDEOGAME_ID_QUERY = """query VideoGameQuery($name: String!) {
 }"""
 
 # Query to get tournaments by video game
-SHOW_BY_VIDEOGAME_QUERY = """query TournamentsByVideogame($videogameId: ID!, $page: Int!, $after: Timestamp!, $before: Timestamp!) {
+SHOW_BY_VIDEOGAME_QUERY = """query TournamentsByVideogame($videogameId: ID!, $page: Int!, $perPage: Int = 25, $after: Timestamp!, $before: Timestamp!) {
   tournaments(query: {
     page: $page
-    perPage: 25
+    perPage: $perPage
     sortBy: "startAt asc"
     filter: {
       past: false
@@ -27,6 +27,10 @@ SHOW_BY_VIDEOGAME_QUERY = """query TournamentsByVideogame($videogameId: ID!, $pa
       beforeDate: $before
     }
   }) {
+    pageInfo {
+      total
+      totalPages
+    }
     nodes {
       id
       name
@@ -52,9 +56,9 @@ SHOW_BY_VIDEOGAME_QUERY = """query TournamentsByVideogame($videogameId: ID!, $pa
 }"""
 
 # Query to get events by game, size, and date range
-SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY = """query TournamentsByVideogame($page: Int!, $videogameId: [ID!], $after: Timestamp!, $before: Timestamp!) {
+SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY = """query TournamentsByVideogame($page: Int!, $perPage: Int = 32, $videogameId: [ID!], $after: Timestamp!, $before: Timestamp!) {
   tournaments(query: {
-    perPage: 32
+    perPage: $perPage
     page: $page
     sortBy: "startAt asc"
     filter: {
@@ -64,6 +68,10 @@ SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY = """query TournamentsByVideogame($page: Int
       beforeDate: $before
     }
   }) {
+    pageInfo {
+      total
+      totalPages
+    }
     nodes {
       name
       id
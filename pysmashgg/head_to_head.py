@@ -0,0 +1,79 @@
+"""Head to head records for the pysmashgg library.
+
+show_head_to_head fetches one page of an entrant's sets and picks out the ones
+against the other entrant by name. The functions here ask the server for sets
+involving both entrant IDs instead (filters: {entrantIds: [...]}), walk every
+page, and keep only the sets between exactly those two, so nothing is missed
+however many sets an entrant played.
+
+Records always list the entrants in the order they were asked about: entrant1
+is the first entrant (or player), winner is 1 or 2 (None while a set is being
+played), and summarize turns a list of them into a win/loss record.
+
+Aggregating over many events fetches them concurrently. A player's whole history
+is walked through Player.sets, which the API can't filter by opponent, so those
+sets are matched against the second player's ID as the pages come in.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pysmashgg import events, filters
+from pysmashgg.pagination import DEFAULT_WORKERS, iter_pages
+from pysmashgg.queries import HEAD_TO_HEAD_SETS_QUERY, PLAYER_HEAD_TO_HEAD_SETS_QUERY
+from pysmashgg.session import get_default_session
+
+def summarize(sets):
+    """Win/loss record of a list of head to head sets"""
+    summary = {'sets': 0, 'completed': 0, 'entrant1Wins': 0, 'entrant2Wins': 0, 'entrant1Games': 0, 'entrant2Games': 0}
+    for cur_set in sets:
+        summary['sets'] += 1
+        if cur_set['winner'] is None:
+            continue
+        summary['completed'] += 1
+        summary['entrant%dWins' % cur_set['winner']] += 1
+        # DQs and sets reported without a score have scores of -1
+        summary['entrant1Games'] += max(cur_set['entrant1Score'], 0)
+        summary['entrant2Games'] += max(cur_set['entrant2Score'], 0)
+    return summary
+
+# Every set between two entrant IDs at an event
+def event_head_to_head_by_id(event_id, entrant1_id, entrant2_id, header, auto_retry, session=None):
+    variables = {"eventId": event_id, "entrantIds": [entrant1_id, entrant2_id]}
+    sets = []
+    for cur_set in iter_pages(HEAD_TO_HEAD_SETS_QUERY, variables, filters.event_head_to_head_filter, header,
+                              auto_retry, session, filter_args=(entrant1_id, entrant2_id)):
+        cur_set['eventId'] = event_id
+        sets.append(cur_set)
+    return sets
+
+# Every set between two entrants at an event, by name
+# No sets if either name doesn't match one entrant
+def event_head_to_head(event_id, entrant1_name, entrant2_name, header, auto_retry, session=None):
+    entrant1_id = events.get_entrant_id(event_id, entrant1_name, header, auto_retry, session)
+    entrant2_id = events.get_entrant_id(event_id, entrant2_name, header, auto_retry, session)
+    if entrant1_id is None or entrant2_id is None:
+        return []
+    return event_head_to_head_by_id(event_id, entrant1_id, entrant2_id, header, auto_retry, session)
+
+# Every set between two entrants across many events, fetched up to `workers` events at once
+# Events where either name doesn't match an entrant are skipped
+# Sets come back in the order of event_ids
+def events_head_to_head(event_ids, entrant1_name, entrant2_name, header, auto_retry, session=None,
+                        workers=DEFAULT_WORKERS):
+    if session is None:
+        session = get_default_session()
+
+    def fetch(event_id):
+        entrant1_id = events.get_entrant_id(event_id, entrant1_name, header, auto_retry, session)
+        entrant2_id = events.get_entrant_id(event_id, entrant2_name, header, auto_retry, session)
+        if entrant1_id is None or entrant2_id is None:
+            return []
+        return event_head_to_head_by_id(event_id, entrant1_id, entrant2_id, header, auto_retry, session)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return [cur_set for sets in executor.map(fetch, event_ids) for cur_set in sets]
+
+# Every set two players have played against each other, at any event
+def player_head_to_head(player1_id, player2_id, header, auto_retry, session=None, workers=DEFAULT_WORKERS):
+    variables = {"playerId": player1_id}
+    return list(iter_pages(PLAYER_HEAD_TO_HEAD_SETS_QUERY, variables, filters.player_head_to_head_filter, header,
+                           auto_retry, session, filter_args=(player1_id, player2_id), workers=workers))
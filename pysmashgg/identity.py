@@ -0,0 +1,170 @@
+"""Slug and name to ID resolution for the pysmashgg library.
+
+Many functions take a tournament slug and event slug (or an entrant's name) but
+queries need IDs, so they start with an EVENT_ID_QUERY lookup or an entrant name
+lookup. An IdentityCache remembers those mappings, and fills itself from every
+response run_query sees: any event with an id and a full slug
+(tournament/<tournament>/event/<event>) and any entrant with an id and a name
+inside a known event is recorded. Paging through an event's sets then costs one
+request per page instead of two.
+
+Entrant names are resolved by an EntrantIndex, built once from the event's full
+entrant list and kept in the IdentityCache, which matches names locally and
+refuses ambiguous ones instead of taking the first result of a fuzzy search.
+
+IDs never change once assigned, so entries don't expire; the least recently
+used ones are dropped once there are more than max_entries.
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 100000
+
+def _tournament_key(slug):
+    # tourneySlug arguments may or may not have the tournament/ prefix that slugs in responses do
+    return str(slug).split('/')[1] if str(slug).startswith('tournament/') else str(slug)
+
+def strip_sponsor(name):
+    """A tag without its sponsor prefix, e.g. Mang0 for C9 | Mang0"""
+    return name.split('|')[-1].strip()
+
+def split_event_slug(slug):
+    """(tournament slug, event slug) from a full event slug, None if it isn't one"""
+    parts = (slug or '').split('/')
+    if len(parts) >= 4 and parts[0] == 'tournament' and parts[2] == 'event':
+        return parts[1], parts[3]
+    return None
+
+# Marks a key shared by several entrants, which matches none of them
+_AMBIGUOUS = object()
+
+class EntrantIndex(object):
+    # entrants are records from filters.event_entrants_filter
+    # Names are matched exactly, then case-insensitively, then without sponsor prefixes
+    # (against both the entrant's name and its players' tags)
+    # A key shared by several entrants matches none of them, so matches never depend on order
+    def __init__(self, entrants):
+        self.entrants = list(entrants)
+        self._keys = ({}, {}, {})
+        for entrant in self.entrants:
+            name = entrant['name'] or ''
+            tags = [player['playerTag'] for player in entrant['entrantPlayers'] if player['playerTag']]
+            self._add(0, name, entrant)
+            self._add(1, name.casefold(), entrant)
+            for tag in [name] + tags:
+                self._add(2, strip_sponsor(tag).casefold(), entrant)
+
+    def __len__(self):
+        return len(self.entrants)
+
+    def _add(self, level, key, entrant):
+        keys = self._keys[level]
+        if keys.get(key, entrant) is not entrant:
+            keys[key] = _AMBIGUOUS
+        else:
+            keys[key] = entrant
+
+    # The entrant record a name refers to, None if it matches no entrant (or several)
+    def entrant(self, name):
+        for level, key in enumerate((name, name.casefold(), strip_sponsor(name).casefold())):
+            entrant = self._keys[level].get(key)
+            if entrant is _AMBIGUOUS:
+                return None
+            if entrant is not None:
+                return entrant
+        return None
+
+    def entrant_id(self, name):
+        entrant = self.entrant(name)
+        return entrant['entrantId'] if entrant is not None else None
+
+    # Player ID of the entrant's player whose tag matches name, or of its only player
+    def player_id(self, name):
+        entrant = self.entrant(name)
+        if entrant is None:
+            return None
+        tag = strip_sponsor(name).casefold()
+        for player in entrant['entrantPlayers']:
+            if player['playerTag'] and strip_sponsor(player['playerTag']).casefold() == tag:
+                return player['playerId']
+        if len(entrant['entrantPlayers']) == 1:
+            return entrant['entrantPlayers'][0]['playerId']
+        return None
+
+class IdentityCache(object):
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _get(self, key):
+        with self._lock:
+            value = self._ids.get(key)
+            if value is not None:
+                self._ids.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        with self._lock:
+            self._ids[key] = value
+            self._ids.move_to_end(key)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+
+    # Event ID for an event slug at a tournament, None if it hasn't been seen
+    def event_id(self, tournament_slug, event_slug):
+        return self._get(('event', _tournament_key(tournament_slug), event_slug))
+
+    def add_event(self, tournament_slug, event_slug, event_id):
+        self._set(('event', _tournament_key(tournament_slug), event_slug), event_id)
+
+    # Entrant ID for an entrant's name at an event, None if it hasn't been seen
+    def entrant_id(self, event_id, name):
+        return self._get(('entrant', str(event_id), name))
+
+    def add_entrant(self, event_id, name, entrant_id):
+        self._set(('entrant', str(event_id), name), entrant_id)
+
+    # EntrantIndex of an event, None if one hasn't been built
+    def entrant_index(self, event_id):
+        return self._get(('index', str(event_id)))
+
+    def add_entrant_index(self, event_id, index):
+        self._set(('index', str(event_id)), index)
+
+    # Records every event and entrant ID in a response
+    def observe(self, variables, response):
+        data = (response or {}).get('data')
+        if not isinstance(data, dict):
+            return
+        event_id = (variables or {}).get('eventId')
+        for field, value in data.items():
+            self._walk(value, field, event_id if field.endswith('event') else None)
+
+    def _walk(self, value, field, event_id):
+        if isinstance(value, list):
+            for item in value:
+                self._walk(item, field, event_id)
+            return
+        if not isinstance(value, dict):
+            return
+
+        if field in ('event', 'events') or field.endswith('_event'):
+            if value.get('id') is not None:
+                event_id = value['id']
+                slugs = split_event_slug(value.get('slug'))
+                if slugs is not None:
+                    self.add_event(slugs[0], slugs[1], event_id)
+        elif field in ('entrant', 'entrants') and event_id is not None:
+            if value.get('id') is not None and value.get('name'):
+                self.add_entrant(event_id, value['name'], value['id'])
+        elif field in ('tournament', 'tournaments'):
+            event_id = None
+
+        for child_field, child in value.items():
+            # Connection nodes belong to the connection's field (entrants { nodes { ... } })
+            self._walk(child, field if child_field == 'nodes' else child_field, event_id)
@@ -0,0 +1,91 @@
+"""API key rotation for the pysmashgg library.
+
+A KeyPool holds several start.gg API keys, each with its own RateLimiter. Every
+request is sent with the usable key that has the most budget left, so N keys give
+roughly N times the throughput of one. Keys that get rate limited (429) are
+cooled down for a while, and keys that keep getting rejected (400/401) are
+quarantined and never used again.
+"""
+
+import threading
+import time
+from pysmashgg.exceptions import RequestError
+from pysmashgg.ratelimit import RateLimiter, DEFAULT_REQUESTS, DEFAULT_WINDOW
+
+DEFAULT_COOLDOWN = 10
+DEFAULT_MAX_BAD_REQUESTS = 3
+
+class _KeyState(object):
+    def __init__(self, rate_limiter):
+        self.rate_limiter = rate_limiter
+        self.cooldown_until = 0
+        self.rate_limited = 0
+        self.bad_requests = 0
+        self.quarantined = False
+
+class KeyPool(object):
+    def __init__(self, keys, requests=DEFAULT_REQUESTS, window=DEFAULT_WINDOW,
+                 cooldown=DEFAULT_COOLDOWN, max_bad_requests=DEFAULT_MAX_BAD_REQUESTS):
+        self.keys = list(keys)
+        if not self.keys:
+            raise ValueError("KeyPool needs at least one key")
+        self.window = window
+        self.cooldown = cooldown
+        self.max_bad_requests = max_bad_requests
+        self._states = {key: _KeyState(RateLimiter(requests, window)) for key in self.keys}
+        self._lock = threading.Lock()
+
+    # Picks the usable key with the most budget left and reserves a request on it
+    # Returns (key, seconds to wait), key is None if every key is cooling down
+    def _choose(self):
+        with self._lock:
+            now = time.monotonic()
+            usable = [key for key in self.keys if not self._states[key].quarantined]
+            if not usable:
+                raise RequestError
+            ready = [key for key in usable if self._states[key].cooldown_until <= now]
+            if not ready:
+                return None, min(self._states[key].cooldown_until for key in usable) - now
+            key = max(ready, key=lambda key: self._states[key].rate_limiter.available())
+            return key, self._states[key].rate_limiter.reserve()
+
+    # Blocks until a key can be used and returns it
+    def acquire(self):
+        while True:
+            key, wait = self._choose()
+            if wait > 0:
+                time.sleep(wait)
+            if key is not None:
+                return key
+
+    # Same as acquire, but yields to the event loop while waiting
+    async def acquire_async(self):
+        import asyncio
+        while True:
+            key, wait = self._choose()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if key is not None:
+                return key
+
+    # Records how a request sent with key went
+    def report(self, key, status_code):
+        with self._lock:
+            state = self._states[key]
+            if status_code == 429:
+                # Consecutive 429s double the cooldown, up to a full rate limit window
+                state.rate_limited += 1
+                cooldown = min(self.cooldown * 2 ** (state.rate_limited - 1), self.window)
+                state.cooldown_until = time.monotonic() + cooldown
+            elif status_code in (400, 401):
+                state.bad_requests += 1
+                if state.bad_requests >= self.max_bad_requests:
+                    state.quarantined = True
+            elif status_code < 400:
+                state.rate_limited = 0
+                state.bad_requests = 0
+
+    # Keys that are still in rotation
+    def active_keys(self):
+        with self._lock:
+            return [key for key in self.keys if not self._states[key].quarantined]
@@ -15,3 +15,47 @@ def league_show_filter(response):
         league['slug'] = league_data['slug']
 
     return league
+
+def league_show_schedule_filter(response):
+    """Filter for the show_schedule function"""
+    if response['data']['league'] is None:
+        return
+    if response['data']['league']['events']['nodes'] is None:
+        return
+
+    events = []
+    for node in response['data']['league']['events']['nodes']:
+        cur_event = {}
+        cur_event['eventId'] = node['id']
+        cur_event['eventName'] = node['name']
+        cur_event['eventSlug'] = node['slug'].split('/')[-1]
+        cur_event['eventStartAt'] = node['startAt']
+        cur_event['eventNumEntrants'] = node['numEntrants']
+        cur_event['tournamentId'] = node['tournament']['id']
+        cur_event['tournamentName'] = node['tournament']['name']
+        cur_event['tournamentSlug'] = node['tournament']['slug'].split('/')[-1]
+        events.append(cur_event)
+
+    return events
+
+def league_show_standings_filter(response):
+    """Filter for the show_standings function"""
+    if response['data']['league'] is None:
+        return
+    if response['data']['league']['standings']['nodes'] is None:
+        return
+
+    players = []
+    for node in response['data']['league']['standings']['nodes']:
+        cur_player = {}
+        cur_player['id'] = node['id']
+        cur_player['standing'] = node['placement']
+        if node['player'] is not None:
+            cur_player['name'] = node['player']['gamerTag']
+            cur_player['playerId'] = node['player']['id']
+        else:
+            cur_player['name'] = None
+            cur_player['playerId'] = None
+        players.append(cur_player)
+
+    return players
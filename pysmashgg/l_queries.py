@@ -13,14 +13,18 @@ SHOW_QUERY = """query ($slug: String!){
   }
 }"""
 
-SHOW_SCHEDULE_QUERY = """query LeagueSchedule ($slug: String!, $page: Int!){
+SHOW_SCHEDULE_QUERY = """query LeagueSchedule ($slug: String!, $page: Int!, $perPage: Int = 20){
   league(slug: $slug) {
     id
     name
     events(query: {
       page: $page,
-      perPage: 20
+      perPage: $perPage
     }) {
+      pageInfo {
+        total
+        totalPages
+      }
       nodes {
         id
         name
@@ -37,12 +41,16 @@ SHOW_SCHEDULE_QUERY = """query LeagueSchedule ($slug: String!, $page: Int!){
   }
 }"""
 
-SHOW_STANDINGS_QUERY = """query LeagueStandings ($slug: String!, $page: Int!){
+SHOW_STANDINGS_QUERY = """query LeagueStandings ($slug: String!, $page: Int!, $perPage: Int = 25){
   league(slug: $slug) {
     standings (query: {
       page: $page,
-      perPage: 25
+      perPage: $perPage
     }) {
+      pageInfo {
+        total
+        totalPages
+      }
       nodes {
         id
         placement
@@ -5,26 +5,39 @@ from pysmashgg.queries import (
     LEAGUE_SHOW_STANDINGS_QUERY
 )
 from pysmashgg.api import run_query
+from pysmashgg.pagination import iter_pages
 
 # Shows metadata for a league
-def show(league_name, header, auto_retry):
+def show(league_name, header, auto_retry, session=None):
     variables = {"slug": league_name}
-    response = run_query(LEAGUE_SHOW_QUERY, variables, header, auto_retry)
+    response = run_query(LEAGUE_SHOW_QUERY, variables, header, auto_retry, session)
     data = filters.league_show_filter(response)
     return data
 
 # Shows schedule for a league
-def show_schedule(league_name, page_num, header, auto_retry):
+def show_schedule(league_name, page_num, header, auto_retry, session=None):
     variables = {"slug": league_name, "page": page_num}
-    response = run_query(LEAGUE_SHOW_SCHEDULE_QUERY, variables, header, auto_retry)
+    response = run_query(LEAGUE_SHOW_SCHEDULE_QUERY, variables, header, auto_retry, session)
     data = filters.league_show_schedule_filter(response)
     return data
 
+# Yields the whole schedule of a league, one page at a time
+def iter_schedule(league_name, header, auto_retry, session=None):
+    variables = {"slug": league_name}
+    return iter_pages(LEAGUE_SHOW_SCHEDULE_QUERY, variables, filters.league_show_schedule_filter, header, auto_retry,
+                      session)
+
 # Shows standings for a league
-def show_standings(league_name, page_num, header, auto_retry):
+def show_standings(league_name, page_num, header, auto_retry, session=None):
     variables = {"slug": league_name, "page": page_num}
-    response = run_query(LEAGUE_SHOW_STANDINGS_QUERY, variables, header, auto_retry)
+    response = run_query(LEAGUE_SHOW_STANDINGS_QUERY, variables, header, auto_retry, session)
     data = filters.league_show_standings_filter(response)
     return data
 
+# Yields the whole standings of a league, one page at a time
+def iter_standings(league_name, header, auto_retry, session=None):
+    variables = {"slug": league_name}
+    return iter_pages(LEAGUE_SHOW_STANDINGS_QUERY, variables, filters.league_show_standings_filter, header,
+                      auto_retry, session)
+
 # THIS WAS MADE A SEPERATE FILE TO MAKE ROOM FOR FUTURE EXPANSION
@@ -0,0 +1,134 @@
+"""Tournament and event lifecycle tracking for the pysmashgg library.
+
+Responses often say where a tournament or event is in its lifecycle: a `state`
+(an int for tournaments, an ActivityState name for events) or `startAt`/`endAt`
+timestamps. A LifecycleTracker reads those out of every response it sees,
+remembers them by ID and slug, and tells the caches which phase a response
+belongs to, so completed events can be kept forever while live ones expire in
+seconds.
+
+Only the root entity a query's variables name (the event for $eventId, the
+tournament for $tourneySlug...) decides a response's phase. Lists of
+tournaments or events, e.g. an owner's or a player's, can grow at any time
+however finished the items listed so far are, so they get the default TTL; the
+phases of the items in them are still remembered for later queries about them.
+"""
+
+import re
+import threading
+import time
+
+UPCOMING = 'upcoming'
+ACTIVE = 'active'
+COMPLETED = 'completed'
+
+# Tournament.state is an int, Event.state an ActivityState name
+_STATE_PHASES = {
+    1: UPCOMING, 2: ACTIVE, 3: COMPLETED,
+    'CREATED': UPCOMING, 'ACTIVE': ACTIVE, 'QUEUED': ACTIVE, 'CALLED': ACTIVE,
+    'READY': ACTIVE, 'COMPLETED': COMPLETED,
+}
+
+# Response fields holding tournaments, events or phase groups
+_KINDS = {
+    'tournament': 'tournament', 'tournaments': 'tournament', 'event': 'event', 'events': 'event',
+    'phaseGroup': 'phaseGroup', 'phaseGroups': 'phaseGroup',
+}
+
+# Root fields that are a single entity, and the variables that can name it
+_ROOT_VARIABLES = {'tournament': ('tourneySlug', 'slug'), 'event': ('eventId',), 'phaseGroup': ('phaseGroupId',)}
+
+# Root fields aliased by pysmashgg.batch look like b3_event
+# and their variables like eventId_b3
+_BATCH_ALIAS = re.compile(r'^b(\d+)_(\w+)$')
+
+# Events can stay ACTIVE for a while after they end if nobody finalizes them,
+# so end times alone only count as completed after this long
+COMPLETED_GRACE = 24 * 60 * 60
+
+def phase_of(entity, now=None):
+    """Lifecycle phase of a tournament or event dict, None if it doesn't say"""
+    state = entity.get('state')
+    if state in _STATE_PHASES:
+        return _STATE_PHASES[state]
+    now = now if now is not None else time.time()
+    start, end = entity.get('startAt'), entity.get('endAt')
+    if end is not None and end + COMPLETED_GRACE < now:
+        return COMPLETED
+    if start is not None and start > now:
+        return UPCOMING
+    if start is not None and end is not None:
+        return ACTIVE
+    # Started, but without an end time there's no telling whether it's over
+    return None
+
+def _slug_key(slug):
+    # tourneySlug variables don't have the tournament/ prefix that slugs in responses do
+    return slug.split('/')[1] if slug.startswith('tournament/') else slug
+
+class LifecycleTracker(object):
+    def __init__(self):
+        self._phases = {}
+        self._lock = threading.Lock()
+
+    # Phase last seen for a tournament (by slug or id) or event (by id)
+    def phase(self, kind, key):
+        with self._lock:
+            return self._phases.get((kind, str(key)))
+
+    def _record(self, kind, key, phase):
+        if key is not None:
+            with self._lock:
+                self._phases[(kind, str(key))] = phase
+
+    # Reads every tournament and event phase out of a response
+    # Returns the set of phases of the entities the query's variables name (empty for lists)
+    def observe(self, response, variables=None):
+        variables = variables or {}
+        phases = set()
+        data = (response or {}).get('data') or {}
+        for field, value in data.items():
+            suffix = ''
+            match = _BATCH_ALIAS.match(field)
+            if match:
+                field, suffix = match.group(2), '_b' + match.group(1)
+            kind = _KINDS.get(field)
+            self._walk(value, kind)
+            if field not in _ROOT_VARIABLES:
+                continue
+            # The root entity is the one the query's variables name
+            names = [name + suffix for name in _ROOT_VARIABLES[field] if name + suffix in variables]
+            if not names:
+                continue
+            key = variables[names[0]]
+            key = _slug_key(key) if kind == 'tournament' else key
+            phase = phase_of(value) if isinstance(value, dict) else None
+            if phase is not None:
+                self._record(kind, key, phase)
+            else:
+                phase = self.phase(kind, key)
+            if phase is not None:
+                phases.add(phase)
+        return phases
+
+    # Records the phase of every tournament/event under value
+    def _walk(self, value, kind):
+        if isinstance(value, list):
+            for item in value:
+                self._walk(item, kind)
+        elif isinstance(value, dict):
+            if kind is not None:
+                phase = phase_of(value)
+                if phase is not None:
+                    self._record(kind, value.get('id'), phase)
+                    if kind == 'tournament' and value.get('slug'):
+                        self._record(kind, _slug_key(value['slug']), phase)
+            for field, child in value.items():
+                self._walk(child, kind if field == 'nodes' else _KINDS.get(field))
+
+# The most live phase wins, a response about one active event isn't safe to keep for long
+def most_live(phases):
+    for phase in (ACTIVE, UPCOMING, COMPLETED):
+        if phase in phases:
+            return phase
+    return None
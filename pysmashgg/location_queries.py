@@ -1,15 +1,19 @@
 # Location-based queries for finding tournaments
 
 # Query to get tournaments by country
-SHOW_BY_COUNTRY_QUERY = """query TournamentsByCountry($countryCode: String!, $page: Int!) {
+SHOW_BY_COUNTRY_QUERY = """query TournamentsByCountry($countryCode: String!, $page: Int!, $perPage: Int = 32) {
   tournaments(query: {
-    perPage: 32,
+    perPage: $perPage,
     page: $page,
     sortBy: "startAt desc"
     filter: {
       countryCode: $countryCode
     }
   }) {
+    pageInfo {
+      total
+      totalPages
+    }
     nodes {
       id
       name
@@ -25,14 +29,18 @@ SHOW_BY_COUNTRY_QUERY = """query TournamentsByCountry($countryCode: String!, $pa
 }"""
 
 # Query to get tournaments by state
-SHOW_BY_STATE_QUERY = """query TournamentsByState($state: String!, $page: Int!) {
+SHOW_BY_STATE_QUERY = """query TournamentsByState($state: String!, $page: Int!, $perPage: Int = 32) {
   tournaments(query: {
-    perPage: 32
+    perPage: $perPage
     page: $page
     filter: {
       addrState: $state
     }
   }) {
+    pageInfo {
+      total
+      totalPages
+    }
     nodes {
       id
       name
@@ -47,10 +55,10 @@ SHOW_BY_STATE_QUERY = """query TournamentsByState($state: String!, $page: Int!)
 }"""
 
 # Query to get tournaments by radius
-SHOW_BY_RADIUS_QUERY = """query ($page: Int, $coordinates: String!, $radius: String!) {
+SHOW_BY_RADIUS_QUERY = """query ($page: Int, $perPage: Int = 32, $coordinates: String!, $radius: String!) {
   tournaments(query: {
     page: $page
-    perPage: 32
+    perPage: $perPage
     filter: {
       location: {
         distanceFrom: $coordinates,
@@ -58,6 +66,10 @@ SHOW_BY_RADIUS_QUERY = """query ($page: Int, $coordinates: String!, $radius: Str
       }
     }
   }) {
+    pageInfo {
+      total
+      totalPages
+    }
     nodes {
       id
       name
@@ -0,0 +1,92 @@
+"""Streaming newline-delimited JSON export for the pysmashgg library.
+
+NdjsonWriter writes records one JSON object per line as they come, so any
+iterator of records (an iter_* walk, a whole season's crawl) can be dumped
+without ever holding more than one batch of it in memory. Output can be
+compressed with gzip, or with zstd (needs zstandard, pip install
+pysmashgg[zstd]); by default the compression is picked from the file
+extension (.gz or .zst).
+
+Written data is flushed to the file every flush_bytes bytes, so a crash or a
+reader tailing the file only ever misses the last batch.
+"""
+
+import gzip
+import json
+import threading
+
+DEFAULT_FLUSH_BYTES = 1024 * 1024
+
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+def compression_for(path):
+    """Compression implied by a file's extension, None for plain files"""
+    path = str(path)
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith('.zst') or path.endswith('.zstd'):
+        return 'zstd'
+    return None
+
+def _open(path, compression, level):
+    if compression is None:
+        return open(path, 'wb')
+    if compression == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=level if level is not None else 6)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression needs zstandard, install it with 'pip install pysmashgg[zstd]'")
+        compressor = zstandard.ZstdCompressor(level=level if level is not None else 3)
+        return compressor.stream_writer(open(path, 'wb'), closefd=True)
+    raise ValueError("Unknown compression: %s (use one of %s)" % (compression, ', '.join(map(str, COMPRESSIONS))))
+
+class NdjsonWriter(object):
+    # compression is None, 'gzip', 'zstd' or 'auto' (picked from the path's extension)
+    # level is the compression level, each compressor's default if None
+    # Can be shared by several threads; each write() call's records stay together
+    def __init__(self, path, compression='auto', level=None, flush_bytes=DEFAULT_FLUSH_BYTES):
+        self.path = path
+        self.compression = compression_for(path) if compression == 'auto' else compression
+        self.flush_bytes = flush_bytes
+        self.rows = 0
+        self._file = _open(path, self.compression, level)
+        self._unflushed = 0
+        self._lock = threading.Lock()
+
+    def write(self, records):
+        lines = ''.join(json.dumps(record, separators=(',', ':'), default=str) + '\n' for record in records)
+        if not lines:
+            return
+        data = lines.encode('utf-8')
+        with self._lock:
+            self._file.write(data)
+            self.rows += lines.count('\n')
+            self._unflushed += len(data)
+            if self._unflushed >= self.flush_bytes:
+                self._file.flush()
+                self._unflushed = 0
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_ndjson(records, path, compression='auto', level=None, batch_size=256):
+    """Writes an iterator of records to an NDJSON file, batch_size records at a time,
+    returning how many were written"""
+    with NdjsonWriter(path, compression, level) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                writer.write(batch)
+                batch = []
+        writer.write(batch)
+    return writer.rows
@@ -68,6 +68,38 @@ def player_show_tournaments_filter(response):
 
     return tournaments
 
+def player_show_tournaments_for_game_filter(response, videogame_id):
+    """Filter for the show_tournaments_for_game function, one record per event of the game the player entered"""
+    if response['data']['player'] is None:
+        return
+    if response['data']['player']['user']['tournaments']['nodes'] is None:
+        return
+
+    tournaments = []
+    for node in response['data']['player']['user']['tournaments']['nodes']:
+        for event in node['events'] or []:
+            if str(event['videogame']['id']) != str(videogame_id):
+                continue
+            # The entrants are filtered on the player's name, so none means they didn't enter this event
+            if not event['entrants']['nodes']:
+                continue
+
+            cur_tournament = {}
+            cur_tournament['tournamentName'] = node['name']
+            cur_tournament['tournamentSlug'] = node['slug'].split('/')[-1]
+            cur_tournament['tournamentId'] = node['id']
+            cur_tournament['attendees'] = node['numAttendees']
+            cur_tournament['country'] = node['countryCode']
+            cur_tournament['unixTimestamp'] = node['startAt']
+            cur_tournament['eventName'] = event['name']
+            cur_tournament['eventSlug'] = event['slug'].split('/')[-1]
+            cur_tournament['eventId'] = event['id']
+            cur_tournament['eventEntrants'] = event['numEntrants']
+            cur_tournament['entrantId'] = event['entrants']['nodes'][0]['id']
+            tournaments.append(cur_tournament)
+
+    return tournaments
+
 def show_players_by_sponsor_filter(response):
     """Filter for showing players by sponsor"""
     if response['data']['tournament'] is None:
@@ -54,10 +54,14 @@ PLAYER_INFO_QUERY = """query ($playerId: ID!) {
   }
 }"""
 
-PLAYER_SHOW_TOURNAMENTS_QUERY = """query ($playerId: ID!, $page: Int!) {
+PLAYER_SHOW_TOURNAMENTS_QUERY = """query ($playerId: ID!, $page: Int!, $perPage: Int = 64) {
   player (id: $playerId) {
     user {
-      tournaments (query: {perPage: 64, page: $page}) {
+      tournaments (query: {perPage: $perPage, page: $page}) {
+        pageInfo {
+          total
+          totalPages
+        }
         nodes {
           name
           slug
@@ -267,6 +271,49 @@ PLAYER_RECENT_GAME_PLACEMENTS_QUERY = """query ($slug: String!, $gameID: ID) {
   }
 }"""
 
+PLAYER_HEAD_TO_HEAD_SETS_QUERY = """query PlayerHeadToHeadSets($playerId: ID!, $page: Int!, $perPage: Int = 32) {
+  player(id: $playerId) {
+    sets(page: $page, perPage: $perPage) {
+      pageInfo {
+        total
+        totalPages
+      }
+      nodes {
+        id
+        fullRoundText
+        completedAt
+        winnerId
+        slots {
+          standing {
+            stats {
+              score {
+                value
+              }
+            }
+          }
+          entrant {
+            id
+            name
+            participants {
+              player {
+                id
+              }
+            }
+          }
+        }
+        phaseGroup {
+          id
+        }
+        event {
+          id
+          name
+          slug
+        }
+      }
+    }
+  }
+}"""
+
 PLAYER_LOOKUP_ID_QUERY = """query LookupPlayerId($discriminatorSlug: String!) {
   user(slug: $discriminatorSlug) {
     player {
@@ -317,3 +364,110 @@ PLAYER_SETS_QUERY = """query Sets($playerId: ID!, $isOnline: Boolean!, $eventId:
     }
   }
 }"""
+
+# Number of sets PLAYER_PROFILE_QUERY returns in each of offlineSets and onlineSets
+PLAYER_PROFILE_SETS_PER_PAGE = 15
+
+# Everything the profile queries select on a player, shared so the two can't drift apart
+PLAYER_PROFILE_FIELDS = """
+    id
+    prefix
+    gamerTag
+    user {
+      name
+      discriminator
+      slug
+      location {
+        city
+        state
+        country
+      }
+      authorizations(types: [TWITTER, TWITCH, DISCORD]) {
+        type
+        externalUsername
+        url
+      }
+      images {
+        id
+        url
+        height
+        width
+        ratio
+        type
+      }
+    }
+    recentStandings(videogameId: $gameID, limit: 20) @include(if: $withStandings) {
+      id
+      placement
+      entrant {
+        id
+        name
+        event {
+          id
+          name
+          slug
+          isOnline
+          numEntrants
+          startAt
+          videogame {
+            id
+            displayName
+          }
+          tournament {
+            id
+            name
+            slug
+          }
+        }
+      }
+    }
+    offlineSets: sets(perPage: %(perPage)d, page: 1, filters: {isEventOnline: false}) @include(if: $withSets) {
+      %(sets)s
+    }
+    onlineSets: sets(perPage: %(perPage)d, page: 1, filters: {isEventOnline: true}) @include(if: $withSets) {
+      %(sets)s
+    }
+""" % {'perPage': PLAYER_PROFILE_SETS_PER_PAGE, 'sets': """nodes {
+        id
+        fullRoundText
+        displayScore
+        slots(includeByes: true) {
+          id
+          entrant {
+            id
+            name
+          }
+          standing {
+            stats {
+              score {
+                value
+              }
+            }
+          }
+        }
+        winnerId
+        completedAt
+        event {
+          id
+          numEntrants
+          isOnline
+          tournament {
+            name
+            slug
+            startAt
+          }
+        }
+      }"""}
+
+# A player's info, recent standings (for one game if gameID is given) and, with withSets, their latest
+# sets offline and online, all in one request; see cli.utils.player.fetch_player_profile
+PLAYER_PROFILE_QUERY = """query PlayerProfile($playerId: ID!, $gameID: ID, $withStandings: Boolean = true, $withSets: Boolean = false) {
+  player(id: $playerId) {""" + PLAYER_PROFILE_FIELDS + """  }
+}"""
+
+# PLAYER_PROFILE_QUERY for a user slug (user/b1008ff3) instead of a player ID
+PLAYER_PROFILE_BY_SLUG_QUERY = """query PlayerProfileBySlug($slug: String!, $gameID: ID, $withStandings: Boolean = true, $withSets: Boolean = false) {
+  user(slug: $slug) {
+    player {""" + PLAYER_PROFILE_FIELDS + """    }
+  }
+}"""
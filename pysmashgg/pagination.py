@@ -0,0 +1,313 @@
+"""Auto-pagination for the pysmashgg library.
+
+Every paged query takes a $page variable, returns at most perPage nodes and
+selects pageInfo { total totalPages }. iter_pages fetches the first page, reads
+totalPages from it, then fetches the remaining pages concurrently through a
+bounded pool of workers, still yielding the filtered records one by one in page
+order. At most `workers` pages are in flight or waiting to be yielded at once,
+so memory stays flat however long the walk is.
+
+If a response has no pageInfo, pages are fetched one after another instead,
+stopping at the first page that comes back empty or with fewer nodes than
+perPage. Either way, a short or empty page ends the walk, in case the totals
+changed under us.
+
+Short pages are judged by the raw nodes in the response, not by the filtered
+records, since filters drop some nodes (sets without two entrants, events for
+other games...). A page that couldn't be fetched at all (no response once
+run_query gave up, or GraphQL errors) is not a short page: the walk raises
+PageError instead of quietly returning what it had so far.
+
+Page sizes adapt per query: a walk starts at the perPage the query was written
+with (its $perPage default, tuned by hand against the API), or the largest size
+whose estimated complexity (see pysmashgg.complexity) fits for queries without
+one. If the server rejects the first page as too complex, the size is bisected
+down until it fits, and later walks of the same query start from the best size
+found so far, probing larger sizes again while there's room between the largest
+size that worked and the smallest that didn't. Probes never go past the
+estimate (or the starting size, if that's larger), and a walk whose first page
+came from the response cache doesn't move the size, since perPage is part of
+the cache key and a new size would miss it. Sizes are learned per session; when
+the session has a DiskCache, what was learned is kept there, so each CLI run
+doesn't repeat the same rejected sizes before settling.
+"""
+
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pysmashgg.api import run_query
+from pysmashgg.complexity import MAX_COMPLEXITY, estimate_cost, variable_defaults
+from pysmashgg.exceptions import PageError
+from pysmashgg.session import get_default_session
+from pysmashgg.queries import (
+    EVENT_ENTRANTS_QUERY,
+    HEAD_TO_HEAD_SETS_QUERY,
+    SHOW_ENTRANT_SETS_QUERY,
+    SHOW_SETS_QUERY,
+    SHOW_ENTRANTS_QUERY,
+    SHOW_LIGHTWEIGHT_RESULTS_QUERY,
+    SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY,
+    SHOW_BY_VIDEOGAME_QUERY,
+    SHOW_BY_COUNTRY_QUERY,
+    SHOW_BY_STATE_QUERY,
+    SHOW_BY_RADIUS_QUERY,
+    SHOW_BY_OWNER_QUERY,
+    BRACKET_SHOW_ENTRANTS_QUERY,
+    BRACKET_SHOW_SETS_QUERY,
+    PLAYER_SHOW_TOURNAMENTS_QUERY,
+    PLAYER_HEAD_TO_HEAD_SETS_QUERY,
+    LEAGUE_SHOW_SCHEDULE_QUERY,
+    LEAGUE_SHOW_STANDINGS_QUERY
+)
+
+DEFAULT_WORKERS = 4
+
+# Largest page ever asked for, however cheap a query looks
+MAX_PER_PAGE = 100
+
+# Where each paged query's connection (the object holding pageInfo and nodes) sits under data
+# Every one of these queries takes $page and $perPage variables
+PAGED_QUERIES = {
+    EVENT_ENTRANTS_QUERY: ('event', 'entrants'),
+    HEAD_TO_HEAD_SETS_QUERY: ('event', 'sets'),
+    SHOW_ENTRANT_SETS_QUERY: ('event', 'sets'),
+    SHOW_SETS_QUERY: ('event', 'sets'),
+    SHOW_ENTRANTS_QUERY: ('event', 'standings'),
+    SHOW_LIGHTWEIGHT_RESULTS_QUERY: ('event', 'standings'),
+    SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY: ('tournaments',),
+    SHOW_BY_VIDEOGAME_QUERY: ('tournaments',),
+    SHOW_BY_COUNTRY_QUERY: ('tournaments',),
+    SHOW_BY_STATE_QUERY: ('tournaments',),
+    SHOW_BY_RADIUS_QUERY: ('tournaments',),
+    SHOW_BY_OWNER_QUERY: ('tournaments',),
+    BRACKET_SHOW_ENTRANTS_QUERY: ('phaseGroup', 'seeds'),
+    BRACKET_SHOW_SETS_QUERY: ('phaseGroup', 'sets'),
+    PLAYER_SHOW_TOURNAMENTS_QUERY: ('player', 'user', 'tournaments'),
+    PLAYER_HEAD_TO_HEAD_SETS_QUERY: ('player', 'sets'),
+    LEAGUE_SHOW_SCHEDULE_QUERY: ('league', 'events'),
+    LEAGUE_SHOW_STANDINGS_QUERY: ('league', 'standings'),
+}
+
+def pick_per_page(query, variables=None, max_complexity=MAX_COMPLEXITY, limit=MAX_PER_PAGE):
+    """Largest perPage (up to limit) whose estimated cost stays under max_complexity"""
+    variables = dict(variables or {})
+    low, high = 1, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_cost(query, dict(variables, perPage=middle)) <= max_complexity:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def default_per_page(query):
+    """The perPage a walk of a query starts from: its $perPage default, else pick_per_page's estimate"""
+    per_page = variable_defaults(query).get('perPage')
+    return per_page if isinstance(per_page, int) else pick_per_page(query)
+
+def is_complexity_error(response):
+    """Whether the server rejected a query for asking for too many objects"""
+    return any('complexity' in (error.get('message') or '').lower() for error in (response or {}).get('errors') or [])
+
+class PageSizer(object):
+    # Bisects between the largest size known to work and the smallest known to be too complex
+    # learned is a (good, bad) pair from an earlier run, see BaseCache.page_size
+    def __init__(self, start, limit=MAX_PER_PAGE, learned=None):
+        self.size = start
+        self.good = 0
+        self.bad = limit + 1
+        self._lock = threading.Lock()
+        if learned is not None:
+            good, bad = learned
+            self.bad = min(self.bad, bad)
+            if good:
+                self.succeeded(good)
+            else:
+                self.size = min(start, max(1, self.bad // 2))
+
+    def state(self):
+        return self.good, self.bad
+
+    # The server said size is too complex
+    def failed(self, size):
+        with self._lock:
+            self.bad = min(self.bad, size)
+            self.size = max(1, (self.good + self.bad) // 2 if self.good else size // 2)
+
+    # A page of size came back fine, the next walk tries halfway to the smallest size that failed
+    def succeeded(self, size):
+        with self._lock:
+            self.good = max(self.good, size)
+            if self.bad - self.good > 1:
+                self.size = (self.good + self.bad) // 2
+            else:
+                self.size = self.good
+
+# Session -> {query: PageSizer}
+_sizers = weakref.WeakKeyDictionary()
+_sizers_lock = threading.Lock()
+
+def page_sizer(query, session=None):
+    """The PageSizer shared by every walk of a query through a session, starting from what
+    the session's cache learned in earlier runs"""
+    if session is None:
+        session = get_default_session()
+    with _sizers_lock:
+        sizers = _sizers.setdefault(session, {})
+        if query not in sizers:
+            start = default_per_page(query)
+            learned = session.cache.page_size(query) if session.cache is not None else None
+            sizers[query] = PageSizer(start, limit=max(start, pick_per_page(query)), learned=learned)
+        return sizers[query]
+
+# Keeps what the first page of a walk taught the sizer, if it learned anything
+def _remember(query, sizer, cache, before):
+    if cache is not None and sizer.state() != before:
+        cache.set_page_size(query, *sizer.state())
+
+def page_connection(response, path):
+    """The connection at path under a response's data, None if it isn't there"""
+    value = (response or {}).get('data')
+    for field in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(field)
+    return value if isinstance(value, dict) else None
+
+def page_nodes(response, path):
+    """The list of nodes in the connection at path, None if it isn't there"""
+    return (page_connection(response, path) or {}).get('nodes')
+
+def total_pages(response, path):
+    """totalPages from the connection's pageInfo, None if the response doesn't say"""
+    page_info = (page_connection(response, path) or {}).get('pageInfo') or {}
+    return page_info.get('totalPages')
+
+def is_failed_page(response):
+    """Whether a page couldn't be fetched (no response, or GraphQL errors), as opposed to being short or empty"""
+    return response is None or bool(response.get('errors'))
+
+# The records of one page, and whether pages after it are worth fetching
+# A page that failed raises PageError rather than passing for the end of the walk
+def _read_page(response, path, per_page, filter, filter_args, page):
+    if is_failed_page(response):
+        errors = (response or {}).get('errors') or []
+        detail = '; '.join(error.get('message') or '' for error in errors) or 'no response'
+        raise PageError("Page {} couldn't be fetched: {}".format(page, detail))
+    nodes = page_nodes(response, path)
+    if not nodes:
+        return [], False
+    return filter(response, *filter_args) or [], len(nodes) >= per_page
+
+# Yields every record of every page of a query in PAGED_QUERIES
+# filter (with any extra filter_args) turns one page's response into a list of records
+# Pages after the first are fetched by up to `workers` threads at once
+def iter_pages(query, variables, filter, header, auto_retry, session=None, filter_args=(), workers=DEFAULT_WORKERS):
+    if session is None:
+        session = get_default_session()
+    path = PAGED_QUERIES[query]
+    sizer = page_sizer(query, session)
+    before = sizer.state()
+
+    def fetch(page, per_page):
+        return run_query(query, dict(variables, page=page, perPage=per_page), header, auto_retry, session)
+
+    # The first page settles the page size, shrinking it until the server accepts it
+    per_page = sizer.size
+    sent = session.requests_sent
+    response = fetch(1, per_page)
+    while is_complexity_error(response) and per_page > 1:
+        sizer.failed(per_page)
+        per_page = sizer.size
+        response = fetch(1, per_page)
+    # A first page from the cache taught nothing, and a new size would miss the cache next time
+    # (requests sent by other threads meanwhile only make it look fetched, which just means probing)
+    if page_nodes(response, path) is not None and session.requests_sent != sent:
+        sizer.succeeded(per_page)
+    _remember(query, sizer, session.cache, before)
+
+    last = total_pages(response, path)
+    records, more = _read_page(response, path, per_page, filter, filter_args, 1)
+    yield from records
+
+    if last is None or workers <= 1:
+        page = 1
+        while more:
+            page += 1
+            records, more = _read_page(fetch(page, per_page), path, per_page, filter, filter_args, page)
+            yield from records
+        return
+
+    pages = iter(range(2, last + 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque((page, executor.submit(fetch, page, per_page)) for _, page in zip(range(workers), pages))
+        try:
+            while more and in_flight:
+                read, future = in_flight.popleft()
+                response = future.result()
+                page = next(pages, None)
+                if page is not None:
+                    in_flight.append((page, executor.submit(fetch, page, per_page)))
+                records, more = _read_page(response, path, per_page, filter, filter_args, read)
+                yield from records
+        finally:
+            # The caller stopped early, or the pages ran out before totalPages said they would
+            for _, future in in_flight:
+                future.cancel()
+
+# Async version of iter_pages, sent through an AsyncSession
+# Pages after the first are fetched up to `workers` at once
+async def aiter_pages(query, variables, filter, header, auto_retry, session, filter_args=(), workers=DEFAULT_WORKERS):
+    import asyncio
+    from pysmashgg import async_api
+
+    path = PAGED_QUERIES[query]
+    sizer = page_sizer(query, session)
+    before = sizer.state()
+
+    async def fetch(page, per_page):
+        variables_for_page = dict(variables, page=page, perPage=per_page)
+        return await async_api.run_query(query, variables_for_page, header, auto_retry, session)
+
+    per_page = sizer.size
+    sent = session.requests_sent
+    response = await fetch(1, per_page)
+    while is_complexity_error(response) and per_page > 1:
+        sizer.failed(per_page)
+        per_page = sizer.size
+        response = await fetch(1, per_page)
+    # A first page from the cache taught nothing, and a new size would miss the cache next time
+    if page_nodes(response, path) is not None and session.requests_sent != sent:
+        sizer.succeeded(per_page)
+    _remember(query, sizer, session.cache, before)
+
+    last = total_pages(response, path)
+    records, more = _read_page(response, path, per_page, filter, filter_args, 1)
+    for record in records:
+        yield record
+
+    if last is None or workers <= 1:
+        page = 1
+        while more:
+            page += 1
+            records, more = _read_page(await fetch(page, per_page), path, per_page, filter, filter_args, page)
+            for record in records:
+                yield record
+        return
+
+    pages = iter(range(2, last + 1))
+    in_flight = deque((page, asyncio.ensure_future(fetch(page, per_page))) for _, page in zip(range(workers), pages))
+    try:
+        while more and in_flight:
+            read, task = in_flight.popleft()
+            response = await task
+            page = next(pages, None)
+            if page is not None:
+                in_flight.append((page, asyncio.ensure_future(fetch(page, per_page))))
+            records, more = _read_page(response, path, per_page, filter, filter_args, read)
+            for record in records:
+                yield record
+    finally:
+        for _, task in in_flight:
+            task.cancel()
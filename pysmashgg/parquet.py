@@ -0,0 +1,185 @@
+"""Columnar Parquet export for the pysmashgg library.
+
+Writes the flat records the filters produce (sets from show_sets_filter or
+bracket_show_sets_filter, entrants from show_entrants_filter, results from
+show_lightweight_results_filter) to Parquet files through Arrow. Each kind of
+record has a fixed schema, so every file of one kind can be read as one table;
+keys a record doesn't have are written as nulls, keys the schema doesn't list
+are dropped. Tags, names, round and bracket names repeat a lot, so those columns
+are dictionary-encoded.
+
+Records are buffered and written out one row group at a time, so memory is
+bounded by row_group_size rows however many records are written.
+
+Needs pyarrow (pip install pysmashgg[parquet]).
+"""
+
+import threading
+
+DEFAULT_ROW_GROUP_SIZE = 50000
+
+# Column types, turned into Arrow types by _arrow_type
+INT = 'int'
+BOOL = 'bool'
+STRING = 'string'
+# Strings with few distinct values, dictionary-encoded
+LABEL = 'label'
+INT_LIST = 'int_list'
+PLAYERS = 'players'
+STRING_MAP = 'string_map'
+
+# Columns every kind of record can be tagged with (see pysmashgg.export)
+_TAGS = [('eventId', INT), ('eventName', LABEL)]
+
+SCHEMAS = {
+    'sets': [
+        # Sets that haven't been started yet have IDs like preview_123_1
+        ('id', STRING),
+        ('entrant1Id', INT), ('entrant2Id', INT),
+        ('entrant1Name', LABEL), ('entrant2Name', LABEL),
+        ('entrant1Score', INT), ('entrant2Score', INT),
+        ('completed', BOOL),
+        ('winnerId', INT), ('loserId', INT),
+        ('winnerName', LABEL), ('loserName', LABEL),
+        ('fullRoundText', LABEL),
+        ('bracketName', LABEL), ('bracketId', INT),
+        ('entrant1Chars', INT_LIST), ('entrant2Chars', INT_LIST), ('gameWinners', INT_LIST),
+        ('entrant1Players', PLAYERS), ('entrant2Players', PLAYERS),
+    ] + _TAGS,
+    'entrants': [
+        ('entrantId', INT), ('tag', LABEL), ('finalPlacement', INT), ('seed', INT),
+        ('entrantPlayers', PLAYERS),
+    ] + _TAGS,
+    'lightweight_results': [
+        ('id', INT), ('placement', INT), ('name', LABEL), ('player_id', INT), ('user_slug', STRING),
+        ('socials', STRING_MAP),
+    ] + _TAGS,
+}
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow, install it with 'pip install pysmashgg[parquet]'")
+    return pyarrow, pyarrow.parquet
+
+def _int(value):
+    # IDs are sometimes missing, or filled in as the string "None"
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _string(value):
+    return None if value is None else str(value)
+
+def _value(column_type, value):
+    if column_type == INT:
+        return _int(value)
+    if column_type == BOOL:
+        return None if value is None else bool(value)
+    if column_type in (STRING, LABEL):
+        return _string(value)
+    if column_type == INT_LIST:
+        return None if value is None else [_int(item) for item in value]
+    if column_type == PLAYERS:
+        if value is None:
+            return None
+        return [{'playerId': _int(player.get('playerId')), 'playerTag': _string(player.get('playerTag')),
+                 'entrantId': _int(player.get('entrantId'))} for player in value]
+    if column_type == STRING_MAP:
+        return None if value is None else [(str(key), _string(item)) for key, item in value.items()]
+    raise ValueError("Unknown column type: %s" % column_type)
+
+def record_columns(records, kind):
+    """Records of a kind as {column: [values]}, with values coerced to the column's type"""
+    schema = SCHEMAS[kind]
+    columns = {name: [] for name, _ in schema}
+    for record in records:
+        for name, column_type in schema:
+            columns[name].append(_value(column_type, record.get(name)))
+    return columns
+
+def _arrow_type(pa, column_type):
+    if column_type == PLAYERS:
+        return pa.list_(pa.struct([('playerId', pa.int64()), ('playerTag', pa.string()), ('entrantId', pa.int64())]))
+    return {
+        INT: pa.int64(),
+        BOOL: pa.bool_(),
+        STRING: pa.string(),
+        LABEL: pa.dictionary(pa.int32(), pa.string()),
+        INT_LIST: pa.list_(pa.int64()),
+        STRING_MAP: pa.map_(pa.string(), pa.string()),
+    }[column_type]
+
+def arrow_schema(kind):
+    """Arrow schema of a kind of record"""
+    pa, _ = _import_pyarrow()
+    return pa.schema([(name, _arrow_type(pa, column_type)) for name, column_type in SCHEMAS[kind]])
+
+def arrow_table(records, kind):
+    """Records of a kind as an Arrow table"""
+    pa, _ = _import_pyarrow()
+    columns = record_columns(records, kind)
+    arrays = []
+    for name, column_type in SCHEMAS[kind]:
+        if column_type == LABEL:
+            arrays.append(pa.array(columns[name], pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[name], _arrow_type(pa, column_type)))
+    return pa.Table.from_arrays(arrays, schema=arrow_schema(kind))
+
+class ParquetWriter(object):
+    # Streams records of one kind to a Parquet file, one row group per row_group_size records
+    # Can be shared by several threads, like the NDJSON files of pysmashgg.export
+    def __init__(self, path, kind, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression='zstd'):
+        _, pq = _import_pyarrow()
+        self.path = path
+        self.kind = kind
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._buffer = []
+        self._writer = pq.ParquetWriter(path, arrow_schema(kind), compression=compression)
+        self._lock = threading.Lock()
+
+    def write(self, records):
+        with self._lock:
+            self._buffer.extend(records)
+            while len(self._buffer) >= self.row_group_size:
+                self._write_row_group(self._buffer[:self.row_group_size])
+                self._buffer = self._buffer[self.row_group_size:]
+
+    def _write_row_group(self, records):
+        self._writer.write_table(arrow_table(records, self.kind), row_group_size=len(records))
+        self.rows += len(records)
+
+    def close(self):
+        with self._lock:
+            if self._buffer:
+                self._write_row_group(self._buffer)
+                self._buffer = []
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_parquet(records, path, kind, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression='zstd'):
+    """Writes an iterator of records of a kind ('sets', 'entrants' or 'lightweight_results') to a Parquet file,
+    returning how many were written"""
+    with ParquetWriter(path, kind, row_group_size, compression) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= row_group_size:
+                writer.write(batch)
+                batch = []
+        writer.write(batch)
+    return writer.rows
@@ -5,27 +5,42 @@ from pysmashgg.queries import (
     PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY
 )
 from pysmashgg.api import run_query
+from pysmashgg.batch import Batch
+from pysmashgg.pagination import iter_pages
 
 # Shows info for a player
-def show_info(player_id, header, auto_retry):
+def show_info(player_id, header, auto_retry, session=None):
     variables = {"playerId": player_id}
-    response = run_query(PLAYER_SHOW_INFO_QUERY, variables, header, auto_retry)
+    response = run_query(PLAYER_SHOW_INFO_QUERY, variables, header, auto_retry, session)
     data = filters.player_show_info_filter(response)
     return data
 
+# Shows info for many players, batched into as few requests as possible
+def show_info_batch(player_ids, header, auto_retry, session=None):
+    batch = Batch()
+    for player_id in player_ids:
+        batch.add(PLAYER_SHOW_INFO_QUERY, {"playerId": player_id}, filters.player_show_info_filter)
+    return batch.run(header, auto_retry, session)
+
 # Shows tournament attended by a player
-def show_tournaments(player_id, page_num, header, auto_retry):
+def show_tournaments(player_id, page_num, header, auto_retry, session=None):
     variables = {"playerId": player_id, "page": page_num}
-    response = run_query(PLAYER_SHOW_TOURNAMENTS_QUERY, variables, header, auto_retry)
+    response = run_query(PLAYER_SHOW_TOURNAMENTS_QUERY, variables, header, auto_retry, session)
     data = filters.player_show_tournaments_filter(response)
     return data
 
+# Yields every tournament attended by a player, one page at a time
+def iter_tournaments(player_id, header, auto_retry, session=None):
+    variables = {"playerId": player_id}
+    return iter_pages(PLAYER_SHOW_TOURNAMENTS_QUERY, variables, filters.player_show_tournaments_filter, header,
+                      auto_retry, session)
+
 # Shows tournaments attended by a player for a certain game
 # This is SUPER janky code but I don't know how to get it to work otherwise
-def show_tournaments_for_game(player_id, player_name, videogame_id, page_num, header, auto_retry):
+def show_tournaments_for_game(player_id, player_name, videogame_id, page_num, header, auto_retry, session=None):
     variables = {"playerId": player_id, "playerName": player_name, "videogameId": videogame_id, "page": page_num}
-    response = run_query(PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY, variables, header, auto_retry)
-    data = filters.player_show_tournaments_for_game(response, videogame_id)
+    response = run_query(PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY, variables, header, auto_retry, session)
+    data = filters.player_show_tournaments_for_game_filter(response, videogame_id)
     return data
 
 # THIS WAS MADE A SEPERATE FILE TO MAKE ROOM FOR FUTURE EXPANSION
@@ -1,58 +1,72 @@
-# Import all queries from their respective modules
-from pysmashgg.t_queries import (
-    SHOW_QUERY,
-    SHOW_WITH_BRACKETS_QUERY,
-    SHOW_PLAYERS_BY_SPONSOR,
-    SHOW_BY_OWNER_QUERY,
-    TOURNAMENT_OWNER_QUERY
-)
+import importlib
 
-from pysmashgg.e_queries import (
-    EVENT_ID_QUERY,
-    SHOW_EVENTS_QUERY,
-    SHOW_SETS_QUERY,
-    SHOW_ENTRANTS_QUERY,
-    SHOW_EVENT_BRACKETS_QUERY,
-    SHOW_ENTRANT_SETS_QUERY,
-    SHOW_LIGHTWEIGHT_RESULTS_QUERY,
-    PLAYER_ID_QUERY,
-    ENTRANT_ID_QUERY
-)
+# All queries, by the module they live in; a module is only imported the first
+# time one of its queries is used (see __getattr__ below)
+_MODULES = {
+    'pysmashgg.t_queries': (
+        'SHOW_QUERY',
+        'SHOW_WITH_BRACKETS_QUERY',
+        'SHOW_PLAYERS_BY_SPONSOR',
+        'SHOW_BY_OWNER_QUERY',
+        'TOURNAMENT_OWNER_QUERY',
+        'TOURNAMENT_OVERVIEW_QUERY',
+    ),
+    'pysmashgg.e_queries': (
+        'EVENT_ID_QUERY',
+        'SHOW_EVENTS_QUERY',
+        'SHOW_SETS_QUERY',
+        'SHOW_ENTRANTS_QUERY',
+        'SHOW_EVENT_BRACKETS_QUERY',
+        'SHOW_ENTRANT_SETS_QUERY',
+        'SHOW_LIGHTWEIGHT_RESULTS_QUERY',
+        'PLAYER_ID_QUERY',
+        'ENTRANT_ID_QUERY',
+        'EVENT_ENTRANTS_QUERY',
+        'HEAD_TO_HEAD_SETS_QUERY',
+    ),
+    'pysmashgg.game_queries': (
+        'GET_VIDEOGAME_ID_QUERY',
+        'SHOW_BY_VIDEOGAME_QUERY',
+        'SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY',
+    ),
+    'pysmashgg.location_queries': (
+        'SHOW_BY_COUNTRY_QUERY',
+        'SHOW_BY_STATE_QUERY',
+        'SHOW_BY_RADIUS_QUERY',
+    ),
+    'pysmashgg.p_queries': (
+        'PLAYER_RECENT_PLACEMENTS_QUERY',
+        'PLAYER_RECENT_GAME_PLACEMENTS_QUERY',
+        'PLAYER_LOOKUP_ID_QUERY',
+        'PLAYER_SETS_QUERY',
+        'PLAYER_INFO_QUERY',
+        'PLAYER_BY_SLUG_QUERY',
+        'PLAYER_SHOW_INFO_QUERY',
+        'PLAYER_SHOW_TOURNAMENTS_QUERY',
+        'PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY',
+        'PLAYER_HEAD_TO_HEAD_SETS_QUERY',
+        'PLAYER_PROFILE_QUERY',
+        'PLAYER_PROFILE_BY_SLUG_QUERY',
+    ),
+    'pysmashgg.b_queries': (
+        'BRACKET_SHOW_ENTRANTS_QUERY',
+        'BRACKET_SHOW_SETS_QUERY',
+    ),
+    # (name here, name in the module), for names that clash with the tournament queries
+    'pysmashgg.l_queries': (
+        ('LEAGUE_SHOW_QUERY', 'SHOW_QUERY'),
+        ('LEAGUE_SHOW_SCHEDULE_QUERY', 'SHOW_SCHEDULE_QUERY'),
+        ('LEAGUE_SHOW_STANDINGS_QUERY', 'SHOW_STANDINGS_QUERY'),
+    ),
+}
 
-from pysmashgg.game_queries import (
-    GET_VIDEOGAME_ID_QUERY,
-    SHOW_BY_VIDEOGAME_QUERY,
-    SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY
-)
-
-from pysmashgg.location_queries import (
-    SHOW_BY_COUNTRY_QUERY,
-    SHOW_BY_STATE_QUERY,
-    SHOW_BY_RADIUS_QUERY
-)
-
-from pysmashgg.p_queries import (
-    PLAYER_RECENT_PLACEMENTS_QUERY,
-    PLAYER_RECENT_GAME_PLACEMENTS_QUERY,
-    PLAYER_LOOKUP_ID_QUERY,
-    PLAYER_SETS_QUERY,
-    PLAYER_INFO_QUERY,
-    PLAYER_BY_SLUG_QUERY,
-    PLAYER_SHOW_INFO_QUERY,
-    PLAYER_SHOW_TOURNAMENTS_QUERY,
-    PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY
-)
-
-from pysmashgg.b_queries import (
-    BRACKET_SHOW_ENTRANTS_QUERY,
-    BRACKET_SHOW_SETS_QUERY
-)
-
-from pysmashgg.l_queries import (
-    SHOW_QUERY as LEAGUE_SHOW_QUERY,
-    SHOW_SCHEDULE_QUERY as LEAGUE_SHOW_SCHEDULE_QUERY,
-    SHOW_STANDINGS_QUERY as LEAGUE_SHOW_STANDINGS_QUERY
-)
+# Name in this module -> (module, name there)
+_QUERIES = {}
+for _module, _names in _MODULES.items():
+    for _name in _names:
+        _alias, _name = _name if isinstance(_name, tuple) else (_name, _name)
+        _QUERIES[_alias] = (_module, _name)
+del _module, _names, _name, _alias
 
 # Export all queries
 __all__ = [
@@ -62,6 +76,7 @@ __all__ = [
     'SHOW_PLAYERS_BY_SPONSOR',
     'SHOW_BY_OWNER_QUERY',
     'TOURNAMENT_OWNER_QUERY',
+    'TOURNAMENT_OVERVIEW_QUERY',
 
     # Event queries
     'EVENT_ID_QUERY',
@@ -73,6 +88,8 @@ __all__ = [
     'SHOW_LIGHTWEIGHT_RESULTS_QUERY',
     'PLAYER_ID_QUERY',
     'ENTRANT_ID_QUERY',
+    'EVENT_ENTRANTS_QUERY',
+    'HEAD_TO_HEAD_SETS_QUERY',
 
     # Game queries
     'GET_VIDEOGAME_ID_QUERY',
@@ -94,6 +111,9 @@ __all__ = [
     'PLAYER_SHOW_INFO_QUERY',
     'PLAYER_SHOW_TOURNAMENTS_QUERY',
     'PLAYER_SHOW_TOURNAMENTS_FOR_GAME_QUERY',
+    'PLAYER_HEAD_TO_HEAD_SETS_QUERY',
+    'PLAYER_PROFILE_QUERY',
+    'PLAYER_PROFILE_BY_SLUG_QUERY',
 
     # Bracket queries
     'BRACKET_SHOW_ENTRANTS_QUERY',
@@ -104,3 +124,14 @@ __all__ = [
     'LEAGUE_SHOW_SCHEDULE_QUERY',
     'LEAGUE_SHOW_STANDINGS_QUERY'
 ]
+
+def __getattr__(name):
+    if name not in _QUERIES:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    module, source_name = _QUERIES[name]
+    value = getattr(importlib.import_module(module), source_name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_QUERIES))
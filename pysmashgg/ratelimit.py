@@ -0,0 +1,53 @@
+"""Client-side rate limiting for the pysmashgg library.
+
+start.gg allows 80 requests per 60 seconds per key. Rather than waiting for a 429
+and backing off, every request takes a token from a RateLimiter first, so a busy
+client stays just under the limit. One RateLimiter can be shared by several
+threads, several SmashGG clients and AsyncSmashGG clients at the same time.
+"""
+
+import threading
+import time
+
+DEFAULT_REQUESTS = 80
+DEFAULT_WINDOW = 60
+
+class RateLimiter(object):
+    def __init__(self, requests=DEFAULT_REQUESTS, window=DEFAULT_WINDOW):
+        self.requests = requests
+        self.window = window
+        self._rate = requests / window
+        self._tokens = float(requests)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Takes a token and returns how many seconds the caller has to wait before using it
+    # Tokens can go negative, which queues callers up in the order they asked
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.requests, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self._rate
+
+    # Number of requests that can be sent right now without waiting
+    def available(self):
+        with self._lock:
+            now = time.monotonic()
+            return max(0.0, min(self.requests, self._tokens + (now - self._updated) * self._rate))
+
+    # Blocks the current thread until a request can be sent
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    # Same as acquire, but yields to the event loop while waiting
+    async def acquire_async(self):
+        import asyncio
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,84 @@
+"""Retry policy for the pysmashgg library.
+
+run_query retries rate limited (429) requests, transient server errors (500, 502,
+503, 504) and network failures. A RetryPolicy decides how long to wait before
+each retry: Retry-After style headers from the server win, otherwise the wait is
+an exponential backoff with full jitter, capped at max_delay. A policy also gives
+up after max_attempts tries, and keeps a retry budget shared by every request of
+the client that owns it, so a long outage can't park every worker in backoff.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class RetryPolicy(object):
+    def __init__(self, max_attempts=6, base_delay=2, max_delay=60, jitter=True,
+                 retry_statuses=RETRY_STATUSES, budget=30, budget_window=60):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.budget = budget
+        self.budget_window = budget_window
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    # Checks if a status code is worth retrying
+    def should_retry(self, status_code):
+        return status_code in self.retry_statuses
+
+    # Seconds to wait before retrying a request that just failed its attempt-th try,
+    # or None if it shouldn't be retried
+    def delay(self, attempt, headers=None):
+        if attempt >= self.max_attempts or not self._take_budget():
+            return None
+        retry_after = _retry_after(headers)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    # Takes one retry out of the client-wide budget, False if it's used up
+    def _take_budget(self):
+        if self.budget is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            while self._retries and now - self._retries[0] > self.budget_window:
+                self._retries.popleft()
+            if len(self._retries) >= self.budget:
+                return False
+            self._retries.append(now)
+            return True
+
+# Reads how long the server asked us to wait, in seconds
+def _retry_after(headers):
+    if not headers:
+        return None
+    value = headers.get('Retry-After')
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            # An HTTP date, which is rare enough not to import email.utils up front
+            from email.utils import parsedate_to_datetime
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+    value = headers.get('X-RateLimit-Reset')
+    if value is not None:
+        try:
+            reset = float(value)
+        except ValueError:
+            return None
+        # Either a unix timestamp or a number of seconds
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+    return None
@@ -0,0 +1,108 @@
+"""Pooled HTTP session used by run_query.
+
+A Session keeps a pool of keep-alive connections to the GraphQL endpoint, so
+every query after the first reuses an open TCP/TLS connection instead of paying
+for a new handshake. One Session can be shared by any number of threads; when
+every pooled connection is busy, callers wait for one to free up instead of
+opening throwaway connections. A Session can also carry a RateLimiter, which
+every request waits on before it is sent, a KeyPool, which picks the API key
+each request is sent with, the RetryPolicy run_query follows and the cache it
+checks before sending anything. Identical queries sent by several threads at
+once are coalesced into one request (see pysmashgg.singleflight), and every
+response's event and entrant IDs are remembered in the session's IdentityCache.
+
+requests is only imported, and the connection pool only built, once the first
+request is sent, so importing pysmashgg or building a client stays cheap for
+callers that are answered from the cache or never send anything.
+"""
+
+import threading
+from pysmashgg.exceptions import NetworkError
+from pysmashgg.identity import IdentityCache
+from pysmashgg.ratelimit import RateLimiter
+from pysmashgg.retry import RetryPolicy
+from pysmashgg.singleflight import SingleFlight
+
+API_URL = 'https://api.smash.gg/gql/alpha'
+DEFAULT_POOL_SIZE = 10
+
+class Session(object):
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=None, rate_limiter=None, key_pool=None, retry_policy=None,
+                 cache=None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.key_pool = key_pool
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        self.inflight = SingleFlight()
+        self.identity = IdentityCache()
+        # Every request sent over the network, retries included (cache hits aren't requests)
+        self.requests_sent = 0
+        self._requests_lock = threading.Lock()
+        self._http = None
+        self._http_lock = threading.Lock()
+        self._network_errors = ()
+
+    # The requests session is built on first use rather than in __init__
+    def _get_http(self):
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    http = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+                    http.mount('https://', adapter)
+                    http.mount('http://', adapter)
+                    self._network_errors = (requests.ConnectionError, requests.Timeout)
+                    self._http = http
+        return self._http
+
+    # Sends one GraphQL request over a pooled connection
+    # Raises NetworkError if the server can't be reached
+    def post(self, json_request, header):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        key = None
+        if self.key_pool is not None:
+            # The pool's key replaces whatever key the header was built with
+            key = self.key_pool.acquire()
+            header = dict(header, Authorization="Bearer " + key)
+
+        http = self._get_http()
+        with self._requests_lock:
+            self.requests_sent += 1
+        try:
+            request = http.post(url=API_URL, json=json_request, headers=header, timeout=self.timeout)
+        except self._network_errors as error:
+            raise NetworkError(error)
+
+        if key is not None:
+            self.key_pool.report(key, request.status_code)
+        return request
+
+    # Closes every pooled connection
+    def close(self):
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+def get_default_session():
+    """Get the process-wide Session used when run_query isn't given one"""
+    global _default_session
+    if _default_session is None:
+        with _default_session_lock:
+            if _default_session is None:
+                _default_session = Session(rate_limiter=RateLimiter())
+    return _default_session
@@ -0,0 +1,84 @@
+"""Request coalescing for the pysmashgg library.
+
+When several threads (or tasks) ask for the same (query, variables) with the
+same headers at once, only the first one actually sends a request. The others wait for it to finish
+and get its result, so a burst of identical lookups costs one request instead
+of one per caller. Nothing is remembered once the request is done; that is the
+cache's job.
+
+Callers with different headers (another API key, say) never share a request, so
+nobody gets a response fetched with someone else's credentials.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from pysmashgg.cache import cache_key
+
+def flight_key(query, variables, header):
+    """Key under which concurrent identical requests are coalesced: the query, its variables and a hash of the headers"""
+    header_hash = hashlib.sha256(json.dumps(header or {}, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return cache_key(query, variables) + ':' + header_hash
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight(object):
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._calls)
+
+    # Runs function unless a call with the same key is already running,
+    # in which case this waits for that call and returns its result
+    def do(self, key, function):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Each waiter gets its own copy, so callers can't change each other's results
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+class AsyncSingleFlight(object):
+    def __init__(self):
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    # Awaits function() unless a call with the same key is already running,
+    # in which case this awaits that call and returns its result
+    async def do(self, key, function):
+        import asyncio
+        task = self._calls.get(key)
+        if task is not None:
+            return copy.deepcopy(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(function())
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Shielded, so the request keeps going for everyone else if the first caller is cancelled
+        return await asyncio.shield(task)
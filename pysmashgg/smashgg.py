@@ -1,17 +1,42 @@
-import requests
-from pysmashgg import exceptions, tournaments, brackets, players, events, leagues, api
+from pysmashgg import exceptions, tournaments, brackets, players, events, leagues, head_to_head, export, api
+from pysmashgg.keypool import KeyPool
+from pysmashgg.ratelimit import RateLimiter
+from pysmashgg.session import Session, DEFAULT_POOL_SIZE
 
 class SmashGG(object):
-    def __init__(self, key, auto_retry=True):
+    # key can be a single key, a list of keys or a KeyPool
+    # With one key, rate_limiter defaults to start.gg's published limit, pass the same
+    # RateLimiter to several clients to have them share one budget
+    # With several keys, each key is rate limited by the KeyPool instead
+    # retry_policy (a RetryPolicy) controls how failed requests are retried when auto_retry is on
+    # cache (e.g. a MemoryCache) is checked before any query is sent, no caching by default
+    def __init__(self, key, auto_retry=True, pool_size=DEFAULT_POOL_SIZE, rate_limiter=None, retry_policy=None,
+                 cache=None):
+        if isinstance(key, (list, tuple)):
+            key = KeyPool(key)
+        if isinstance(key, KeyPool):
+            self.key_pool = key
+            key = key.keys[0]
+        else:
+            self.key_pool = None
+            if rate_limiter is None:
+                rate_limiter = RateLimiter()
         self.key = key
         self.header = {"Authorization": "Bearer " + key}
         self.auto_retry = auto_retry
-        
+        # Pooled keep-alive connections, shared by every query this client sends
+        self.session = Session(pool_size, rate_limiter=rate_limiter, key_pool=self.key_pool,
+                               retry_policy=retry_policy, cache=cache)
+
+    # Closes the client's pooled connections
+    def close(self):
+        self.session.close()
+
     def set_key_and_header(self, new_key):
         self.key = new_key
         self.header = {"Authorization": "Bearer " + new_key}
 
-    # Sets automatic retry, a variable that says if run_query retries if too many requests
+    # Sets automatic retry, a variable that says if run_query retries rate limited, server and network errors
     def set_auto_retry(self, boo):
         self.auto_retry = boo
 
@@ -26,134 +51,253 @@ class SmashGG(object):
 
     # Event_id for a tournament
     def tournament_show_event_id(self, tournament_name, event_name):
-        return tournaments.get_event_id(tournament_name, event_name, self.header, self.auto_retry)
+        return tournaments.get_event_id(tournament_name, event_name, self.header, self.auto_retry, session=self.session)
 
     # Metadata for a tournament
     def tournament_show(self, tournament_name):
-        return tournaments.show(tournament_name, self.header, self.auto_retry)
+        return tournaments.show(tournament_name, self.header, self.auto_retry, session=self.session)
+
+    # Metadata, owner, events and each event's top_n standings for a tournament, in one request
+    def tournament_overview(self, tournament_name, top_n=8):
+        return tournaments.overview(tournament_name, top_n, self.header, self.auto_retry, session=self.session)
 
     # Metadata for a tournament with a bracket
     def tournament_show_with_brackets(self, tournament_name, event_name):
-        return tournaments.show_with_brackets(tournament_name, event_name, self.header, self.auto_retry)
+        return tournaments.show_with_brackets(tournament_name, event_name, self.header, self.auto_retry, session=self.session)
 
     # Same as tournament_show_with_brackets but for all brackets
     def tournament_show_with_brackets_all(self, tournament_name):
-        return tournaments.show_with_brackets_all(tournament_name, self.header, self.auto_retry)
+        return tournaments.show_with_brackets_all(tournament_name, self.header, self.auto_retry, session=self.session)
 
     # List of events for a tournament
     def tournament_show_events(self, tournament_name):
-        return tournaments.show_events(tournament_name, self.header, self.auto_retry)
+        return tournaments.show_events(tournament_name, self.header, self.auto_retry, session=self.session)
 
     # List of sets for an event
     def tournament_show_sets(self, tournament_name, event_name, page_num):
-        return tournaments.show_sets(tournament_name, event_name, page_num, self.header, self.auto_retry)
+        return tournaments.show_sets(tournament_name, event_name, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_sets, but walks every page, yielding one record at a time
+    def iter_tournament_sets(self, tournament_name, event_name):
+        return tournaments.iter_sets(tournament_name, event_name, self.header, self.auto_retry, session=self.session)
+
+    # Every set of an event in one EventSnapshot, answering entrant sets, head to head and bracket path
+    # questions without further requests
+    def event_snapshot(self, event_id):
+        return events.snapshot(event_id, self.header, self.auto_retry, session=self.session)
 
     # List of entrants for an event
     def tournament_show_entrants(self, tournament_name, event_name, page_num):
-        return tournaments.show_entrants(tournament_name, event_name, page_num, self.header, self.auto_retry)
+        return tournaments.show_entrants(tournament_name, event_name, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_entrants, but walks every page, yielding one record at a time
+    def iter_tournament_entrants(self, tournament_name, event_name):
+        return tournaments.iter_entrants(tournament_name, event_name, self.header, self.auto_retry, session=self.session)
     
     # Bracket info for an event at a tournament
     def tournament_show_event_brackets(self, tournament_name, event_name):
-        return tournaments.show_event_brackets(tournament_name, event_name, self.header, self.auto_retry)
+        return tournaments.show_event_brackets(tournament_name, event_name, self.header, self.auto_retry, session=self.session)
     
     # Bracket info for all events at a tournament
     def tournament_show_all_event_brackets(self, tournament_name):
-        return tournaments.show_all_event_brackets(tournament_name, self.header, self.auto_retry)
+        return tournaments.show_all_event_brackets(tournament_name, self.header, self.auto_retry, session=self.session)
 
     # All sets from an entrant at an event
     def tournament_show_entrant_sets(self, tournament_name, event_name, entrant_name):
-        return tournaments.show_entrant_sets(tournament_name, event_name, entrant_name, self.header, self.auto_retry)
+        return tournaments.show_entrant_sets(tournament_name, event_name, entrant_name, self.header, self.auto_retry, session=self.session)
 
     # All sets between two entrants at an event
     def tournament_show_head_to_head(self, tournament_name, event_name, entrant1_name, entrant2_name):
-        return tournaments.show_head_to_head(tournament_name, event_name, entrant1_name, entrant2_name, self.header, self.auto_retry)
+        return tournaments.show_head_to_head(tournament_name, event_name, entrant1_name, entrant2_name, self.header, self.auto_retry, session=self.session)
 
     # All tournaments with events (of a certain game) of a minimum size in between two unix timestamps
     def tournament_show_event_by_game_size_dated(self, num_entrants, videogame_id, after, before, page_num):
-        return tournaments.show_event_by_game_size_dated(num_entrants, videogame_id, after, before, page_num, self.header, self.auto_retry)
+        return tournaments.show_event_by_game_size_dated(num_entrants, videogame_id, after, before, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_event_by_game_size_dated, but walks every page, yielding one record at a time
+    def iter_tournament_event_by_game_size_dated(self, num_entrants, videogame_id, after, before):
+        return tournaments.iter_event_by_game_size_dated(num_entrants, videogame_id, after, before, self.header, self.auto_retry, session=self.session)
 
     # Results of an event with only entrant name, id, and placement
     def tournament_show_lightweight_results(self, tournament_name, event_name, page_num):
-        return tournaments.show_lightweight_results(tournament_name, event_name, page_num, self.header, self.auto_retry)
+        return tournaments.show_lightweight_results(tournament_name, event_name, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_lightweight_results, but walks every page, yielding one record at a time
+    def iter_tournament_lightweight_results(self, tournament_name, event_name):
+        return tournaments.iter_lightweight_results(tournament_name, event_name, self.header, self.auto_retry, session=self.session)
 
     # All tournaments by country (at least, as many at the API can display)
     def tournament_show_by_country(self, country_code, page_num):
-        return tournaments.show_by_country(country_code, page_num, self.header, self.auto_retry)
+        return tournaments.show_by_country(country_code, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_by_country, but walks every page, yielding one record at a time
+    def iter_tournament_by_country(self, country_code):
+        return tournaments.iter_by_country(country_code, self.header, self.auto_retry, session=self.session)
 
     # All tournaments by US State
     def tournament_show_by_state(self, state_code, page_num):
-        return tournaments.show_by_state(state_code, page_num, self.header, self.auto_retry)
+        return tournaments.show_by_state(state_code, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_by_state, but walks every page, yielding one record at a time
+    def iter_tournament_by_state(self, state_code):
+        return tournaments.iter_by_state(state_code, self.header, self.auto_retry, session=self.session)
 
     # All tournaments in a radius of a certain coordinate point
     def tournament_show_by_radius(self, coordinates, radius, page_num):
-        return tournaments.show_by_radius(coordinates, radius, page_num, self.header, self.auto_retry)
+        return tournaments.show_by_radius(coordinates, radius, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_by_radius, but walks every page, yielding one record at a time
+    def iter_tournament_by_radius(self, coordinates, radius):
+        return tournaments.iter_by_radius(coordinates, radius, self.header, self.auto_retry, session=self.session)
 
     # Players from a tournament with a certain sponsor
     def tournament_show_players_by_sponsor(self, tournament_name, sponsor):
-        return tournaments.show_players_by_sponsor(tournament_name, sponsor, self.header, self.auto_retry)
+        return tournaments.show_players_by_sponsor(tournament_name, sponsor, self.header, self.auto_retry, session=self.session)
     
     # Tournaments by owner id
     def tournament_show_by_owner(self, owner, page_num):
-        return tournaments.show_by_owner(owner, page_num, self.header, self.auto_retry)
+        return tournaments.show_by_owner(owner, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_by_owner, but walks every page, yielding one record at a time
+    def iter_tournament_by_owner(self, owner):
+        return tournaments.iter_by_owner(owner, self.header, self.auto_retry, session=self.session)
 
     # All entrants in a bracket (phaseGroup) at a tournament
     def bracket_show_entrants(self, bracket_id, page_num):
-        return brackets.show_entrants(bracket_id, page_num, self.header, self.auto_retry)
+        return brackets.show_entrants(bracket_id, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as bracket_show_entrants, but walks every page, yielding one record at a time
+    def iter_bracket_entrants(self, bracket_id):
+        return brackets.iter_entrants(bracket_id, self.header, self.auto_retry, session=self.session)
 
     # All sets in a bracket (phaseGroup) at a tournament
     def bracket_show_sets(self, bracket_id, page_num):
-        return brackets.show_sets(bracket_id, page_num, self.header, self.auto_retry)
+        return brackets.show_sets(bracket_id, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as bracket_show_sets, but walks every page, yielding one record at a time
+    def iter_bracket_sets(self, bracket_id):
+        return brackets.iter_sets(bracket_id, self.header, self.auto_retry, session=self.session)
 
     # Player metadata
     def player_show_info(self, player_id):
-        return players.show_info(player_id, self.header, self.auto_retry)
+        return players.show_info(player_id, self.header, self.auto_retry, session=self.session)
+
+    # Player metadata for many players, in as few requests as possible
+    def player_show_info_batch(self, player_ids):
+        return players.show_info_batch(player_ids, self.header, self.auto_retry, session=self.session)
 
     # All tournaments by a player (where they registered with their smash.gg account)
     def player_show_tournaments(self, player_id, page_num):
-        return players.show_tournaments(player_id, page_num, self.header, self.auto_retry)
+        return players.show_tournaments(player_id, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as player_show_tournaments, but walks every page, yielding one record at a time
+    def iter_player_tournaments(self, player_id):
+        return players.iter_tournaments(player_id, self.header, self.auto_retry, session=self.session)
     
     # All tournaments by a player for a certain game
     # Use https://docs.google.com/spreadsheets/d/1l-mcho90yDq4TWD-Y9A22oqFXGo8-gBDJP0eTmRpTaQ/
     # to find the game_id you're looking for
     def player_show_tournaments_for_game(self, player_id, player_name, videogame_id, page_num):
-        return players.show_tournaments_for_game(player_id, player_name, videogame_id, page_num, self.header, self.auto_retry)
+        return players.show_tournaments_for_game(player_id, player_name, videogame_id, page_num, self.header, self.auto_retry, session=self.session)
 
     # List of sets for an event
     def event_show_sets(self, event_id, page_num):
-        return events.show_sets(event_id, page_num, self.header, self.auto_retry)
+        return events.show_sets(event_id, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as event_show_sets, but walks every page, yielding one record at a time
+    def iter_event_sets(self, event_id):
+        return events.iter_sets(event_id, self.header, self.auto_retry, session=self.session)
 
     # List of entrants for an event
     def event_show_entrants(self, event_id, page_num):
-        return events.show_entrants(event_id, page_num, self.header, self.auto_retry)
+        return events.show_entrants(event_id, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as event_show_entrants, but walks every page, yielding one record at a time
+    def iter_event_entrants(self, event_id):
+        return events.iter_entrants(event_id, self.header, self.auto_retry, session=self.session)
+
+    # Name index of every entrant at an event (an EntrantIndex), built once per client
+    # Once built, entrant and player ID lookups at the event are answered from it
+    def event_entrant_index(self, event_id):
+        return events.entrant_index(event_id, self.header, self.auto_retry, session=self.session)
 
     # All sets from an entrant at an event
     def event_show_entrant_sets(self, event_id, entrant_name):
-        return events.show_entrant_sets(event_id, entrant_name, self.header, self.auto_retry)
+        return events.show_entrant_sets(event_id, entrant_name, self.header, self.auto_retry, session=self.session)
     
     # All sets between two entrants at an event
     def event_show_head_to_head(self, event_id, entrant1_name, entrant2_name):
-        return events.show_head_to_head(event_id, entrant1_name, entrant2_name, self.header, self.auto_retry)
+        return events.show_head_to_head(event_id, entrant1_name, entrant2_name, self.header, self.auto_retry, session=self.session)
+
+    # Every set between two entrants at an event, filtered on both entrants by the server
+    def event_head_to_head(self, event_id, entrant1_name, entrant2_name):
+        return head_to_head.event_head_to_head(event_id, entrant1_name, entrant2_name, self.header, self.auto_retry,
+                                               session=self.session)
+
+    # Every set between two entrants across many events, several events fetched at once
+    def events_head_to_head(self, event_ids, entrant1_name, entrant2_name):
+        return head_to_head.events_head_to_head(event_ids, entrant1_name, entrant2_name, self.header, self.auto_retry,
+                                                session=self.session)
+
+    # Every set two players have played against each other, at any event
+    def player_head_to_head(self, player1_id, player2_id):
+        return head_to_head.player_head_to_head(player1_id, player2_id, self.header, self.auto_retry, session=self.session)
 
     # Results of an event with only entrant name, id, and placement
     def event_show_lightweight_results(self, event_id, page_num):
-        return events.show_lightweight_results(event_id, page_num, self.header, self.auto_retry)
+        return events.show_lightweight_results(event_id, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as event_show_lightweight_results, but walks every page, yielding one record at a time
+    def iter_event_lightweight_results(self, event_id):
+        return events.iter_lightweight_results(event_id, self.header, self.auto_retry, session=self.session)
+
+    # Lightweight results for many events, in as few requests as possible
+    # Smaller pages (per_page) let more events share a request
+    def event_show_lightweight_results_batch(self, event_ids, page_num, per_page=None):
+        return events.show_lightweight_results_batch(event_ids, page_num, self.header, self.auto_retry,
+                                                     session=self.session, per_page=per_page)
+
+    # Exports a tournament (metadata, events, brackets, standings and sets) into directory
+    # Event standings and bracket sets are fetched by up to `workers` threads at once, see pysmashgg.export
+    # format is 'ndjson' (compressed with compression, 'gzip' or 'zstd', if given) or 'parquet' (needs pyarrow)
+    def export_tournament(self, tournament_name, directory, workers=export.DEFAULT_WORKERS, progress=None,
+                          format='ndjson', compression=None):
+        return export.export_tournament(tournament_name, directory, self.header, self.auto_retry,
+                                        session=self.session, workers=workers, progress=progress, format=format,
+                                        compression=compression)
+
+    # Sends every query queued in a Batch, returning their filtered results in order
+    def run_batch(self, batch):
+        return batch.run(self.header, self.auto_retry, session=self.session)
 
     # Metadata for a league
     def league_show(self, league_name):
-        return leagues.show(league_name, self.header, self.auto_retry)
+        return leagues.show(league_name, self.header, self.auto_retry, session=self.session)
 
     # League schedule (with events mainly, events at each tournament)
     def league_show_schedule(self, league_name, page_num):
-        return leagues.show_schedule(league_name, page_num, self.header, self.auto_retry)
+        return leagues.show_schedule(league_name, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as league_show_schedule, but walks every page, yielding one record at a time
+    def iter_league_schedule(self, league_name):
+        return leagues.iter_schedule(league_name, self.header, self.auto_retry, session=self.session)
     
     # League standings
     def league_show_standings(self, league_name, page_num):
-        return leagues.show_standings(league_name, page_num, self.header, self.auto_retry)
+        return leagues.show_standings(league_name, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as league_show_standings, but walks every page, yielding one record at a time
+    def iter_league_standings(self, league_name):
+        return leagues.iter_standings(league_name, self.header, self.auto_retry, session=self.session)
 
     # Get video game ID by name
     def get_videogame_id(self, game_name):
-        return tournaments.get_videogame_id(game_name, self.header, self.auto_retry)
+        return tournaments.get_videogame_id(game_name, self.header, self.auto_retry, session=self.session)
     
     # Show tournaments by video game ID
     def tournament_show_by_videogame(self, videogame_id, page_num):
-        return tournaments.show_by_videogame(videogame_id, page_num, self.header, self.auto_retry)
+        return tournaments.show_by_videogame(videogame_id, page_num, self.header, self.auto_retry, session=self.session)
+
+    # Same as tournament_show_by_videogame, but walks every page, yielding one record at a time
+    def iter_tournament_by_videogame(self, videogame_id, after=None, before=None):
+        return tournaments.iter_by_videogame(videogame_id, self.header, self.auto_retry, after, before, session=self.session)
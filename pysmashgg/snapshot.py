@@ -0,0 +1,89 @@
+"""Whole-event set snapshots for the pysmashgg library.
+
+Reports covering many entrants at one event would otherwise call
+show_entrant_sets or show_head_to_head once per entrant, each with its own name
+lookup and queries. An EventSnapshot downloads every set of the event once
+(SHOW_SETS_QUERY, all pages) and answers those questions from in-memory indexes
+instead: entrant ID to sets, pair of entrant IDs to sets, and names to entrant
+IDs. A 500 entrant event takes around 30 requests instead of around 1000.
+
+A snapshot is a copy of the event as it was when it was taken; take a new one
+to see sets reported since.
+"""
+
+from pysmashgg.identity import EntrantIndex
+
+def _key(entrant_id):
+    # IDs come back from the API as ints, but may be passed in as strings
+    return str(entrant_id)
+
+class EventSnapshot(object):
+    # sets are records from filters.show_sets_filter, in the order the API returned them
+    def __init__(self, event_id, sets):
+        self.event_id = event_id
+        self.sets = list(sets)
+        self._by_entrant = {}
+        self._by_pair = {}
+        entrants = {}
+        for cur_set in self.sets:
+            entrant1, entrant2 = _key(cur_set['entrant1Id']), _key(cur_set['entrant2Id'])
+            self._by_entrant.setdefault(entrant1, []).append(cur_set)
+            self._by_entrant.setdefault(entrant2, []).append(cur_set)
+            self._by_pair.setdefault(frozenset((entrant1, entrant2)), []).append(cur_set)
+            for n in ('1', '2'):
+                entrants[_key(cur_set['entrant' + n + 'Id'])] = {
+                    'entrantId': cur_set['entrant' + n + 'Id'],
+                    'name': cur_set['entrant' + n + 'Name'],
+                    'entrantPlayers': cur_set.get('entrant' + n + 'Players', []),
+                }
+        self.index = EntrantIndex(entrants.values())
+
+    def __len__(self):
+        return len(self.sets)
+
+    # Entrant ID for an entrant ID or name, None if no set at the event has that entrant
+    def entrant_id(self, entrant):
+        if _key(entrant) in self._by_entrant:
+            return entrant
+        if isinstance(entrant, str):
+            return self.index.entrant_id(entrant)
+        return None
+
+    # Every set an entrant (by ID or name) played at the event
+    def entrant_sets(self, entrant):
+        entrant_id = self.entrant_id(entrant)
+        if entrant_id is None:
+            return []
+        return list(self._by_entrant.get(_key(entrant_id), []))
+
+    # Every set between two entrants (by ID or name) at the event
+    def head_to_head(self, entrant1, entrant2):
+        entrant1_id, entrant2_id = self.entrant_id(entrant1), self.entrant_id(entrant2)
+        if entrant1_id is None or entrant2_id is None:
+            return []
+        return list(self._by_pair.get(frozenset((_key(entrant1_id), _key(entrant2_id))), []))
+
+    # An entrant's run through the event, one step per set from their side of it
+    def bracket_path(self, entrant):
+        entrant_id = self.entrant_id(entrant)
+        if entrant_id is None:
+            return []
+        path = []
+        for cur_set in self._by_entrant.get(_key(entrant_id), []):
+            side, other = ('1', '2') if _key(cur_set['entrant1Id']) == _key(entrant_id) else ('2', '1')
+            step = {}
+            step['setId'] = cur_set['id']
+            step['bracketId'] = cur_set['bracketId']
+            step['bracketName'] = cur_set['bracketName']
+            step['fullRoundText'] = cur_set['fullRoundText']
+            step['opponentId'] = cur_set['entrant' + other + 'Id']
+            step['opponentName'] = cur_set['entrant' + other + 'Name']
+            step['score'] = cur_set['entrant' + side + 'Score']
+            step['opponentScore'] = cur_set['entrant' + other + 'Score']
+            step['completed'] = cur_set['completed']
+            if 'winnerId' in cur_set:
+                step['won'] = _key(cur_set['winnerId']) == _key(entrant_id)
+            else:
+                step['won'] = None
+            path.append(step)
+        return path
@@ -1,3 +1,5 @@
+from pysmashgg.e_filters import show_events_filter, show_lightweight_results_filter
+
 # Tournament-specific filters
 
 def show_filter(response):
@@ -166,3 +168,29 @@ def show_by_owner_filter(response):
         tournaments.append(cur_tournament)
 
     return tournaments
+
+def tournament_overview_filter(response):
+    """Filter for the overview function, show_filter's metadata plus the owner and every event with its top standings"""
+    if response['data'] is None or response['data']['tournament'] is None:
+        return
+
+    data = show_filter(response)
+    tournament = response['data']['tournament']
+    if tournament['owner'] is not None:
+        owner_player = tournament['owner']['player']
+        data['owner'] = {'id': tournament['owner']['id'],
+                         'name': owner_player['gamerTag'] if owner_player is not None else 'Unknown'}
+    else:
+        data['owner'] = None
+
+    data['events'] = show_events_filter(response)
+    for event, node in zip(data['events'], tournament['events']):
+        # None when the standings were left out of the query
+        if node.get('standings') is None:
+            event['standings'] = None
+            event['standingsTotal'] = None
+            continue
+        event['standings'] = show_lightweight_results_filter({'data': {'event': node}}) or []
+        event['standingsTotal'] = node['standings']['pageInfo']['total']
+
+    return data
@@ -10,6 +10,7 @@ SHOW_QUERY = """query ($tourneySlug: String!) {
     city
     startAt
     endAt
+    state
     numAttendees
     links {
       discord
@@ -94,12 +95,16 @@ SHOW_PLAYERS_BY_SPONSOR = """query ($slug:String!, $sponsor: String!) {
 }"""
 
 # Query to get tournaments by owner
-SHOW_BY_OWNER_QUERY = """query TournamentsByOwner($ownerId: ID!, $page: Int!) {
+SHOW_BY_OWNER_QUERY = """query TournamentsByOwner($ownerId: ID!, $page: Int!, $perPage: Int = 25) {
     tournaments(query: {
-      perPage: 25,
+      perPage: $perPage,
       page: $page,
       filter: { ownerId: $ownerId }
     }) {
+    pageInfo {
+      total
+      totalPages
+    }
     nodes {
       id
       name
@@ -128,3 +133,58 @@ TOURNAMENT_OWNER_QUERY = """query ($tourneySlug: String!) {
     }
   }
 }"""
+
+# Query to get a tournament's metadata, owner, events and each event's top standings in one request
+# Events' standings can be left out with withStandings: false, for tournaments with too many events to fit
+TOURNAMENT_OVERVIEW_QUERY = """query TournamentOverview($tourneySlug: String!, $topN: Int = 8, $withStandings: Boolean = true) {
+  tournament(slug: $tourneySlug) {
+    id
+    name
+    countryCode
+    addrState
+    city
+    startAt
+    endAt
+    state
+    numAttendees
+    owner {
+      id
+      player {
+        gamerTag
+      }
+    }
+    events {
+      id
+      name
+      slug
+      numEntrants
+      state
+      standings(query: {perPage: $topN, page: 1}) @include(if: $withStandings) {
+        pageInfo {
+          total
+        }
+        nodes {
+          placement
+          entrant {
+            name
+            id
+            participants {
+              player {
+                id
+                gamerTag
+                user {
+                  slug
+                  authorizations(types: [TWITTER, TWITCH, DISCORD]) {
+                    type
+                    externalUsername
+                    url
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}"""
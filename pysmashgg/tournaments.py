@@ -6,11 +6,11 @@ Recent changes:
 - Added date filtering for tournament searches by game, defaulting to next week
 """
 
-from pysmashgg import filters, videogame_filters
+from pysmashgg import events, filters, videogame_filters
 from pysmashgg.api import run_query
+from pysmashgg.pagination import is_complexity_error, iter_pages
+from pysmashgg.session import get_default_session
 from pysmashgg.queries import (
-    PLAYER_ID_QUERY,
-    ENTRANT_ID_QUERY,
     EVENT_ID_QUERY,
     SHOW_QUERY,
     SHOW_WITH_BRACKETS_QUERY,
@@ -18,7 +18,6 @@ from pysmashgg.queries import (
     SHOW_SETS_QUERY,
     SHOW_ENTRANTS_QUERY,
     SHOW_EVENT_BRACKETS_QUERY,
-    SHOW_ENTRANT_SETS_QUERY,
     SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY,
     SHOW_LIGHTWEIGHT_RESULTS_QUERY,
     SHOW_BY_COUNTRY_QUERY,
@@ -27,170 +26,227 @@ from pysmashgg.queries import (
     SHOW_PLAYERS_BY_SPONSOR,
     SHOW_BY_OWNER_QUERY,
     GET_VIDEOGAME_ID_QUERY,
-    SHOW_BY_VIDEOGAME_QUERY
+    SHOW_BY_VIDEOGAME_QUERY,
+    TOURNAMENT_OVERVIEW_QUERY
 )
 from datetime import datetime, timedelta
 import time
 
 # HELPER FUNCTIONS
 
-def get_player_id(event_id, player_name, header, auto_retry):
-    """Get playerId at an event"""
-    variables = {"eventId": event_id, "name": player_name}
-    response = run_query(PLAYER_ID_QUERY, variables, header, auto_retry)
-    data = filters.player_id_filter(response, player_name)
-    return data
+def get_player_id(event_id, player_name, header, auto_retry, session=None):
+    """Get playerId at an event from the event's entrant index, None if the name doesn't match one entrant"""
+    return events.entrant_index(event_id, header, auto_retry, session).player_id(player_name)
 
-def get_entrant_id(event_id, player_name, header, auto_retry):
-    """Get entrantId at an event"""
-    variables = {"eventId": event_id, "name": player_name}
-    response = run_query(ENTRANT_ID_QUERY, variables, header, auto_retry)
-    data = response['data']['event']['entrants']['nodes'][0]['id']
-    return data
+def get_entrant_id(event_id, player_name, header, auto_retry, session=None):
+    """Get entrantId at an event from the event's entrant index, None if the name doesn't match one entrant"""
+    return events.get_entrant_id(event_id, player_name, header, auto_retry, session)
 
-def get_event_id(tournament_name, event_name, header, auto_retry):
-    """Get an eventId from a tournament"""
+def get_event_id(tournament_name, event_name, header, auto_retry, session=None):
+    """Get an eventId from a tournament, without a request if the session has already seen it"""
+    if session is None:
+        session = get_default_session()
+    event_id = session.identity.event_id(tournament_name, event_name)
+    if event_id is not None:
+        return event_id
     variables = {"tourneySlug": tournament_name}
-    response = run_query(EVENT_ID_QUERY, variables, header, auto_retry)
+    response = run_query(EVENT_ID_QUERY, variables, header, auto_retry, session)
     data = filters.event_id_filter(response, event_name)
     return data
 
 # TOURNAMENT FUNCTIONS
 
-def show(tournament_name, header, auto_retry):
+def show(tournament_name, header, auto_retry, session=None):
     """Get metadata for a tournament"""
     variables = {"tourneySlug": tournament_name}
-    response = run_query(SHOW_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_QUERY, variables, header, auto_retry, session)
     data = filters.show_filter(response)
     return data
 
-def show_with_brackets(tournament_name, event_name, header, auto_retry):
+def overview(tournament_name, top_n, header, auto_retry, session=None):
+    """Get metadata, owner, events and each event's top_n standings for a tournament in one request
+
+    If that's too complex for the API (tournaments with many events), the events come back
+    with standings set to None instead
+    """
+    variables = {"tourneySlug": tournament_name, "topN": top_n}
+    response = run_query(TOURNAMENT_OVERVIEW_QUERY, variables, header, auto_retry, session)
+    if is_complexity_error(response):
+        variables["withStandings"] = False
+        response = run_query(TOURNAMENT_OVERVIEW_QUERY, variables, header, auto_retry, session)
+    data = filters.tournament_overview_filter(response)
+    return data
+
+def show_with_brackets(tournament_name, event_name, header, auto_retry, session=None):
     """Get metadata for a tournament with specific brackets"""
     variables = {"tourneySlug": tournament_name}
-    response = run_query(SHOW_WITH_BRACKETS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_WITH_BRACKETS_QUERY, variables, header, auto_retry, session)
     data = filters.show_with_brackets_filter(response, event_name)
     return data
 
-def show_with_brackets_all(tournament_name, header, auto_retry):
+def show_with_brackets_all(tournament_name, header, auto_retry, session=None):
     """Get metadata for a tournament with all brackets"""
     variables = {"tourneySlug": tournament_name}
-    response = run_query(SHOW_WITH_BRACKETS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_WITH_BRACKETS_QUERY, variables, header, auto_retry, session)
     data = filters.show_with_brackets_all_filter(response)
     return data
 
-def show_events(tournament_name, header, auto_retry):
+def show_events(tournament_name, header, auto_retry, session=None):
     """Get all events from a tournament"""
     variables = {"tourneySlug": tournament_name}
-    response = run_query(SHOW_EVENTS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_EVENTS_QUERY, variables, header, auto_retry, session)
     data = filters.show_events_filter(response)
     return data
 
-def show_sets(tournament_name, event_name, page_num, header, auto_retry):
+def show_sets(tournament_name, event_name, page_num, header, auto_retry, session=None):
     """Get all sets from an event"""
-    event_id = get_event_id(tournament_name, event_name, header, auto_retry)
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
     variables = {"eventId": event_id, "page": page_num}
-    response = run_query(SHOW_SETS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_SETS_QUERY, variables, header, auto_retry, session)
     data = filters.show_sets_filter(response)
     return data
 
-def show_entrants(tournament_name, event_name, page_num, header, auto_retry):
+def iter_sets(tournament_name, event_name, header, auto_retry, session=None):
+    """Yield every set from an event, one page at a time"""
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
+    if event_id is None:
+        return
+    variables = {"eventId": event_id}
+    yield from iter_pages(SHOW_SETS_QUERY, variables, filters.show_sets_filter, header, auto_retry, session)
+
+def show_entrants(tournament_name, event_name, page_num, header, auto_retry, session=None):
     """Get all entrants from a specific event"""
-    event_id = get_event_id(tournament_name, event_name, header, auto_retry)
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
     variables = {"eventId": event_id, "page": page_num}
-    response = run_query(SHOW_ENTRANTS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_ENTRANTS_QUERY, variables, header, auto_retry, session)
     data = filters.show_entrants_filter(response)
     return data
 
-def show_event_brackets(tournament_name, event_name, header, auto_retry):
+def iter_entrants(tournament_name, event_name, header, auto_retry, session=None):
+    """Yield every entrant from a specific event, one page at a time"""
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
+    if event_id is None:
+        return
+    variables = {"eventId": event_id}
+    yield from iter_pages(SHOW_ENTRANTS_QUERY, variables, filters.show_entrants_filter, header, auto_retry, session)
+
+def show_event_brackets(tournament_name, event_name, header, auto_retry, session=None):
     """Get all event bracket IDs, names, and slugs"""
     variables = {"tourneySlug": tournament_name}
-    response = run_query(SHOW_EVENT_BRACKETS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_EVENT_BRACKETS_QUERY, variables, header, auto_retry, session)
     data = filters.show_events_brackets_filter(response, event_name)
     return data
 
-def show_all_event_brackets(tournament_name, header, auto_retry):
+def show_all_event_brackets(tournament_name, header, auto_retry, session=None):
     """Get all event brackets for a tournament"""
     variables = {"tourneySlug": tournament_name}
-    response = run_query(SHOW_EVENT_BRACKETS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_EVENT_BRACKETS_QUERY, variables, header, auto_retry, session)
     data = filters.show_all_event_brackets_filter(response)
     return data
 
-def show_entrant_sets(tournament_name, event_name, entrant_name, header, auto_retry):
-    """Get all sets for a specific entrant"""
-    event_id = get_event_id(tournament_name, event_name, header, auto_retry)
-    entrant_id = get_entrant_id(event_id, entrant_name, header, auto_retry)
-    variables = {"eventId": event_id, "entrantId": entrant_id, "page": 1}
-    response = run_query(SHOW_ENTRANT_SETS_QUERY, variables, header, auto_retry)
-    data = filters.show_entrant_sets_filter(response)
-    return data
+def show_entrant_sets(tournament_name, event_name, entrant_name, header, auto_retry, session=None):
+    """Get all sets for a specific entrant, None if the name doesn't match one entrant"""
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
+    return events.show_entrant_sets(event_id, entrant_name, header, auto_retry, session)
 
-def show_head_to_head(tournament_name, event_name, entrant1_name, entrant2_name, header, auto_retry):
+def show_head_to_head(tournament_name, event_name, entrant1_name, entrant2_name, header, auto_retry, session=None):
     """Get head to head results for two entrants"""
-    event_id = get_event_id(tournament_name, event_name, header, auto_retry)
-    entrant1_id = get_entrant_id(event_id, entrant1_name, header, auto_retry)
-    variables = {"eventId": event_id, "entrantId": entrant1_id, "page": 1}
-    response = run_query(SHOW_ENTRANT_SETS_QUERY, variables, header, auto_retry)
-    data = filters.show_head_to_head_filter(response, entrant2_name)
-    return data
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
+    return events.show_head_to_head(event_id, entrant1_name, entrant2_name, header, auto_retry, session)
 
-def show_event_by_game_size_dated(num_entrants, videogame_id, after, before, page_num, header, auto_retry):
+def show_event_by_game_size_dated(num_entrants, videogame_id, after, before, page_num, header, auto_retry, session=None):
     """Get all events of a minimum size between two timestamps"""
     variables = {"videogameId": videogame_id, "after": after, "before": before, "page": page_num}
-    response = run_query(SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY, variables, header, auto_retry, session)
     data = filters.show_event_by_game_size_dated_filter(response, num_entrants, videogame_id)
     return data
 
-def show_lightweight_results(tournament_name, event_name, page_num, header, auto_retry):
+def iter_event_by_game_size_dated(num_entrants, videogame_id, after, before, header, auto_retry, session=None):
+    """Yield every event of a minimum size between two timestamps, one page at a time"""
+    variables = {"videogameId": videogame_id, "after": after, "before": before}
+    return iter_pages(SHOW_EVENT_BY_GAME_SIZE_DATED_QUERY, variables, filters.show_event_by_game_size_dated_filter,
+                      header, auto_retry, session, filter_args=(num_entrants, videogame_id))
+
+def show_lightweight_results(tournament_name, event_name, page_num, header, auto_retry, session=None):
     """Get basic results (name, id, placement) for an event"""
-    event_id = get_event_id(tournament_name, event_name, header, auto_retry)
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
     variables = {"eventId": event_id, "page": page_num}
-    response = run_query(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, header, auto_retry, session)
     data = filters.show_lightweight_results_filter(response)
     return data
 
-def show_by_country(country_code, page_num, header, auto_retry):
+def iter_lightweight_results(tournament_name, event_name, header, auto_retry, session=None):
+    """Yield basic results (name, id, placement) for an event, one page at a time"""
+    event_id = get_event_id(tournament_name, event_name, header, auto_retry, session)
+    if event_id is None:
+        return
+    variables = {"eventId": event_id}
+    yield from iter_pages(SHOW_LIGHTWEIGHT_RESULTS_QUERY, variables, filters.show_lightweight_results_filter, header,
+                          auto_retry, session)
+
+def show_by_country(country_code, page_num, header, auto_retry, session=None):
     """Get tournaments by country"""
     variables = {"countryCode": country_code, "page": page_num}
-    response = run_query(SHOW_BY_COUNTRY_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_BY_COUNTRY_QUERY, variables, header, auto_retry, session)
     data = filters.show_by_country_filter(response)
     return data
 
-def show_by_state(state_code, page_num, header, auto_retry):
+def iter_by_country(country_code, header, auto_retry, session=None):
+    """Yield every tournament in a country, one page at a time"""
+    variables = {"countryCode": country_code}
+    return iter_pages(SHOW_BY_COUNTRY_QUERY, variables, filters.show_by_country_filter, header, auto_retry, session)
+
+def show_by_state(state_code, page_num, header, auto_retry, session=None):
     """Get tournaments by US state"""
     variables = {"state": state_code, "page": page_num}
-    response = run_query(SHOW_BY_STATE_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_BY_STATE_QUERY, variables, header, auto_retry, session)
     data = filters.show_by_state_filter(response)
     return data
 
-def show_by_radius(coordinates, radius, page_num, header, auto_retry):
+def iter_by_state(state_code, header, auto_retry, session=None):
+    """Yield every tournament in a US state, one page at a time"""
+    variables = {"state": state_code}
+    return iter_pages(SHOW_BY_STATE_QUERY, variables, filters.show_by_state_filter, header, auto_retry, session)
+
+def show_by_radius(coordinates, radius, page_num, header, auto_retry, session=None):
     """Get tournaments within a radius of coordinates"""
     variables = {"coordinates": coordinates, "radius": radius, "page": page_num}
-    response = run_query(SHOW_BY_RADIUS_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_BY_RADIUS_QUERY, variables, header, auto_retry, session)
     data = filters.show_by_radius_filter(response)
     return data
 
-def show_players_by_sponsor(tournament_name, sponsor, header, auto_retry):
+def iter_by_radius(coordinates, radius, header, auto_retry, session=None):
+    """Yield every tournament within a radius of coordinates, one page at a time"""
+    variables = {"coordinates": coordinates, "radius": radius}
+    return iter_pages(SHOW_BY_RADIUS_QUERY, variables, filters.show_by_radius_filter, header, auto_retry, session)
+
+def show_players_by_sponsor(tournament_name, sponsor, header, auto_retry, session=None):
     """Get players by sponsor at a tournament"""
     variables = {"slug": tournament_name, "sponsor": sponsor}
-    response = run_query(SHOW_PLAYERS_BY_SPONSOR, variables, header, auto_retry)
+    response = run_query(SHOW_PLAYERS_BY_SPONSOR, variables, header, auto_retry, session)
     data = filters.show_players_by_sponsor_filter(response)
     return data
 
-def show_by_owner(owner, page_num, header, auto_retry):
+def show_by_owner(owner, page_num, header, auto_retry, session=None):
     """Get tournaments by owner ID"""
     variables = {"ownerId": owner, "page": page_num}
-    response = run_query(SHOW_BY_OWNER_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_BY_OWNER_QUERY, variables, header, auto_retry, session)
     data = filters.show_by_owner_filter(response)
     return data
 
-def get_videogame_id(game_name, header, auto_retry):
+def iter_by_owner(owner, header, auto_retry, session=None):
+    """Yield every tournament by an owner ID, one page at a time"""
+    variables = {"ownerId": owner}
+    return iter_pages(SHOW_BY_OWNER_QUERY, variables, filters.show_by_owner_filter, header, auto_retry, session)
+
+def get_videogame_id(game_name, header, auto_retry, session=None):
     """Get the ID for a video game by its name"""
     variables = {"name": game_name}
-    response = run_query(GET_VIDEOGAME_ID_QUERY, variables, header, auto_retry)
+    response = run_query(GET_VIDEOGAME_ID_QUERY, variables, header, auto_retry, session)
     data = videogame_filters.get_videogame_id_filter(response)
     return data
 
-def show_by_videogame(videogame_id, page_num, header, auto_retry, after=None, before=None):
+def show_by_videogame(videogame_id, page_num, header, auto_retry, after=None, before=None, session=None):
     """Shows a list of tournaments for a specific video game
 
     Args:
@@ -200,6 +256,7 @@ def show_by_videogame(videogame_id, page_num, header, auto_retry, after=None, be
         auto_retry: Whether to automatically retry failed requests
         after: Optional Unix timestamp for the earliest tournament start date (defaults to current time)
         before: Optional Unix timestamp for the latest tournament start date (defaults to 7 days from now)
+        session: Optional pooled Session to send the request through
     """
     # Set default date range to next week if not provided
     if after is None:
@@ -213,6 +270,20 @@ def show_by_videogame(videogame_id, page_num, header, auto_retry, after=None, be
         "after": after,
         "before": before
     }
-    response = run_query(SHOW_BY_VIDEOGAME_QUERY, variables, header, auto_retry)
+    response = run_query(SHOW_BY_VIDEOGAME_QUERY, variables, header, auto_retry, session)
     data = videogame_filters.show_by_videogame_filter(response)
     return data
+
+def iter_by_videogame(videogame_id, header, auto_retry, after=None, before=None, session=None):
+    """Yield every tournament for a specific video game, one page at a time
+
+    Takes the same after/before window as show_by_videogame
+    """
+    if after is None:
+        after = int(time.time())
+    if before is None:
+        before = int((datetime.now() + timedelta(days=7)).timestamp())
+
+    variables = {"videogameId": videogame_id, "after": after, "before": before}
+    return iter_pages(SHOW_BY_VIDEOGAME_QUERY, variables, videogame_filters.show_by_videogame_filter, header,
+                      auto_retry, session)
@@ -18,6 +18,7 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
-    install_requires=['requests']
+    python_requires='>=3.7',
+    install_requires=['requests'],
+    extras_require={'async': ['aiohttp'], 'parquet': ['pyarrow'], 'zstd': ['zstandard']}
 )
\ No newline at end of file
@@ -1,20 +1,144 @@
 #!/usr/bin/env python3
 
-"""Command-line interface for pysmashgg."""
+"""Command-line interface for pysmashgg.
 
+The global SmashGG instance, startgg.smash, is only built the first time a
+command uses it, so --help, typos and cache commands start without it (and
+without an API key).
+
+When a daemon is running (`startgg.py daemon start`, see cli/daemon.py), the
+results, player and export commands are sent to it over its Unix socket and
+run there, with its warm caches, connections and rate limit budget; this
+script then only copies their output back, without importing the CLI at all.
+Without a daemon, or with STARTGG_NO_DAEMON set, every command runs here, as
+does any command the daemon refuses or doesn't start within DAEMON_TIMEOUT.
+"""
+
+import json
 import os
-from dotenv import load_dotenv
-import pysmashgg
+import sys
+import threading
+
+# Commands the daemon runs when it's up; search asks questions on stdin and the
+# daemon and cache commands manage local state, so those always run here
+DAEMON_COMMANDS = ('results', 'player', 'export')
+
+# Environment variables that change what a command does; the daemon only runs
+# commands for clients whose values match its own
+DAEMON_ENVIRONMENT = ('KEY', 'STARTGG_NO_CACHE')
+
+# Seconds to wait for the daemon to start a command before running it here
+DAEMON_TIMEOUT = 5
+
+_smash_lock = threading.Lock()
+
+def _build_smash():
+    from dotenv import load_dotenv
+    import pysmashgg
+    from pysmashgg.disk_cache import DiskCache
+
+    # Load environment variables and initialize SmashGG
+    load_dotenv()
+    key = os.getenv('KEY')
+    if not key:
+        raise ValueError("API key not found. Please set the KEY environment variable.")
+
+    # Responses are cached on disk between runs unless STARTGG_NO_CACHE is set
+    cache = None if os.getenv('STARTGG_NO_CACHE') else DiskCache()
+    return pysmashgg.SmashGG(key, cache=cache)
+
+# Makes the SmashGG instance available globally, as startgg.smash
+def __getattr__(name):
+    if name != 'smash':
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    with _smash_lock:
+        if 'smash' not in globals():
+            globals()['smash'] = _build_smash()
+    return globals()['smash']
+
+def daemon_socket():
+    """Path of the daemon's Unix socket: $STARTGG_SOCKET, or startgg.sock next to the response cache"""
+    if os.getenv('STARTGG_SOCKET'):
+        return os.getenv('STARTGG_SOCKET')
+    cache_home = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'pysmashgg', 'startgg.sock')
+
+def daemon_environment():
+    """This process's values of the variables in DAEMON_ENVIRONMENT"""
+    return {name: os.getenv(name) for name in DAEMON_ENVIRONMENT}
+
+def connect_daemon(path=None):
+    """Connect to the daemon's socket (daemon_socket() by default), raising OSError if no daemon is listening on it"""
+    import socket
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError("Unix sockets aren't supported on this platform")
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path or daemon_socket())
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+def daemon_messages(connection, request):
+    """Send a request to the daemon, yielding each JSON message it replies with"""
+    connection.sendall(json.dumps(request).encode('utf-8') + b'\n')
+    with connection.makefile('rb') as replies:
+        for line in replies:
+            yield json.loads(line)
+
+def forward_to_daemon(args):
+    """Run a command in the daemon, copying its output here.
 
-# Load environment variables and initialize SmashGG
-load_dotenv()
-key = os.getenv('KEY')
-if not key:
-    raise ValueError("API key not found. Please set the KEY environment variable.")
+    Returns the command's exit code, or None if it should run in this process instead:
+    no daemon is listening, or it refused the command or didn't start it in time.
+    """
+    name = next((arg for arg in args if not arg.startswith('-')), None)
+    if name not in DAEMON_COMMANDS or os.getenv('STARTGG_NO_DAEMON'):
+        return None
+    try:
+        connection = connect_daemon()
+    except OSError:
+        # No daemon listening (or a stale socket left behind by one)
+        return None
+    connection.settimeout(DAEMON_TIMEOUT)
 
-# Make the SmashGG instance available globally
-smash = pysmashgg.SmashGG(key)
+    import shutil
+    request = {
+        'args': list(args),
+        'cwd': os.getcwd(),
+        'terminal': sys.stdout.isatty(),
+        'width': shutil.get_terminal_size().columns,
+        'environment': daemon_environment(),
+    }
+    with connection:
+        messages = daemon_messages(connection, request)
+        try:
+            started = next(messages, {})
+        except (OSError, ValueError):
+            # The daemon didn't answer in time, or went away
+            return None
+        if 'started' not in started:
+            return None
+        # Commands can go quiet for a while, e.g. export while it downloads sets
+        connection.settimeout(None)
+        for message in messages:
+            if 'exit' in message:
+                return message['exit']
+            stream = sys.stderr if 'err' in message else sys.stdout
+            try:
+                stream.write(message['err'] if 'err' in message else message['out'])
+                stream.flush()
+            except BrokenPipeError:
+                # Our output was piped into something that stopped reading (e.g. head)
+                os.dup2(os.open(os.devnull, os.O_WRONLY), stream.fileno())
+                return 1
+    print("Error: the daemon stopped before the command finished", file=sys.stderr)
+    return 1
 
 if __name__ == "__main__":
-    from cli import app
-    app()
+    code = forward_to_daemon(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+    from cli import main
+    main()
@@ -1,11 +1,24 @@
 import unittest
 import os
+import threading
 import time
+import io
 import json
+import socket
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
 import pysmashgg
 from dotenv import load_dotenv
 from pysmashgg.api import run_query
+from pysmashgg.batch import merge_queries, split_response
+from pysmashgg import pagination
+from pysmashgg.disk_cache import DiskCache
+from pysmashgg.identity import EntrantIndex, IdentityCache
 from pysmashgg.queries import PLAYER_INFO_QUERY
+from pysmashgg.singleflight import AsyncSingleFlight, SingleFlight
 
 # Load environment variables from .env file
 load_dotenv()
@@ -115,5 +128,922 @@ class TestClass(unittest.TestCase):
             self.assertIn('player', response['data'], "Response should contain player data")
             self.assertIn('id', response['data']['player'], "Player data should include ID")
 
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_up_to_limit_does_not_wait(self):
+        limiter = pysmashgg.RateLimiter(requests=5, window=60)
+        waits = [limiter.reserve() for _ in range(5)]
+        self.assertEqual(waits, [0, 0, 0, 0, 0])
+
+    def test_requests_over_limit_are_spaced_out(self):
+        limiter = pysmashgg.RateLimiter(requests=2, window=1)
+        limiter.reserve()
+        limiter.reserve()
+        first = limiter.reserve()
+        second = limiter.reserve()
+        self.assertAlmostEqual(first, 0.5, places=1)
+        self.assertAlmostEqual(second, 1.0, places=1)
+
+class TestKeyPool(unittest.TestCase):
+    def test_picks_key_with_most_budget(self):
+        pool = pysmashgg.KeyPool(['a', 'b'], requests=10, window=60)
+        self.assertEqual(pool.acquire(), 'a')
+        self.assertEqual(pool.acquire(), 'b')
+        self.assertEqual(pool.acquire(), 'a')
+
+    def test_rate_limited_key_is_cooled_down(self):
+        pool = pysmashgg.KeyPool(['a', 'b'], requests=10, window=60)
+        pool.report('a', 429)
+        self.assertEqual([pool.acquire() for _ in range(3)], ['b', 'b', 'b'])
+
+    def test_rejected_key_is_quarantined(self):
+        pool = pysmashgg.KeyPool(['a', 'b'], max_bad_requests=2)
+        pool.report('a', 400)
+        self.assertEqual(pool.active_keys(), ['a', 'b'])
+        pool.report('a', 401)
+        self.assertEqual(pool.active_keys(), ['b'])
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        return self._body
+
+class FakeSession:
+    """Stands in for pysmashgg.session.Session, answering with canned responses"""
+    def __init__(self, responses, retry_policy=None, cache=None):
+        self.responses = list(responses)
+        self.retry_policy = retry_policy or pysmashgg.RetryPolicy(base_delay=0)
+        self.cache = cache
+        self.inflight = SingleFlight()
+        self.identity = IdentityCache()
+        self.sent = []
+
+    @property
+    def requests_sent(self):
+        return len(self.sent)
+
+    def post(self, json_request, header):
+        self.sent.append(json_request)
+        return self.responses.pop(0)
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff_is_capped(self):
+        policy = pysmashgg.RetryPolicy(max_attempts=20, base_delay=1, max_delay=5, jitter=False, budget=None)
+        self.assertEqual([policy.delay(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_retry_after_header_wins(self):
+        policy = pysmashgg.RetryPolicy(jitter=False)
+        self.assertEqual(policy.delay(1, {'Retry-After': '7'}), 7)
+
+    def test_gives_up_after_max_attempts_and_budget(self):
+        self.assertIsNone(pysmashgg.RetryPolicy(max_attempts=3).delay(3))
+        policy = pysmashgg.RetryPolicy(budget=1)
+        self.assertIsNotNone(policy.delay(1))
+        self.assertIsNone(policy.delay(1))
+
+    def test_run_query_retries_server_errors(self):
+        session = FakeSession([FakeResponse(503), FakeResponse(429), FakeResponse(200, {'data': {}})])
+        response = run_query("query", {}, {}, True, session)
+        self.assertEqual(response, {'data': {}})
+        self.assertEqual(len(session.sent), 3)
+
+    def test_run_query_does_not_retry_without_auto_retry(self):
+        session = FakeSession([FakeResponse(503), FakeResponse(200, {'data': {}})])
+        self.assertIsNone(run_query("query", {}, {}, False, session))
+        self.assertEqual(len(session.sent), 1)
+
+class TestBatch(unittest.TestCase):
+    def test_merged_queries_are_aliased_and_split_back(self):
+        from pysmashgg.queries import EVENT_ID_QUERY, PLAYER_SHOW_INFO_QUERY
+        query, variables, aliases = merge_queries([
+            (EVENT_ID_QUERY, {"tourneySlug": "a"}),
+            (PLAYER_SHOW_INFO_QUERY, {"playerId": 1000}),
+        ])
+        self.assertIn("b0_tournament: tournament(slug: $tourneySlug_b0)", query)
+        self.assertIn("b1_player: player(id: $playerId_b1)", query)
+        self.assertEqual(variables, {"tourneySlug_b0": "a", "playerId_b1": 1000})
+
+        responses = split_response({'data': {'b0_tournament': {'events': []}, 'b1_player': None}}, aliases)
+        self.assertEqual(responses, [{'data': {'tournament': {'events': []}}}, {'data': {'player': None}}])
+
+    def test_batch_respects_complexity_limit(self):
+        from pysmashgg.queries import SHOW_SETS_QUERY
+        batch = pysmashgg.Batch(max_complexity=600)
+        for event_id in range(5):
+            batch.add(SHOW_SETS_QUERY, {"eventId": event_id, "page": 1})
+        self.assertEqual([len(group) for group in batch.groups()], [2, 2, 1])
+
+    def test_lightweight_results_share_requests(self):
+        from pysmashgg.queries import SHOW_LIGHTWEIGHT_RESULTS_QUERY
+        # Only the standings' nodes scale with perPage, not the connection or its pageInfo
+        self.assertEqual(pysmashgg.complexity.estimate_cost(SHOW_LIGHTWEIGHT_RESULTS_QUERY, {'perPage': 1}), 9)
+        batch = pysmashgg.Batch()
+        for event_id in range(4):
+            batch.add(SHOW_LIGHTWEIGHT_RESULTS_QUERY, {"eventId": event_id, "page": 1})
+        self.assertEqual([len(group) for group in batch.groups()], [2, 2])
+        batch = pysmashgg.Batch()
+        for event_id in range(10):
+            batch.add(SHOW_LIGHTWEIGHT_RESULTS_QUERY, {"eventId": event_id, "page": 1, "perPage": 8})
+        self.assertEqual([len(group) for group in batch.groups()], [10])
+
+    def test_batch_runs_filters_on_each_part(self):
+        from pysmashgg.queries import EVENT_ID_QUERY
+        session = FakeSession([FakeResponse(200, {'data': {
+            'b0_tournament': {'events': [{'id': 1, 'slug': 'tournament/a/event/singles'}]},
+            'b1_tournament': {'events': [{'id': 2, 'slug': 'tournament/b/event/singles'}]},
+        }})])
+        batch = pysmashgg.Batch()
+        batch.add(EVENT_ID_QUERY, {"tourneySlug": "a"}, pysmashgg.filters.event_id_filter, "singles")
+        batch.add(EVENT_ID_QUERY, {"tourneySlug": "b"}, pysmashgg.filters.event_id_filter, "singles")
+        self.assertEqual(batch.run({}, True, session), [1, 2])
+        self.assertEqual(len(session.sent), 1)
+
+class TestMemoryCache(unittest.TestCase):
+    def test_same_query_with_different_formatting_hits(self):
+        cache = pysmashgg.MemoryCache()
+        cache.set("query { a }", {"x": 1}, {'data': {'a': 1}})
+        self.assertEqual(cache.get("query {\n  a # comment\n}", {"x": 1}), {'data': {'a': 1}})
+        self.assertIsNone(cache.get("query { a }", {"x": 2}))
+        self.assertEqual(cache.stats.as_dict(), {'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_expired_and_error_responses_are_not_served(self):
+        cache = pysmashgg.MemoryCache(ttls={"query { a }": 0})
+        cache.set("query { a }", {}, {'data': {'a': 1}})
+        cache.set("query { b }", {}, {'data': None, 'errors': [{'message': 'nope'}]})
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = pysmashgg.MemoryCache(max_entries=2)
+        for name in "abc":
+            cache.set("query { %s }" % name, {}, {'data': {name: 1}})
+            if name == "b":
+                cache.get("query { a }", {})
+        self.assertIsNotNone(cache.get("query { a }", {}))
+        self.assertIsNone(cache.get("query { b }", {}))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_run_query_answers_repeats_from_cache(self):
+        session = FakeSession([FakeResponse(200, {'data': {'a': 1}})], cache=pysmashgg.MemoryCache())
+        first = run_query("query { a }", {}, {}, True, session)
+        second = run_query("query { a }", {}, {}, True, session)
+        self.assertEqual(first, second)
+        self.assertEqual(len(session.sent), 1)
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_entries_are_shared_between_instances(self):
+        DiskCache(self.path).set("query { a }", {"x": 1}, {'data': {'a': 1}})
+        cache = DiskCache(self.path)
+        self.assertEqual(cache.get("query { a }", {"x": 1}), {'data': {'a': 1}})
+        self.assertIsNone(cache.get("query { a }", {"x": 2}))
+
+    def test_prune_enforces_size_limit(self):
+        cache = DiskCache(self.path, max_bytes=0)
+        cache.set("query { a }", {}, {'data': {'a': 1}})
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.prune(), 1)
+        self.assertEqual(len(cache), 0)
+
+class TestLifecycle(unittest.TestCase):
+    def test_completed_events_are_kept_longer_than_live_ones(self):
+        cache = pysmashgg.MemoryCache()
+        completed = {'data': {'event': {'state': 'COMPLETED', 'sets': {'nodes': []}}}}
+        active = {'data': {'event': {'state': 'ACTIVE', 'sets': {'nodes': []}}}}
+        self.assertEqual(cache.ttl_for("query { event { state } }", {'eventId': 1}, completed), 365 * 24 * 60 * 60)
+        self.assertEqual(cache.ttl_for("query { event { state } }", {'eventId': 2}, active), 15)
+
+    def test_learned_state_applies_to_later_queries(self):
+        cache = pysmashgg.MemoryCache()
+        cache.ttl_for("query { tournament { events { id state } } }", {'tourneySlug': 'genesis'},
+                      {'data': {'tournament': {'events': [{'id': 7, 'state': 'COMPLETED'}]}}})
+        self.assertEqual(cache.ttl_for("query { event { name } }", {'eventId': 7}, {'data': {'event': {'name': 'x'}}}),
+                         365 * 24 * 60 * 60)
+        self.assertEqual(cache.ttl_for("query { event { name } }", {'eventId': 8}, {'data': {'event': {'name': 'x'}}}),
+                         cache.default_ttl)
+
+    def test_lists_of_finished_tournaments_get_the_default_ttl(self):
+        from pysmashgg.queries import SHOW_BY_OWNER_QUERY, PLAYER_SHOW_TOURNAMENTS_QUERY
+        cache = pysmashgg.MemoryCache()
+        owned = {'data': {'tournaments': {'nodes': [{'id': 1, 'slug': 'tournament/a', 'state': 3},
+                                                    {'id': 2, 'slug': 'tournament/b', 'state': 3}]}}}
+        self.assertEqual(cache.ttl_for(SHOW_BY_OWNER_QUERY, {'ownerId': 5, 'page': 1}, owned), cache.default_ttl)
+        played = {'data': {'player': {'user': {'tournaments': {'nodes': [
+            {'id': 3, 'slug': 'tournament/c', 'startAt': 1000, 'endAt': 2000}]}}}}}
+        self.assertEqual(cache.ttl_for(PLAYER_SHOW_TOURNAMENTS_QUERY, {'playerId': 1000, 'page': 1}, played),
+                         cache.default_ttl)
+        # What the lists said about each tournament still applies to queries about that tournament
+        self.assertEqual(cache.ttl_for("query { tournament { name } }", {'tourneySlug': 'a'},
+                                       {'data': {'tournament': {'name': 'A'}}}), 365 * 24 * 60 * 60)
+
+    def test_started_without_an_end_time_is_not_live(self):
+        from pysmashgg.lifecycle import phase_of
+        self.assertIsNone(phase_of({'startAt': 1000}, now=5000))
+        self.assertEqual(phase_of({'startAt': 1000, 'endAt': 6000}, now=5000), 'active')
+        self.assertEqual(phase_of({'startAt': 9000}, now=5000), 'upcoming')
+
+    def test_state_aware_can_be_turned_off(self):
+        cache = pysmashgg.MemoryCache(state_aware=False)
+        response = {'data': {'event': {'state': 'COMPLETED'}}}
+        self.assertEqual(cache.ttl_for("query { event { state } }", {'eventId': 1}, response), cache.default_ttl)
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_identical_queries_share_one_request(self):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        release = threading.Event()
+
+        class SlowSession(FakeSession):
+            def post(self, json_request, header):
+                release.wait(5)
+                return super().post(json_request, header)
+
+        session = SlowSession([FakeResponse(200, {'data': {'a': 1}})])
+        with ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(run_query, "query { a }", {}, {}, True, session) for _ in range(4)]
+            while len(session.inflight) == 0:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(results, [{'data': {'a': 1}}] * 4)
+        self.assertEqual(len(session.sent), 1)
+        self.assertEqual(len(session.inflight), 0)
+
+    def test_callers_with_different_headers_are_not_merged(self):
+        from concurrent.futures import ThreadPoolExecutor
+        release = threading.Event()
+        lock = threading.Lock()
+
+        class SlowSession(FakeSession):
+            def post(self, json_request, header):
+                release.wait(5)
+                with lock:
+                    self.headers.append(header['Authorization'])
+                    return super().post(json_request, header)
+
+        session = SlowSession([FakeResponse(200, {'data': {'a': 1}}), FakeResponse(200, {'data': {'a': 1}})])
+        session.headers = []
+        headers = [{'Authorization': 'Bearer a'}, {'Authorization': 'Bearer b'}]
+        with ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(run_query, "query { a }", {}, header, True, session) for header in headers]
+            deadline = time.time() + 5
+            while len(session.inflight) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+            [future.result() for future in futures]
+        self.assertEqual(sorted(session.headers), ['Bearer a', 'Bearer b'])
+
+    def test_async_callers_share_one_call(self):
+        import asyncio
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'data': {'a': 1}}
+
+        async def main():
+            inflight = AsyncSingleFlight()
+            return await asyncio.gather(*[inflight.do("a", fetch) for _ in range(3)])
+
+        self.assertEqual(asyncio.run(main()), [{'data': {'a': 1}}] * 3)
+        self.assertEqual(len(calls), 1)
+
+class StandingsSession(FakeSession):
+    """FakeSession serving `total` league standings, sliced by each request's page and perPage"""
+    def __init__(self, total, page_info=True, max_per_page=None):
+        super().__init__([])
+        self.total = total
+        self.page_info = page_info
+        self.max_per_page = max_per_page
+        self.lock = threading.Lock()
+
+    def post(self, json_request, header):
+        with self.lock:
+            self.sent.append(json_request)
+        page, per_page = json_request['variables']['page'], json_request['variables']['perPage']
+        if self.max_per_page is not None and per_page > self.max_per_page:
+            return FakeResponse(200, {'data': None, 'errors': [{'message': 'Your query complexity is too high.'}]})
+        time.sleep(0.01)
+        first = (page - 1) * per_page + 1
+        nodes = [{'id': n, 'placement': n, 'player': {'id': n, 'gamerTag': str(n)}}
+                 for n in range(first, min(first + per_page, self.total + 1))]
+        standings = {'nodes': nodes}
+        if self.page_info:
+            standings['pageInfo'] = {'total': self.total, 'totalPages': -(-self.total // per_page)}
+        return FakeResponse(200, {'data': {'league': {'standings': standings}}})
+
+    def pages_sent(self):
+        return sorted(request['variables']['page'] for request in self.sent)
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        pagination._sizers.clear()
+
+    def iter_standings(self, session):
+        return pysmashgg.leagues.iter_standings("league", {}, True, session)
+
+    def test_stops_after_short_page(self):
+        session = StandingsSession(130, page_info=False)
+        standings = list(self.iter_standings(session))
+        self.assertEqual([player['standing'] for player in standings], list(range(1, 131)))
+        self.assertEqual(session.pages_sent(), [1, 2, 3, 4, 5, 6])
+
+    def test_stops_on_empty_page(self):
+        session = StandingsSession(100, page_info=False)
+        self.assertEqual(len(list(self.iter_standings(session))), 100)
+        self.assertEqual(session.pages_sent(), [1, 2, 3, 4, 5])
+
+    def test_pages_after_the_first_are_prefetched_in_parallel(self):
+        session = StandingsSession(550)
+        standings = list(self.iter_standings(session))
+        self.assertEqual([player['standing'] for player in standings], list(range(1, 551)))
+        self.assertEqual(session.pages_sent(), list(range(1, 23)))
+
+    def test_failed_pages_raise_instead_of_ending_the_walk(self):
+        class FailingSession(StandingsSession):
+            def post(self, json_request, header):
+                if json_request['variables']['page'] == 3:
+                    with self.lock:
+                        self.sent.append(json_request)
+                    return FakeResponse(200, {'data': None, 'errors': [{'message': 'Internal error'}]})
+                return super().post(json_request, header)
+
+        for page_info in (True, False):
+            with self.assertRaises(pysmashgg.exceptions.PageError):
+                list(self.iter_standings(FailingSession(300, page_info=page_info)))
+
+    def test_pages_are_fetched_lazily(self):
+        session = StandingsSession(300, page_info=False)
+        next(self.iter_standings(session))
+        self.assertEqual(len(session.sent), 1)
+
+    def test_page_size_starts_from_the_tuned_size(self):
+        session = StandingsSession(80, max_per_page=30)
+        self.assertEqual(len(list(self.iter_standings(session))), 80)
+        self.assertEqual({request['variables']['perPage'] for request in session.sent}, {25})
+        self.assertEqual(pagination.default_per_page(pysmashgg.queries.SHOW_SETS_QUERY), 18)
+
+    def test_page_size_shrinks_on_complexity_errors(self):
+        session = StandingsSession(80, max_per_page=30)
+        sizer = pagination.page_sizer(pysmashgg.queries.LEAGUE_SHOW_STANDINGS_QUERY, session)
+        sizer.size = 100
+        self.assertEqual(len(list(self.iter_standings(session))), 80)
+        sizes = [request['variables']['perPage'] for request in session.sent]
+        self.assertEqual(sizes[:2], [100, 50])
+        self.assertLessEqual(sizes[-1], 30)
+        # Later walks never retry a size known to be too big, and settle on the largest one that fits
+        for _ in range(5):
+            del session.sent[:]
+            list(self.iter_standings(session))
+            self.assertLess(session.sent[0]['variables']['perPage'], 50)
+        self.assertEqual(sizer.size, 30)
+
+    def test_learned_page_sizes_outlive_the_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DiskCache(os.path.join(directory, 'cache.sqlite3'))
+            for _ in range(3):
+                session = StandingsSession(80, max_per_page=30)
+                session.cache = cache
+                list(self.iter_standings(session))
+            self.assertEqual(cache.page_size(pysmashgg.queries.LEAGUE_SHOW_STANDINGS_QUERY), (30, 31))
+            # A new process starts from the size the earlier ones settled on, without retrying rejected ones
+            session = StandingsSession(80, max_per_page=30)
+            session.cache = cache
+            self.assertEqual(pagination.page_sizer(pysmashgg.queries.LEAGUE_SHOW_STANDINGS_QUERY, session).size, 30)
+            cache.close()
+
+    def test_probes_stay_under_the_estimate(self):
+        session = FakeSession([])
+        sizer = pagination.page_sizer(pysmashgg.queries.SHOW_SETS_QUERY, session)
+        estimate = pagination.pick_per_page(pysmashgg.queries.SHOW_SETS_QUERY)
+        sizer.succeeded(sizer.size)
+        self.assertLessEqual(sizer.size, estimate)
+        # Each session learns on its own
+        self.assertIsNot(pagination.page_sizer(pysmashgg.queries.SHOW_SETS_QUERY, FakeSession([])), sizer)
+
+    def test_cached_first_pages_dont_move_the_size(self):
+        session = StandingsSession(20)
+        session.cache = pysmashgg.MemoryCache()
+        sizer = pagination.page_sizer(pysmashgg.queries.LEAGUE_SHOW_STANDINGS_QUERY, session)
+        list(self.iter_standings(session))
+        # Back to the size page 1 was fetched at, which the next walk finds in the cache
+        sizer.size = 25
+        list(self.iter_standings(session))
+        self.assertEqual(len(session.sent), 1)
+        self.assertEqual(sizer.size, 25)
+
+class TestIdentityCache(unittest.TestCase):
+    EVENTS = {'data': {'tournament': {'events': [{'id': 7, 'slug': 'tournament/genesis/event/melee-singles'}]}}}
+
+    def test_event_ids_are_learned_from_responses(self):
+        identity = IdentityCache()
+        identity.observe({'tourneySlug': 'genesis'}, self.EVENTS)
+        self.assertEqual(identity.event_id('genesis', 'melee-singles'), 7)
+        self.assertEqual(identity.event_id('tournament/genesis', 'melee-singles'), 7)
+        self.assertIsNone(identity.event_id('genesis', 'ultimate-singles'))
+
+    def test_entrant_ids_are_learned_within_their_event(self):
+        identity = IdentityCache()
+        sets = {'data': {'event': {'sets': {'nodes': [{'slots': [{'entrant': {'id': 11, 'name': 'Mang0'}}]}]}}}}
+        identity.observe({'eventId': 7}, sets)
+        self.assertEqual(identity.entrant_id(7, 'Mang0'), 11)
+        self.assertIsNone(identity.entrant_id(8, 'Mang0'))
+
+    def test_paging_an_event_looks_its_id_up_once(self):
+        sets = FakeResponse(200, {'data': {'event': {'sets': {'nodes': []}}}})
+        session = FakeSession([FakeResponse(200, self.EVENTS), sets, sets])
+        pysmashgg.tournaments.show_sets('genesis', 'melee-singles', 1, {}, True, session)
+        pysmashgg.tournaments.show_sets('genesis', 'melee-singles', 2, {}, True, session)
+        self.assertEqual(len(session.sent), 3)
+        self.assertEqual([request['variables'].get('eventId') for request in session.sent[1:]], [7, 7])
+
+def entrant(entrant_id, name, *tags):
+    players = [{'playerId': entrant_id * 10 + n, 'playerTag': tag} for n, tag in enumerate(tags or [name])]
+    return {'entrantId': entrant_id, 'name': name, 'entrantPlayers': players}
+
+def entrants_response():
+    nodes = [{'id': 1, 'name': 'Mang0', 'participants': [{'gamerTag': 'Mang0', 'player': {'id': 10}}]},
+             {'id': 2, 'name': 'A | Zain', 'participants': [{'gamerTag': 'Zain', 'player': {'id': 20}}]},
+             {'id': 3, 'name': 'B | Zain', 'participants': [{'gamerTag': 'Zain', 'player': {'id': 30}}]}]
+    return {'data': {'event': {'entrants': {'nodes': nodes}}}}
+
+class TestEntrantIndex(unittest.TestCase):
+    def test_names_match_exactly_then_loosely(self):
+        index = EntrantIndex([entrant(1, 'C9 | Mang0', 'Mang0'), entrant(2, 'mango')])
+        self.assertEqual(index.entrant_id('mango'), 2)
+        self.assertEqual(index.entrant_id('MANGO'), 2)
+        self.assertEqual(index.entrant_id('C9 | Mang0'), 1)
+        self.assertEqual(index.entrant_id('c9 | mang0'), 1)
+        self.assertEqual(index.entrant_id('Mang0'), 1)
+        self.assertEqual(index.player_id('Mang0'), 10)
+
+    def test_ambiguous_names_match_nothing(self):
+        index = EntrantIndex([entrant(1, 'A | Zain'), entrant(2, 'B | Zain')])
+        self.assertIsNone(index.entrant_id('Zain'))
+        self.assertEqual(index.entrant_id('B | Zain'), 2)
+
+    def test_first_lookup_builds_the_index(self):
+        session = FakeSession([FakeResponse(200, entrants_response())])
+        self.assertEqual(pysmashgg.events.get_entrant_id(7, 'mang0', {}, True, session), 1)
+        self.assertIsNotNone(session.identity.entrant_index(7))
+        # No match and an ambiguous name give None, never the first result of a fuzzy search
+        self.assertIsNone(pysmashgg.events.get_entrant_id(7, 'Hungrybox', {}, True, session))
+        self.assertIsNone(pysmashgg.events.show_entrant_sets(7, 'Zain', {}, True, session))
+        self.assertEqual(pysmashgg.events.show_head_to_head(7, 'Zain', 'Mang0', {}, True, session), [])
+        self.assertEqual(len(session.sent), 1)
+
+    def test_entrant_lookups_share_a_built_index(self):
+        nodes = [{'id': 1, 'name': 'Mang0', 'participants': [{'gamerTag': 'Mang0', 'player': {'id': 10}}]},
+                 {'id': 2, 'name': 'Zain', 'participants': [{'gamerTag': 'Zain', 'player': {'id': 20}}]}]
+        response = FakeResponse(200, {'data': {'event': {'entrants': {'nodes': nodes}}}})
+        session = FakeSession([response])
+        pysmashgg.events.entrant_index(7, {}, True, session)
+        self.assertEqual(pysmashgg.events.get_entrant_id(7, 'mang0', {}, True, session), 1)
+        self.assertEqual(pysmashgg.events.get_entrant_id(7, 'zain', {}, True, session), 2)
+        self.assertEqual(pysmashgg.tournaments.get_player_id(7, 'zain', {}, True, session), 20)
+        self.assertEqual(len(session.sent), 1)
+
+def h2h_set(set_id, winner_id, *slots):
+    return {'id': set_id, 'fullRoundText': 'Winners Final', 'completedAt': 1, 'winnerId': winner_id,
+            'phaseGroup': {'id': 3}, 'event': {'id': 7, 'name': 'Melee Singles', 'slug': 'melee-singles'},
+            'slots': [{'standing': {'stats': {'score': {'value': score}}},
+                       'entrant': {'id': entrant_id, 'name': str(entrant_id),
+                                   'participants': [{'player': {'id': entrant_id * 10}}]}}
+                      for entrant_id, score in slots]}
+
+class TestHeadToHead(unittest.TestCase):
+    def setUp(self):
+        pagination._sizers.clear()
+
+    def test_only_sets_between_both_entrants_are_kept(self):
+        nodes = [h2h_set(1, 2, (1, 1), (2, 3)), h2h_set(2, 1, (1, 3), (5, 0)), h2h_set(3, 1, (2, 0), (1, 3))]
+        response = {'data': {'event': {'sets': {'nodes': nodes}}}}
+        sets = pysmashgg.filters.event_head_to_head_filter(response, 1, 2)
+        self.assertEqual([cur_set['id'] for cur_set in sets], [1, 3])
+        # Entrant 1 is always the first entrant asked about, whichever slot it was in
+        self.assertEqual([(cur_set['entrant1Score'], cur_set['winner']) for cur_set in sets], [(1, 2), (3, 1)])
+        summary = pysmashgg.head_to_head.summarize(sets)
+        self.assertEqual((summary['entrant1Wins'], summary['entrant2Wins'], summary['entrant1Games']), (1, 1, 4))
+
+    def test_every_page_is_fetched(self):
+        pages = [FakeResponse(200, {'data': {'event': {'sets': {
+            'pageInfo': {'total': 2, 'totalPages': 2}, 'nodes': [h2h_set(page, 1, (1, 3), (2, 0))]}}}})
+            for page in (1, 2)]
+        session = FakeSession(pages)
+        pagination.page_sizer(pysmashgg.queries.HEAD_TO_HEAD_SETS_QUERY, session).size = 1
+        sets = pysmashgg.head_to_head.event_head_to_head_by_id(7, 1, 2, {}, True, session)
+        self.assertEqual([cur_set['id'] for cur_set in sets], [1, 2])
+        self.assertEqual(session.sent[0]['variables']['entrantIds'], [1, 2])
+
+    def test_player_sets_are_matched_by_opponent(self):
+        nodes = [h2h_set(1, 2, (1, 1), (2, 3)), h2h_set(2, 1, (1, 3), (5, 0))]
+        response = {'data': {'player': {'sets': {'nodes': nodes}}}}
+        sets = pysmashgg.filters.player_head_to_head_filter(response, 20, 10)
+        self.assertEqual([(cur_set['id'], cur_set['winner']) for cur_set in sets], [(1, 1)])
+
+def snapshot_set(set_id, entrant1, entrant2, winner, round_text):
+    return {'id': set_id, 'entrant1Id': entrant1[0], 'entrant1Name': entrant1[1], 'entrant2Id': entrant2[0],
+            'entrant2Name': entrant2[1], 'entrant1Score': 2 if winner == entrant1[0] else 0,
+            'entrant2Score': 2 if winner == entrant2[0] else 0, 'completed': True, 'winnerId': winner,
+            'fullRoundText': round_text, 'bracketId': 3, 'bracketName': 'Top 8',
+            'entrant1Players': [], 'entrant2Players': []}
+
+class TestEventSnapshot(unittest.TestCase):
+    MANGO, ZAIN, HBOX = (1, 'C9 | Mang0'), (2, 'Zain'), (3, 'Hungrybox')
+
+    def snapshot(self):
+        return pysmashgg.snapshot.EventSnapshot(7, [
+            snapshot_set(10, self.MANGO, self.ZAIN, 1, 'Winners Final'),
+            snapshot_set(11, self.ZAIN, self.HBOX, 2, 'Losers Final'),
+            snapshot_set(12, self.ZAIN, self.MANGO, 2, 'Grand Final'),
+        ])
+
+    def test_sets_are_indexed_by_entrant_and_pair(self):
+        snapshot = self.snapshot()
+        self.assertEqual([cur_set['id'] for cur_set in snapshot.entrant_sets(2)], [10, 11, 12])
+        self.assertEqual([cur_set['id'] for cur_set in snapshot.entrant_sets('mang0')], [10, 12])
+        self.assertEqual([cur_set['id'] for cur_set in snapshot.head_to_head('Zain', 1)], [10, 12])
+        self.assertEqual(snapshot.head_to_head('Mang0', 'Hungrybox'), [])
+        self.assertEqual(snapshot.entrant_sets('Leffen'), [])
+
+    def test_bracket_path_is_from_the_entrants_side(self):
+        path = self.snapshot().bracket_path('Zain')
+        self.assertEqual([(step['opponentName'], step['won']) for step in path],
+                         [('C9 | Mang0', False), ('Hungrybox', True), ('C9 | Mang0', True)])
+
+    def test_whole_event_is_downloaded_once(self):
+        nodes = [{'id': 10, 'fullRoundText': 'Winners Final', 'games': None, 'phaseGroup': None,
+                  'slots': [{'standing': {'id': 1, 'placement': 1, 'stats': {'score': {'value': 3}}},
+                             'entrant': {'id': entrant_id, 'name': name, 'participants': []}}
+                            for entrant_id, name in (self.MANGO, self.ZAIN)]}]
+        response = FakeResponse(200, {'data': {'event': {'tournament': {'id': 1, 'name': 'Genesis'}, 'name': 'Melee',
+                                                         'sets': {'nodes': nodes}}}})
+        session = FakeSession([response])
+        snapshot = pysmashgg.events.snapshot(7, {}, True, session)
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(len(snapshot.head_to_head('Mang0', 'Zain')), 1)
+        self.assertEqual(len(session.sent), 1)
+
+class TournamentSession(FakeSession):
+    """FakeSession serving one tournament with one event and two brackets, answering by query"""
+    def __init__(self):
+        super().__init__([])
+        self.lock = threading.Lock()
+
+    @property
+    def requests_sent(self):
+        return len(self.sent)
+
+    def post(self, json_request, header):
+        queries = pysmashgg.queries
+        with self.lock:
+            self.sent.append(json_request)
+        query, variables = json_request['query'], json_request['variables']
+        if query == queries.SHOW_QUERY:
+            tournament = {'id': 1, 'name': 'Genesis', 'countryCode': 'US', 'addrState': 'CA', 'city': 'San Jose',
+                          'startAt': 0, 'endAt': 1, 'numAttendees': 2}
+        elif query == queries.SHOW_EVENTS_QUERY:
+            tournament = {'events': [{'id': 7, 'name': 'Melee', 'slug': 'tournament/genesis/event/melee',
+                                      'numEntrants': 2}]}
+        elif query == queries.SHOW_EVENT_BRACKETS_QUERY:
+            tournament = {'events': [{'name': 'Melee', 'slug': 'tournament/genesis/event/melee',
+                                      'phaseGroups': [{'id': 30}, {'id': 31}]}]}
+        elif query == queries.SHOW_ENTRANTS_QUERY:
+            nodes = [{'placement': n, 'entrant': {'id': n, 'name': str(n), 'seeds': None, 'participants': []}}
+                     for n in (1, 2)]
+            return FakeResponse(200, {'data': {'event': {'id': 7, 'standings': {'nodes': nodes}}}})
+        else:
+            slots = [{'entrant': {'id': n, 'name': str(n), 'participants': []},
+                      'standing': {'placement': n, 'stats': {'score': {'value': 3 - n}}}} for n in (1, 2)]
+            nodes = [{'id': variables['phaseGroupId'], 'slots': slots},
+                     {'id': 0, 'slots': [slots[0], {'entrant': None, 'standing': None}]}]
+            return FakeResponse(200, {'data': {'phaseGroup': {'phase': {'name': 'Pools'}, 'sets': {'nodes': nodes}}}})
+        return FakeResponse(200, {'data': {'tournament': tournament}})
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        pagination._sizers.clear()
+
+    def test_tournament_is_exported_to_files(self):
+        session = TournamentSession()
+        reports = []
+        with tempfile.TemporaryDirectory() as directory:
+            stats = pysmashgg.export.export_tournament('genesis', directory, {}, True, session,
+                                                       progress=lambda stats: reports.append(stats.tasks_done))
+            with open(os.path.join(directory, 'tournament.json')) as f:
+                tournament = json.load(f)
+            with open(os.path.join(directory, 'sets.ndjson')) as f:
+                sets = [json.loads(line) for line in f]
+            with open(os.path.join(directory, 'standings.ndjson')) as f:
+                standings = [json.loads(line) for line in f]
+        self.assertEqual(tournament['events'][0]['bracketIds'], [30, 31])
+        self.assertEqual(sorted(cur_set['bracketId'] for cur_set in sets), [30, 31])
+        self.assertTrue(all(record['eventId'] == 7 for record in sets + standings))
+        self.assertEqual(len(standings), 2)
+        self.assertEqual((stats.events, stats.brackets, stats.sets, stats.requests), (1, 2, 2, 6))
+        self.assertEqual((len(reports), reports[0], reports[-1]), (4, 0, 3))
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class TestParquet(unittest.TestCase):
+    SETS = [{'id': 'preview_1', 'entrant1Id': 1, 'entrant2Id': 2, 'entrant1Name': 'Mang0', 'entrant2Name': 'Zain',
+             'entrant1Score': 3, 'entrant2Score': 1, 'completed': True, 'winnerId': 1, 'loserId': 2,
+             'entrant1Players': [{'playerId': 10, 'playerTag': 'Mang0'}], 'entrant2Players': [], 'eventId': 7},
+            {'id': 2, 'entrant1Id': 2, 'entrant2Id': 1, 'entrant1Name': 'Zain', 'entrant2Name': 'Mang0',
+             'completed': False, 'entrant1Players': [{'playerId': 'None', 'playerTag': None}], 'bracketId': 30}]
+
+    def test_records_are_coerced_to_the_schema(self):
+        columns = pysmashgg.parquet.record_columns(self.SETS, 'sets')
+        self.assertEqual(columns['id'], ['preview_1', '2'])
+        self.assertEqual(columns['winnerId'], [1, None])
+        self.assertEqual(columns['bracketId'], [None, 30])
+        self.assertEqual(columns['entrant1Players'][1], [{'playerId': None, 'playerTag': None, 'entrantId': None}])
+
+    @unittest.skipIf(pyarrow is None, "needs pyarrow")
+    def test_records_are_written_in_row_groups(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sets.parquet')
+            self.assertEqual(pysmashgg.parquet.write_parquet(self.SETS * 3, path, 'sets', row_group_size=4), 6)
+            parquet_file = pyarrow.parquet.ParquetFile(path)
+            self.assertEqual([parquet_file.metadata.row_group(n).num_rows for n in range(2)], [4, 2])
+            table = parquet_file.read()
+        self.assertEqual(table.column('entrant1Name').type, pyarrow.dictionary(pyarrow.int32(), pyarrow.string()))
+        self.assertEqual(table.column('entrant1Name').to_pylist()[:2], ['Mang0', 'Zain'])
+
+class TestNdjson(unittest.TestCase):
+    def records(self):
+        for n in range(1000):
+            yield {'id': n, 'name': 'line\nbreak %d' % n}
+
+    def read(self, path, opener):
+        with opener(path) as f:
+            return [json.loads(line) for line in f.read().decode('utf-8').splitlines()]
+
+    def test_records_are_streamed_one_per_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.ndjson')
+            self.assertEqual(pysmashgg.ndjson.write_ndjson(self.records(), path, batch_size=64), 1000)
+            self.assertEqual(self.read(path, lambda path: open(path, 'rb')), list(self.records()))
+
+    def test_compression_is_picked_from_the_extension(self):
+        import gzip
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.ndjson.gz')
+            pysmashgg.ndjson.write_ndjson(self.records(), path)
+            self.assertEqual(self.read(path, gzip.open), list(self.records()))
+
+def overview_response(with_standings=True):
+    events = []
+    for n in (1, 2):
+        event = {'id': n, 'name': 'Event %d' % n, 'slug': 'tournament/genesis/event/e%d' % n, 'numEntrants': 9,
+                 'state': 'COMPLETED'}
+        if with_standings:
+            nodes = [{'placement': 1, 'entrant': {'id': 10 + n, 'name': 'C9 | Mang0', 'participants': []}}]
+            event['standings'] = {'pageInfo': {'total': 9}, 'nodes': nodes}
+        events.append(event)
+    tournament = {'id': 1, 'name': 'Genesis', 'countryCode': 'US', 'addrState': 'CA', 'city': 'San Jose',
+                  'startAt': 0, 'endAt': 1, 'state': 3, 'numAttendees': 9,
+                  'owner': {'id': 5, 'player': {'gamerTag': 'TO'}}, 'events': events}
+    return FakeResponse(200, {'data': {'tournament': tournament}})
+
+class TestTournamentOverview(unittest.TestCase):
+    def test_everything_comes_from_one_request(self):
+        session = FakeSession([overview_response()])
+        overview = pysmashgg.tournaments.overview('genesis', 8, {}, True, session)
+        self.assertEqual(len(session.sent), 1)
+        self.assertEqual((overview['name'], overview['owner']), ('Genesis', {'id': 5, 'name': 'TO'}))
+        self.assertEqual([event['slug'] for event in overview['events']], ['e1', 'e2'])
+        self.assertEqual(overview['events'][0]['standings'][0]['name'], 'Mang0')
+        self.assertEqual(overview['events'][0]['standingsTotal'], 9)
+
+    def test_standings_are_dropped_when_too_complex(self):
+        too_complex = FakeResponse(200, {'data': None, 'errors': [{'message': 'Your query complexity is too high.'}]})
+        session = FakeSession([too_complex, overview_response(with_standings=False)])
+        overview = pysmashgg.tournaments.overview('genesis', 8, {}, True, session)
+        self.assertFalse(session.sent[1]['variables']['withStandings'])
+        self.assertEqual([event['standings'] for event in overview['events']], [None, None])
+
+def tournaments_for_game_response():
+    def event(event_id, videogame_id, entered):
+        return {'name': 'Singles', 'id': event_id, 'slug': 'tournament/t/event/singles', 'numEntrants': 64,
+                'videogame': {'id': videogame_id}, 'entrants': {'nodes': [{'id': event_id * 10}] if entered else []}}
+    tournament = {'name': 'T', 'slug': 'tournament/t', 'id': 1, 'numAttendees': 100, 'countryCode': 'US',
+                  'startAt': 1600000000, 'events': [event(10, 1386, True), event(11, 1, True), event(12, 1386, False)]}
+    return {'data': {'player': {'user': {'tournaments': {'nodes': [tournament]}}}}}
+
+class TestAsyncSmashGG(unittest.TestCase):
+    def test_player_tournaments_for_game(self):
+        import asyncio
+        from pysmashgg.async_smashgg import AsyncSmashGG
+
+        async def main():
+            client = AsyncSmashGG('key')
+            with mock.patch('pysmashgg.async_smashgg.run_query',
+                            mock.AsyncMock(return_value=tournaments_for_game_response())):
+                return await client.player_show_tournaments_for_game(1000, 'Mang0', 1386, 1)
+
+        tournaments = asyncio.run(main())
+        self.assertEqual([(cur['eventId'], cur['entrantId']) for cur in tournaments], [(10, 100)])
+        self.assertEqual((tournaments[0]['tournamentSlug'], tournaments[0]['eventSlug']), ('t', 'singles'))
+
+    def test_entrant_names_are_matched_by_the_index(self):
+        import asyncio
+        from pysmashgg.async_smashgg import AsyncSmashGG
+        run_query = mock.AsyncMock(return_value=entrants_response())
+
+        async def main():
+            client = AsyncSmashGG('key')
+            with mock.patch('pysmashgg.async_api.run_query', run_query):
+                return (await client._get_entrant_id(7, 'mang0'), await client.event_show_entrant_sets(7, 'Zain'),
+                        await client.event_head_to_head(7, 'Mang0', 'Hungrybox'))
+
+        self.assertEqual(asyncio.run(main()), (1, None, []))
+        self.assertEqual(run_query.await_count, 1)
+
+def profile_response(slug_root=False):
+    def set_node(set_id, event_id):
+        return {'id': set_id, 'fullRoundText': 'Winners Round 1', 'slots': [], 'winnerId': 1, 'completedAt': set_id,
+                'event': {'id': event_id, 'isOnline': False, 'tournament': {'name': 'T', 'slug': 't'}}}
+    player = {
+        'id': 1000, 'prefix': None, 'gamerTag': 'Mang0', 'user': {'name': 'Joe', 'slug': 'user/b1008ff3'},
+        'recentStandings': [{'id': 1, 'placement': 2, 'entrant': {'id': 5, 'event': {'id': 20, 'isOnline': False}}},
+                            {'id': 2, 'placement': 1, 'entrant': {'id': 6, 'event': {'id': 10, 'isOnline': True}}}],
+        'offlineSets': {'nodes': [set_node(3, 20), set_node(2, 20), set_node(1, 10)]},
+        'onlineSets': {'nodes': []},
+    }
+    data = {'user': {'player': player}} if slug_root else {'player': player}
+    return FakeResponse(200, {'data': data})
+
+class TestPlayerProfile(unittest.TestCase):
+    def test_player_id_needs_one_request(self):
+        from cli.utils.player import fetch_player_profile
+        session = FakeSession([profile_response()])
+        profile = fetch_player_profile('1000', {}, True, session, game_id='1', with_sets=True)
+        self.assertEqual(len(session.sent), 1)
+        self.assertEqual(session.sent[0]['variables'], {'playerId': '1000', 'gameID': '1', 'withStandings': True,
+                                                         'withSets': True})
+        user = profile['data']['user']
+        self.assertEqual((user['slug'], user['player']['gamerTag']), ('user/b1008ff3', 'Mang0'))
+        self.assertEqual(len(user['player']['recentSets']), 3)
+        self.assertNotIn('offlineSets', user['player'])
+
+    def test_slugs_are_looked_up_by_user(self):
+        from cli.utils.player import fetch_player_profile
+        session = FakeSession([profile_response(slug_root=True)])
+        profile = fetch_player_profile('b1008ff3', {}, True, session)
+        self.assertEqual(session.sent[0]['variables']['slug'], 'user/b1008ff3')
+        self.assertEqual(profile['data']['user']['player']['id'], 1000)
+
+    def test_recent_event_sets_keeps_latest_event(self):
+        from cli.utils.player import fetch_player_profile, recent_event_sets
+        profile = fetch_player_profile('1000', {}, True, FakeSession([profile_response()]), with_sets=True)
+        sets = recent_event_sets(profile)['data']['player']['sets']['nodes']
+        self.assertEqual([cur_set['id'] for cur_set in sets], [3, 2])
+        profile['data']['user']['player']['recentSets'] = []
+        self.assertIsNone(recent_event_sets(profile))
+
+    def test_recent_event_sets_needs_the_whole_event(self):
+        from cli.utils.player import fetch_player_profile, recent_event_sets
+        from pysmashgg.p_queries import PLAYER_PROFILE_SETS_PER_PAGE
+        profile = fetch_player_profile('1000', {}, True, FakeSession([profile_response()]), with_sets=True)
+        player = profile['data']['user']['player']
+        latest, older = player['recentSets'][:2], player['recentSets'][2:]
+        other = [dict(older[0], id=100 + n, event={'id': 30, 'isOnline': False})
+                 for n in range(PLAYER_PROFILE_SETS_PER_PAGE - len(latest) - 1)]
+        # A full page where an older event's sets follow the latest event's holds all of them
+        player['recentSets'] = latest + other + older
+        self.assertEqual(len(recent_event_sets(profile)['data']['player']['sets']['nodes']), 2)
+        # A full page that ends with the latest event's sets may be missing some of them
+        player['recentSets'] = other + latest + [dict(latest[-1], id=1)]
+        self.assertEqual(len(player['recentSets']), PLAYER_PROFILE_SETS_PER_PAGE)
+        self.assertIsNone(recent_event_sets(profile))
+
+# Generous, so slow machines don't fail it; importing everything takes well under 0.1 s
+IMPORT_BUDGET = 0.5
+HEAVY_MODULES = ['requests', 'asyncio', 'aiohttp', 'sqlite3', 'pyarrow', 'rich', 'dotenv']
+
+def import_report(code):
+    """Runs code in a fresh interpreter without an API key, returning how long it took
+    and which heavy modules it loaded"""
+    script = ("import json, sys, time\nstart = time.perf_counter()\n%s\n"
+              "print(json.dumps({'seconds': time.perf_counter() - start,"
+              " 'loaded': [m for m in %r if m in sys.modules]}))" % (code, HEAVY_MODULES))
+    env = {name: value for name, value in os.environ.items() if name != 'KEY'}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', script], cwd=root, env=env, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+class TestImportTime(unittest.TestCase):
+    def test_imports_stay_under_budget(self):
+        report = import_report("import pysmashgg, pysmashgg.queries, pysmashgg.filters, startgg, cli")
+        self.assertEqual(report['loaded'], [])
+        self.assertLess(report['seconds'], IMPORT_BUDGET)
+
+    def test_client_connects_on_first_request(self):
+        report = import_report("import pysmashgg\npysmashgg.SmashGG('key')\npysmashgg.queries.SHOW_QUERY")
+        self.assertEqual(report['loaded'], [])
+
+    def test_only_the_command_being_run_is_registered(self):
+        report = import_report("import cli\ncli.register_commands(['cache'])\n"
+                               "assert 'cli.commands.cache' in sys.modules\n"
+                               "assert 'cli.commands.results' not in sys.modules")
+        self.assertNotIn('requests', report['loaded'])
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "the daemon needs Unix sockets")
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        import startgg
+        self.startgg = startgg
+        self.path = os.path.join(tempfile.mkdtemp(), 'startgg.sock')
+        patch = mock.patch.dict(os.environ, {'STARTGG_SOCKET': self.path})
+        patch.start()
+        self.addCleanup(patch.stop)
+        # A daemon of its own, since it replaces sys.stdout with a ThreadProxy
+        script = ("import pysmashgg, startgg\nstartgg.smash = pysmashgg.SmashGG('key')\n"
+                  "from cli.daemon import serve\nserve(%r)" % self.path)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.daemon = subprocess.Popen([sys.executable, '-c', script], cwd=root, stdout=subprocess.DEVNULL)
+        self.addCleanup(self.daemon.wait, 5)
+        self.addCleanup(self.daemon.terminate)
+        for _ in range(200):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.05)
+
+    def control(self, command):
+        with self.startgg.connect_daemon() as connection:
+            return list(self.startgg.daemon_messages(connection, {'control': command}))
+
+    def test_commands_run_in_the_daemon(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = self.startgg.forward_to_daemon(['results', '--help'])
+        self.assertEqual(code, 0)
+        self.assertIn('Usage', output.getvalue())
+        status = self.control('status')[0]['status']
+        self.assertEqual((status['pid'], status['commands']), (self.daemon.pid, 1))
+
+    def test_interactive_commands_run_locally(self):
+        self.assertIsNone(self.startgg.forward_to_daemon(['search', 'genesis']))
+        self.assertIsNone(self.startgg.forward_to_daemon(['--help']))
+
+    def test_other_environments_run_locally(self):
+        with mock.patch.dict(os.environ, {'KEY': 'another key'}):
+            self.assertIsNone(self.startgg.forward_to_daemon(['results', '--help']))
+        self.assertEqual(self.control('status')[0]['status']['commands'], 0)
+
+    def test_each_thread_prints_to_its_own_output(self):
+        from cli.daemon import ThreadProxy
+        daemon_output, outputs = io.StringIO(), [io.StringIO(), io.StringIO()]
+        proxy = ThreadProxy(daemon_output)
+        both_bound = threading.Barrier(2)
+
+        def run(output, text):
+            proxy.bind(output)
+            both_bound.wait()
+            print(text, file=proxy)
+            proxy.bind(None)
+
+        threads = [threading.Thread(target=run, args=(output, text)) for output, text in zip(outputs, 'ab')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print('daemon', file=proxy)
+        self.assertEqual([output.getvalue() for output in outputs], ['a\n', 'b\n'])
+        self.assertEqual(daemon_output.getvalue(), 'daemon\n')
+
+    def test_paths_are_resolved_against_the_client(self):
+        import cli
+        from pathlib import Path
+        cli.set_working_directory('/client')
+        try:
+            self.assertEqual(cli.resolve_path(Path('out.json')), Path('/client/out.json'))
+            self.assertEqual(cli.resolve_path(Path('/tmp/out.json')), Path('/tmp/out.json'))
+        finally:
+            cli.set_working_directory(None)
+        self.assertEqual(cli.resolve_path(Path('out.json')), Path('out.json'))
+
+    def test_falls_back_once_stopped(self):
+        self.assertEqual(self.control('stop'), [{'stopped': True}])
+        self.assertEqual(self.daemon.wait(5), 0)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(self.startgg.forward_to_daemon(['results', '--help']))
+
 if __name__ == '__main__':
     unittest.main()